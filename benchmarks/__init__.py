@@ -0,0 +1,4 @@
+"""Benchmarks and fixtures for measuring load and search paths.
+
+Run a benchmark from the repository root, e.g. ``python -m benchmarks.bench_memory``.
+"""
@@ -0,0 +1,85 @@
+"""Disk footprint and load time of the cache encodings.
+
+Compares the raw cache, per-surah compressed frames (what ``--cache-encoding``
+writes) and a whole-file compressed cache, which has to be inflated in full
+before anything can be read. Timings are best of ``REPEATS`` with a warm page
+cache, so they show CPU cost; the size column is what a slow disk or NFS pays.
+The synthetic corpus is random text and compresses worse than the real one.
+"""
+from __future__ import annotations
+
+import lzma
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Callable
+
+from quran_tui.cache import ENCODINGS, CacheReader, write_cache
+
+from .fixtures import synthetic_corpus
+
+REPEATS = 5
+ONE_SURAH = 35  # a mid-sized surah
+
+
+def _best(action: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def _read_one(path: Path) -> None:
+    with CacheReader(path) as reader:
+        reader.surah_rows(ONE_SURAH)
+
+
+def _read_all(path: Path) -> None:
+    with CacheReader(path) as reader:
+        for index in range(len(reader.surahs)):
+            reader.surah_rows(index)
+
+
+def _whole_file(path: Path, inflate: Callable[[bytes], bytes], read: Callable[[Path], None]) -> Callable[[], None]:
+    def action() -> None:
+        # A whole-file archive has to be inflated before it can be mapped.
+        raw_path = path.with_suffix(".inflated")
+        raw_path.write_bytes(inflate(path.read_bytes()))
+        read(raw_path)
+
+    return action
+
+
+def main() -> None:
+    surahs, ayah_numbers, rows = synthetic_corpus()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = Path(tmp_dir)
+        cases: list[tuple[str, Path, Callable[[], None], Callable[[], None]]] = []
+        for name, encoding in ENCODINGS.items():
+            path = directory / f"{name}.bin"
+            write_cache(path, surahs, ayah_numbers, rows, encoding=encoding)
+            label = name if name == "raw" else f"{name} per surah"
+            cases.append((label, path, lambda path=path: _read_one(path), lambda path=path: _read_all(path)))
+
+        raw = (directory / "raw.bin").read_bytes()
+        for name, compress, inflate in (
+            ("zlib", zlib.compress, zlib.decompress),
+            ("lzma", lzma.compress, lzma.decompress),
+        ):
+            path = directory / f"whole.{name}"
+            path.write_bytes(compress(raw))
+            cases.append(
+                (f"{name} whole file", path, _whole_file(path, inflate, _read_one), _whole_file(path, inflate, _read_all))
+            )
+
+        print(f"{'encoding':<18} {'size':>10} {'open+1 surah':>14} {'open+all':>10}")
+        for label, path, read_one, read_all in cases:
+            size = path.stat().st_size
+            print(f"{label:<18} {size / 1024:>7,.0f} KiB {_best(read_one):>11.2f} ms {_best(read_all):>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
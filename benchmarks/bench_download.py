@@ -0,0 +1,52 @@
+"""First-run download time against the local API stand-in.
+
+Compares one download worker (the old sequential behaviour) with the default
+pool, and reports peak Python heap while parsing the streamed payloads.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stderr
+from io import StringIO
+from pathlib import Path
+
+from quran_tui.config import DOWNLOAD_WORKERS
+from quran_tui.data import QuranRepository
+
+from .fixtures import FixtureAPIServer
+
+
+def _run(base_url: str, workers: int) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repository = QuranRepository(
+            cache_path=Path(tmp_dir) / "cache.bin",
+            legacy_cache_path=Path(tmp_dir) / "none.json",
+            api_base=base_url,
+            download_workers=workers,
+        )
+        tracemalloc.start()
+        started = time.perf_counter()
+        with redirect_stderr(StringIO()):
+            repository.load(force_refresh=True)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.25, help="Seconds of latency per request.")
+    args = parser.parse_args()
+
+    with FixtureAPIServer(latency=args.latency) as server:
+        for workers in (1, DOWNLOAD_WORKERS):
+            elapsed, peak = _run(server.base_url, workers)
+            print(f"workers={workers}: {elapsed * 1000:8.1f} ms  peak heap {peak / 1024:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
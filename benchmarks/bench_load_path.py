@@ -0,0 +1,71 @@
+"""First-run load path against the local API stand-in.
+
+Three measurements: a first-run download over a slow link (latency plus a
+bandwidth cap), the same download when every endpoint fails once (503 or a
+truncated body, so real retry backoff is included) and the time to write the
+cache in each encoding.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from contextlib import redirect_stderr
+from io import StringIO
+from pathlib import Path
+
+from quran_tui.cache import ENCODINGS
+from quran_tui.data import QuranRepository
+from quran_tui.models import QuranData
+
+from .fixtures import RECORDED_FILES, FixtureAPIServer, api_payloads, load_payloads
+
+
+def _download(base_url: str, directory: Path) -> tuple[float, QuranData]:
+    directory.mkdir()
+    repository = QuranRepository(
+        cache_path=directory / "cache.bin",
+        legacy_cache_path=directory / "none.json",
+        api_base=base_url,
+    )
+    started = time.perf_counter()
+    with redirect_stderr(StringIO()):
+        quran_data = repository.load(force_refresh=True)
+    return (time.perf_counter() - started) * 1000, quran_data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds of latency per request.")
+    parser.add_argument("--bandwidth", type=float, default=2_000_000, help="Bytes per second per response.")
+    parser.add_argument("--payloads", type=Path, help="Recorded payload directory (default: synthetic).")
+    args = parser.parse_args()
+    payloads = load_payloads(args.payloads) if args.payloads is not None else api_payloads()
+    total_bytes = sum(len(payload) for payload in payloads.values())
+    print(f"payloads: {total_bytes / 1024:,.0f} KiB, latency {args.latency * 1000:.0f} ms, {args.bandwidth / 1e6:.1f} MB/s")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = Path(tmp_dir)
+        with FixtureAPIServer(payloads, latency=args.latency, bandwidth=args.bandwidth) as server:
+            elapsed, quran_data = _download(server.base_url, directory / "first")
+            print(f"first-run download:      {elapsed:8.1f} ms  ({len(server.requests)} requests)")
+
+        for mode in ("error", "truncate"):
+            failures = {path: 1 for path in RECORDED_FILES}
+            with FixtureAPIServer(
+                payloads, latency=args.latency, bandwidth=args.bandwidth, failures=failures, failure_mode=mode
+            ) as server:
+                elapsed, _ = _download(server.base_url, directory / mode)
+                print(f"one failure each ({mode:8}): {elapsed:8.1f} ms  ({len(server.requests)} requests)")
+
+        for name in ENCODINGS:
+            repository = QuranRepository(cache_path=directory / f"write-{name}.bin", cache_encoding=name)
+            started = time.perf_counter()
+            repository._save_to_cache(quran_data)
+            elapsed = (time.perf_counter() - started) * 1000
+            size = repository.cache_path.stat().st_size
+            print(f"cache write ({name:4}):       {elapsed:8.1f} ms  ({size / 1024:,.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
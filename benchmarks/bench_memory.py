@@ -0,0 +1,49 @@
+"""Resident memory of a fully loaded QuranData (all 6,236 ayahs touched)."""
+from __future__ import annotations
+
+import gc
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from quran_tui.data import QuranRepository
+
+from .fixtures import write_synthetic_cache
+
+
+def _rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = write_synthetic_cache(Path(tmp_dir) / "cache.bin")
+        repository = QuranRepository(cache_path=cache_path, legacy_cache_path=Path(tmp_dir) / "none.json", memory_budget=None)
+
+        gc.collect()
+        rss_before = _rss_bytes()
+        tracemalloc.start()
+        quran_data = repository.load()
+        touched = 0
+        for surah in quran_data.surahs:
+            for ayah in surah.ayahs:
+                touched += len(ayah.surah_name_english) + len(ayah.text_arabic) + len(ayah.text_english)
+        flat = list(quran_data.ayahs_flat)
+        gc.collect()
+        traced, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_after = _rss_bytes()
+
+        print(f"ayahs loaded:       {len(flat)}")
+        print(f"python heap (traced): {traced / 1024:,.0f} KiB")
+        if rss_before is not None and rss_after is not None:
+            print(f"resident delta:     {(rss_after - rss_before) / 1024:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
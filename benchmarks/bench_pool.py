@@ -0,0 +1,72 @@
+"""Full-scan latency with the scan sharded over 1, 2, 4 and 8 worker processes.
+
+The token index is disabled so every query scans all 6,236 ayahs, the case
+the pool is for. ``in-process`` is the engine without a pool. Workers map a
+search index written to a temporary directory and are warmed before timing;
+a pool cannot beat in-process scoring on fewer cores than workers.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from quran_tui.scoring import get_backend
+from quran_tui.search import QuranSearchEngine, SearchArtifacts
+from quran_tui.search_index import search_index_key, write_search_index
+from quran_tui.search_pool import MIN_SHARD, SearchPool
+
+from .bench_search import corpus, measure, uncached
+
+WORKERS = (1, 2, 4, 8)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", default="auto")
+    parser.add_argument("--workers", nargs="*", type=int, default=WORKERS)
+    parser.add_argument("--min-shard", type=int, default=MIN_SHARD)
+    args = parser.parse_args()
+
+    ayahs = corpus()
+    artifacts = SearchArtifacts.build(ayahs)
+    backend = get_backend(args.backend)
+    print(f"corpus: {len(ayahs)} ayahs; backend {backend.name}; {os.cpu_count()} cores")
+
+    def report(label: str, engine: QuranSearchEngine) -> float:
+        timings = measure(engine.search)
+        median = statistics.median(timings)
+        print(f"{label:<16} median {median:8.2f} ms   max {max(timings):8.2f} ms")
+        return median
+
+    baseline = report(
+        "in-process",
+        QuranSearchEngine(ayahs, artifacts=artifacts, candidate_limit=None, backend=backend, result_cache=uncached()),
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "search-index.bin"
+        key = search_index_key("benchmark")
+        write_search_index(path, artifacts, key)
+        for workers in args.workers:
+            with SearchPool(path, key, workers, min_shard=args.min_shard) as pool:
+                start = time.perf_counter()
+                if not pool.warm():
+                    raise SystemExit("search pool failed to start")
+                warm_ms = (time.perf_counter() - start) * 1000
+                engine = QuranSearchEngine(
+                    ayahs,
+                    artifacts=artifacts,
+                    candidate_limit=None,
+                    backend=backend,
+                    result_cache=uncached(),
+                    pool=pool,
+                )
+                median = report(f"{workers} worker{'s' if workers > 1 else ''}", engine)
+                print(f"{'':<16} speedup {baseline / median:5.2f}x   warm-up {warm_ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
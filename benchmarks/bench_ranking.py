@@ -0,0 +1,78 @@
+"""Fuzzy and BM25 ranking: latency and result quality on the fixture queries.
+
+``fuzzy`` is the default engine (index candidates re-ranked by the fastest
+backend) and ``fuzzy full scan`` the same backend over every ayah; ``bm25``
+multiplies the query with the precomputed term weights in one NumPy call and
+``bm25 (no numpy)`` is its pure-Python fallback. Timings are without a
+result cache.
+
+The synthetic corpus has no relevance judgments, so quality is measured
+against the one judgment it supports: an ayah is relevant when it contains
+every word of the query. ``p@10`` and ``p@25`` are the shares of the top 10
+and 25 results that are; ``overlap`` is the share of the top 25 the ranking
+has in common with ``fuzzy full scan``.
+"""
+from __future__ import annotations
+
+import statistics
+from unittest.mock import patch
+
+from quran_tui import search
+from quran_tui.search import QuranSearchEngine, SearchArtifacts, _tokens
+
+from .bench_search import corpus, measure, uncached
+from .fixtures import BENCHMARK_QUERIES
+
+DEPTHS = (10, 25)
+
+
+def _relevant(engine: QuranSearchEngine, query: str) -> set[int]:
+    """Ayahs with every word of ``query`` in the column it is scored against."""
+    found: set[int] = set()
+    for query_text, column in engine._query_forms(query):
+        words = set(_tokens(query_text))
+        found.update(index for index, text in enumerate(column) if words <= set(_tokens(text)))
+    return found
+
+
+def main() -> None:
+    ayahs = corpus()
+    artifacts = SearchArtifacts.build(ayahs)
+    engines = {
+        "fuzzy": QuranSearchEngine(ayahs, artifacts=artifacts, result_cache=uncached()),
+        "fuzzy full scan": QuranSearchEngine(ayahs, artifacts=artifacts, candidate_limit=None, result_cache=uncached()),
+        "bm25": QuranSearchEngine(ayahs, artifacts=artifacts, ranking="bm25", result_cache=uncached()),
+    }
+    depth = max(DEPTHS)
+
+    def top(engine: QuranSearchEngine, query: str) -> list[int]:
+        return engine.run(query, depth).indices
+
+    relevant = {query: _relevant(engines["fuzzy"], query) for query in BENCHMARK_QUERIES}
+    reference = {query: set(top(engines["fuzzy full scan"], query)) for query in BENCHMARK_QUERIES}
+    print(f"corpus: {len(ayahs)} ayahs; backend {engines['fuzzy'].backend.name}")
+    print(f"{'ranking':<18}{'median':>10}{'max':>10}" + "".join(f"{f'p@{n}':>8}" for n in DEPTHS) + f"{'overlap':>9}")
+
+    def report(label: str, engine: QuranSearchEngine) -> None:
+        timings = measure(engine.search)
+        precision: dict[int, list[float]] = {n: [] for n in DEPTHS}
+        overlap = []
+        for query in BENCHMARK_QUERIES:
+            indices = top(engine, query)
+            for n in DEPTHS:
+                precision[n].append(sum(index in relevant[query] for index in indices[:n]) / n)
+            overlap.append(len(reference[query].intersection(indices)) / depth)
+        print(
+            f"{label:<18}{statistics.median(timings):7.2f} ms{max(timings):7.2f} ms"
+            + "".join(f"{statistics.mean(precision[n]):8.2f}" for n in DEPTHS)
+            + f"{statistics.mean(overlap):9.2f}"
+        )
+
+    for label, engine in engines.items():
+        report(label, engine)
+    with patch.object(search, "numpy", None):
+        report("bm25 (no numpy)", engines["bm25"])
+
+
+if __name__ == "__main__":
+    main()
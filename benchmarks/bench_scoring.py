@@ -0,0 +1,53 @@
+"""Scoring backends across query lengths, full scan of the synthetic corpus.
+
+The token index is disabled so every backend scores all 6,236 ayahs (both
+columns); ``difflib`` runs a single round because it is several times slower.
+``cdist`` uses every core, so its lead grows with the core count.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+
+from quran_tui.scoring import available_backends, get_backend
+from quran_tui.search import QuranSearchEngine, SearchArtifacts
+
+from .bench_search import corpus, measure, uncached
+
+QUERY_WORDS = (1, 3, 8, 20)
+
+
+def _queries(artifacts: SearchArtifacts, words: int, count: int = 3) -> list[str]:
+    # Slices of real ayahs, so long queries still have close matches.
+    rng = random.Random(words)
+    queries = []
+    for _ in range(count):
+        tokens = rng.choice(artifacts.normalized_english).split()
+        start = rng.randrange(max(1, len(tokens) - words))
+        queries.append(" ".join(tokens[start : start + words]))
+    return queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="*", default=available_backends())
+    args = parser.parse_args()
+
+    ayahs = corpus()
+    artifacts = SearchArtifacts.build(ayahs)
+    print(f"{'backend':<10}" + "".join(f"{f'{words} words':>12}" for words in QUERY_WORDS))
+    for name in args.backends:
+        backend = get_backend(name)
+        engine = QuranSearchEngine(
+            ayahs, artifacts=artifacts, candidate_limit=None, backend=backend, result_cache=uncached()
+        )
+        rounds = 1 if name == "difflib" else 3
+        cells = []
+        for words in QUERY_WORDS:
+            timings = measure(engine.search, _queries(artifacts, words), rounds)
+            cells.append(f"{sum(timings) / len(timings):9.1f} ms")
+        print(f"{name:<10}" + "".join(f"{cell:>12}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Per-query search latency on the full synthetic corpus.
+
+``baseline`` is the original loop, which normalized both columns of every
+ayah on each query and built a result for every hit; ``full scan`` is the
+engine with its token index disabled and ``engine`` the default engine, all
+without a result cache. ``cached`` repeats the queries on an engine with one,
+and ``query syntax`` runs phrase, boolean and proximity queries.
+"""
+from __future__ import annotations
+
+import statistics
+import time
+from typing import Callable, Sequence
+
+from quran_tui.models import Ayah, AyahStore, QuranData
+from quran_tui.result_cache import ResultCache
+from quran_tui.scoring import get_backend
+from quran_tui.search import QuranSearchEngine, SearchResult, _build_preview, _normalize
+
+from .fixtures import BENCHMARK_QUERIES, BENCHMARK_SYNTAX_QUERIES, synthetic_corpus
+
+ROUNDS = 5
+
+
+def corpus() -> list[Ayah]:
+    surahs, ayah_numbers, rows = synthetic_corpus()
+    return list(QuranData.from_store(AyahStore.from_rows(surahs, ayah_numbers, rows)).ayahs_flat)
+
+
+def uncached() -> ResultCache:
+    return ResultCache(max_entries=0)
+
+
+def _baseline_search(ayahs: Sequence[Ayah], query: str, limit: int = 25) -> list[SearchResult]:
+    ratio = get_backend("rapidfuzz").ratio
+    normalized_query = _normalize(query)
+    results = []
+    for ayah in ayahs:
+        normalized_en = _normalize(ayah.text_english)
+        normalized_ar = _normalize(ayah.text_arabic)
+        english_score = ratio(normalized_query, normalized_en)
+        arabic_score = ratio(normalized_query, normalized_ar)
+        contains_bonus = 35 if normalized_query in normalized_en or normalized_query in normalized_ar else 0
+        best_score = max(english_score, arabic_score) + contains_bonus
+        if best_score < 45:
+            continue
+        results.append(SearchResult(ayah=ayah, score=best_score, preview=_build_preview(ayah.text_english)))
+    results.sort(key=lambda item: item.score, reverse=True)
+    return results[:limit]
+
+
+def measure(
+    search: Callable[[str], object],
+    queries: Sequence[str] = BENCHMARK_QUERIES,
+    rounds: int = ROUNDS,
+) -> list[float]:
+    """Milliseconds per query, best of ``rounds`` for each query."""
+    timings = []
+    for query in queries:
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            search(query)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    print(f"{label:<24} median {statistics.median(timings):8.2f} ms   max {max(timings):8.2f} ms")
+
+
+def main() -> None:
+    ayahs = corpus()
+    start = time.perf_counter()
+    engine = QuranSearchEngine(ayahs, result_cache=uncached())
+    print(f"corpus: {len(ayahs)} ayahs; engine built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    report("baseline", measure(lambda query: _baseline_search(ayahs, query)))
+    full_scan = QuranSearchEngine(ayahs, artifacts=engine.artifacts, candidate_limit=None, result_cache=uncached())
+    report("full scan", measure(full_scan.search))
+    report("engine", measure(engine.search))
+    cached = QuranSearchEngine(ayahs, artifacts=engine.artifacts)
+    report("cached", measure(cached.search))
+    report("query syntax", measure(engine.search, BENCHMARK_SYNTAX_QUERIES))
+
+
+if __name__ == "__main__":
+    main()
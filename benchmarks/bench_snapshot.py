@@ -0,0 +1,92 @@
+"""Startup cost to a searchable corpus: cold JSON, binary cache, snapshot.
+
+* cold JSON: parse the old v3 JSON cache and build the search engine
+* v4 cache:  open the mapped cache and build the search engine
+* snapshot:  one read + marshal decode of the corpus, plus the mapped
+             search index (what ``cli.main`` does after ``--download-data``)
+"""
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from quran_tui.data import QuranRepository
+from quran_tui.search import QuranSearchEngine, SearchArtifacts
+from quran_tui.search_index import open_search_index, search_index_key, write_search_index
+from quran_tui.snapshot import load_snapshot, snapshot_key, write_snapshot
+
+from .fixtures import synthetic_corpus, write_synthetic_cache
+
+
+def _legacy_json(path: Path) -> None:
+    surahs, ayah_numbers, rows = synthetic_corpus()
+    payload = {
+        "version": 3,
+        "surahs": [
+            {
+                "number": surah.number,
+                "name_arabic": surah.name_arabic,
+                "name_english": surah.name_english,
+                "bismillah_pre": surah.bismillah_pre,
+                "ayahs": [
+                    {"ayah_number": ayah_numbers[index], "text_arabic": rows[index][0], "text_english": rows[index][1]}
+                    for index in range(surah.first_ayah, surah.first_ayah + surah.ayah_count)
+                ],
+            }
+            for surah in surahs
+        ],
+    }
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+
+def _best_of(runs: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        legacy_path = tmp_dir / "legacy.json"
+        cache_path = write_synthetic_cache(tmp_dir / "cache.bin")
+        snapshot_path = tmp_dir / "snapshot.bin"
+        index_path = tmp_dir / "search-index.bin"
+        _legacy_json(legacy_path)
+
+        repository = QuranRepository(cache_path=cache_path, legacy_cache_path=tmp_dir / "none.json")
+        quran_data = repository.load()
+        content_hash = repository.content_hash() or ""
+        write_snapshot(snapshot_path, quran_data, snapshot_key(content_hash))
+        write_search_index(index_path, SearchArtifacts.build(quran_data.ayahs_flat), search_index_key(content_hash))
+
+        def cold_json() -> None:
+            raw = json.loads(legacy_path.read_text(encoding="utf-8"))
+            QuranSearchEngine(repository._deserialize(raw).ayahs_flat)
+
+        def binary_cache() -> None:
+            fresh = QuranRepository(cache_path=cache_path, legacy_cache_path=tmp_dir / "none.json")
+            QuranSearchEngine(fresh.load().ayahs_flat)
+
+        def snapshot() -> None:
+            fresh = QuranRepository(cache_path=cache_path, legacy_cache_path=tmp_dir / "none.json")
+            content_hash = fresh.content_hash() or ""
+            loaded = load_snapshot(snapshot_path, snapshot_key(content_hash))
+            artifacts = open_search_index(index_path, search_index_key(content_hash))
+            assert loaded is not None and artifacts is not None
+            QuranSearchEngine(loaded.quran_data.ayahs_flat, artifacts=artifacts)
+
+        for name, func in (("cold JSON", cold_json), ("v4 cache", binary_cache), ("snapshot", snapshot)):
+            print(f"{name:>10}: {_best_of(5, func) * 1000:7.1f} ms")
+        print(f"snapshot size: {snapshot_path.stat().st_size / 1024:,.0f} KiB")
+        print(f"search index size: {index_path.stat().st_size / 1024:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Run the local quran.com stand-in in the foreground.
+
+    python -m benchmarks.fixture_server --latency 0.2 --bandwidth 500000
+    QURAN_TUI_API_BASE=http://127.0.0.1:8765 quran --refresh-cache
+
+Serves the synthetic corpus, or payloads recorded with ``--record DIR`` and
+replayed with ``--payloads DIR``. ``--fail PATH=N`` makes the first N
+requests for PATH fail.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from urllib.request import Request, urlopen
+
+from quran_tui.config import HTTP_TIMEOUT_SECONDS, QURAN_API_BASE
+
+from .fixtures import RECORDED_FILES, FixtureAPIServer, load_payloads, save_payloads
+
+
+def record(directory: Path, api_base: str = QURAN_API_BASE) -> None:
+    """Save the live API payloads under ``directory`` for offline replay."""
+    payloads = {}
+    for path in RECORDED_FILES:
+        request = Request(f"{api_base.rstrip('/')}{path}", headers={"User-Agent": "quran-tui/1.0"})
+        with urlopen(request, timeout=HTTP_TIMEOUT_SECONDS) as response:
+            payloads[path] = response.read()
+    save_payloads(payloads, directory)
+
+
+def _failure(spec: str) -> tuple[str, int]:
+    path, _, count = spec.rpartition("=")
+    if not path.startswith("/"):
+        raise argparse.ArgumentTypeError(f"expected PATH=N, got {spec!r}")
+    return path, int(count)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--payloads", type=Path, help="Directory of recorded payloads (default: synthetic).")
+    parser.add_argument("--record", type=Path, metavar="DIR", help="Record the live API into DIR and exit.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added before each response.")
+    parser.add_argument("--bandwidth", type=float, default=None, help="Body rate cap in bytes per second.")
+    parser.add_argument("--fail", type=_failure, action="append", default=[], metavar="PATH=N")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of other requests that fail.")
+    parser.add_argument("--failure-mode", choices=["error", "truncate"], default="error")
+    parser.add_argument("--no-etags", action="store_true", help="Do not send ETags or answer 304.")
+    args = parser.parse_args(argv)
+
+    if args.record is not None:
+        record(args.record)
+        print(f"Recorded {len(RECORDED_FILES)} payloads into {args.record}")
+        return
+
+    server = FixtureAPIServer(
+        load_payloads(args.payloads) if args.payloads is not None else None,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        etags=not args.no_etags,
+        failures=dict(args.fail),
+        failure_rate=args.failure_rate,
+        failure_mode=args.failure_mode,
+        port=args.port,
+    )
+    print(f"Serving on {server.base_url}; use QURAN_TUI_API_BASE={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""Deterministic, full-size synthetic corpus for benchmarks.
+
+The shape matches the real data (114 surahs, 6,236 ayahs, the real per-surah
+ayah counts, ~3MB of text) so load and search costs are representative
+without needing network access. ``FixtureAPIServer`` serves the same data (or
+recorded payloads) in the shape of the quran.com endpoints.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from quran_tui.cache import write_cache
+from quran_tui.models import SurahInfo
+
+AYAH_COUNTS = [
+    7, 286, 200, 176, 120, 165, 206, 75, 129, 109, 123, 111, 43, 52, 99, 128, 111, 110, 98, 135,
+    112, 78, 118, 64, 77, 227, 93, 88, 69, 60, 34, 30, 73, 54, 45, 83, 182, 88, 75, 85,
+    54, 53, 89, 59, 37, 35, 38, 29, 18, 45, 60, 49, 62, 55, 78, 96, 29, 22, 24, 13,
+    14, 11, 11, 18, 12, 12, 30, 52, 52, 44, 28, 28, 20, 56, 40, 31, 50, 40, 46, 42,
+    29, 19, 36, 25, 22, 17, 19, 26, 30, 20, 15, 21, 11, 8, 8, 19, 5, 8, 8, 11,
+    11, 8, 3, 9, 5, 4, 7, 3, 6, 3, 5, 4, 5, 6,
+]
+
+_ARABIC_LETTERS = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+_HARAKAT = "َُِّْ"
+_ENGLISH_WORDS = (
+    "the lord of worlds mercy merciful patience prayer charity orphans believers guidance "
+    "those who believe and do good deeds will have gardens graced with flowing streams "
+    "god is all knowing all wise forgiving most merciful remember when your lord said to "
+    "the angels give thanks be mindful of god people of the book messenger revelation day "
+    "of judgement fire garden earth heavens night sun moon signs for those who reflect"
+).split()
+
+# Tokens that every benchmark query set can rely on.
+BENCHMARK_QUERIES = (
+    "merciful",
+    "lord of the worlds",
+    "patience and prayer",
+    "charity to orphans",
+    "those who believe",
+    "الحمد لله",
+    "رب العالمين",
+)
+# The same ground in the ``query`` syntax: phrases, NOT, OR and NEAR.
+BENCHMARK_SYNTAX_QUERIES = (
+    '"lord of the worlds" -merciful',
+    "patience NEAR prayer",
+    "charity OR orphans",
+    '"those who" believe',
+    '"رب العالمين"',
+)
+
+
+def _arabic_word(rng: random.Random) -> str:
+    letters = []
+    for _ in range(rng.randint(2, 7)):
+        letters.append(rng.choice(_ARABIC_LETTERS))
+        if rng.random() < 0.8:
+            letters.append(rng.choice(_HARAKAT))
+    return "".join(letters)
+
+
+def synthetic_corpus(seed: int = 7) -> tuple[list[SurahInfo], list[int], list[tuple[str, str]]]:
+    """Return ``(surah_table, ayah_numbers, rows)`` with (arabic, english) rows."""
+    rng = random.Random(seed)
+    surahs: list[SurahInfo] = []
+    ayah_numbers: list[int] = []
+    rows: list[tuple[str, str]] = []
+    for index, count in enumerate(AYAH_COUNTS):
+        number = index + 1
+        surahs.append(
+            SurahInfo(
+                number=number,
+                name_arabic=_arabic_word(rng),
+                name_english=f"Surah-{number}",
+                bismillah_pre=number not in (1, 9),
+                first_ayah=len(rows),
+                ayah_count=count,
+            )
+        )
+        for ayah_number in range(1, count + 1):
+            words = rng.randint(8, 40)
+            arabic = " ".join(_arabic_word(rng) for _ in range(words))
+            if rng.random() < 0.02:
+                arabic = "الْحَمْدُ لِلَّهِ رَبِّ الْعَالَمِينَ " + arabic
+            english = " ".join(rng.choice(_ENGLISH_WORDS) for _ in range(words + 4)).capitalize() + "."
+            ayah_numbers.append(ayah_number)
+            rows.append((arabic, english))
+    return surahs, ayah_numbers, rows
+
+
+def write_synthetic_cache(path: Path, seed: int = 7) -> Path:
+    surahs, ayah_numbers, rows = synthetic_corpus(seed)
+    write_cache(path, surahs, ayah_numbers, rows, meta={"columns": ["arabic", "english"], "translation_id": 85})
+    return path
+
+
+def api_payloads(seed: int = 7) -> dict[str, bytes]:
+    """Recorded-shape ``/chapters``, verses and translation payloads by URL path."""
+    surahs, ayah_numbers, rows = synthetic_corpus(seed)
+    chapters = [
+        {
+            "id": surah.number,
+            "name_arabic": surah.name_arabic,
+            "name_simple": surah.name_english,
+            "bismillah_pre": surah.bismillah_pre,
+            "verses_count": surah.ayah_count,
+        }
+        for surah in surahs
+    ]
+    verses = []
+    translations = []
+    for surah in surahs:
+        for index in range(surah.first_ayah, surah.first_ayah + surah.ayah_count):
+            verses.append(
+                {
+                    "id": index + 1,
+                    "verse_key": f"{surah.number}:{ayah_numbers[index]}",
+                    "text_uthmani": rows[index][0],
+                }
+            )
+            translations.append({"resource_id": 85, "text": rows[index][1]})
+
+    def encode(payload: dict) -> bytes:
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    return {
+        "/chapters": encode({"chapters": chapters}),
+        "/quran/verses/uthmani": encode({"verses": verses, "meta": {"filters": {}}}),
+        "/quran/translations/85": encode({"translations": translations, "meta": {"translation_name": "Synthetic"}}),
+    }
+
+
+# URL path -> file name inside a recorded payload directory.
+RECORDED_FILES = {
+    "/chapters": "chapters.json",
+    "/quran/verses/uthmani": "verses-uthmani.json",
+    "/quran/translations/85": "translations-85.json",
+}
+
+
+def save_payloads(payloads: dict[str, bytes], directory: Path) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for path, name in RECORDED_FILES.items():
+        if path in payloads:
+            (directory / name).write_bytes(payloads[path])
+
+
+def load_payloads(directory: Path) -> dict[str, bytes]:
+    """Payloads recorded with ``save_payloads`` (or ``fixture_server --record``)."""
+    payloads = {}
+    for path, name in RECORDED_FILES.items():
+        file_path = directory / name
+        if file_path.exists():
+            payloads[path] = file_path.read_bytes()
+    if not payloads:
+        raise FileNotFoundError(f"No recorded payloads in {directory}")
+    return payloads
+
+
+class FixtureAPIServer:
+    """Local stand-in for api.quran.com serving ``api_payloads`` on a free port.
+
+    ``latency`` seconds are added before every response, which is what makes
+    sequential and parallel downloads distinguishable, and ``bandwidth`` caps
+    the body rate in bytes per second. Responses carry an ETag derived from
+    the payload and honour ``If-None-Match`` with a 304 unless ``etags`` is
+    off. ``statuses`` records ``(path, status)`` per request.
+
+    Failures are injected per path: ``failures[path]`` requests fail before it
+    starts succeeding, plus a seeded ``failure_rate`` share of the rest. A
+    failure is a 503 for ``failure_mode="error"`` or a body cut off halfway
+    for ``"truncate"``.
+    """
+
+    CHUNK_SIZE = 16 * 1024
+
+    def __init__(
+        self,
+        payloads: dict[str, bytes] | None = None,
+        *,
+        latency: float = 0.0,
+        bandwidth: float | None = None,
+        etags: bool = True,
+        failures: dict[str, int] | None = None,
+        failure_rate: float = 0.0,
+        failure_mode: str = "error",
+        seed: int = 7,
+        port: int = 0,
+    ) -> None:
+        if failure_mode not in ("error", "truncate"):
+            raise ValueError(f"Unknown failure mode {failure_mode!r}.")
+        self.payloads = payloads if payloads is not None else api_payloads()
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.etags = etags
+        self.failures = dict(failures or {})
+        self.failure_rate = failure_rate
+        self.failure_mode = failure_mode
+        self.requests: list[str] = []
+        self.statuses: list[tuple[str, int]] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _should_fail(self, path: str) -> bool:
+        with self._lock:
+            remaining = self.failures.get(path, 0)
+            if remaining > 0:
+                self.failures[path] = remaining - 1
+                return True
+            return self.failure_rate > 0 and self._rng.random() < self.failure_rate
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                path = self.path.split("?", 1)[0]
+                fixture.requests.append(path)
+                if fixture.latency:
+                    time.sleep(fixture.latency)
+                payload = fixture.payloads.get(path)
+                if payload is None:
+                    fixture.statuses.append((path, 404))
+                    self.send_error(404)
+                    return
+                failing = fixture._should_fail(path)
+                if failing and fixture.failure_mode == "error":
+                    fixture.statuses.append((path, 503))
+                    self.send_error(503)
+                    return
+                etag = f'"{hashlib.sha256(payload).hexdigest()[:16]}"'
+                if fixture.etags and self.headers.get("If-None-Match") == etag:
+                    fixture.statuses.append((path, 304))
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                fixture.statuses.append((path, 200))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if fixture.etags:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                body = payload[: len(payload) // 2] if failing else payload
+                self._write_body(body)
+                if failing:
+                    self.close_connection = True
+
+            def _write_body(self, body: bytes) -> None:
+                if not fixture.bandwidth:
+                    self.wfile.write(body)
+                    return
+                step = fixture.CHUNK_SIZE
+                for start in range(0, len(body), step):
+                    chunk = body[start : start + step]
+                    self.wfile.write(chunk)
+                    time.sleep(len(chunk) / fixture.bandwidth)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self) -> FixtureAPIServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
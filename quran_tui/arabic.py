@@ -0,0 +1,56 @@
+"""Arabic normalization for search.
+
+``skeleton`` reduces vocalized Uthmani text and whatever a user types to the
+same bare letters: harakat, Quranic annotation marks and tatweel go, and the
+alef, hamza, ya and ta marbuta variants collapse to one form each. Uthmani
+writes some long vowels with a superscript (dagger) alef that modern
+spelling writes out in some words (العالمين) and drops in others (ذلك), so
+callers can ask for either reading.
+"""
+from __future__ import annotations
+
+import re
+
+DAGGER_ALEF = "ٰ"
+
+_REMOVED = [
+    *range(0x0610, 0x061B),  # honorific and small high marks
+    *range(0x064B, 0x0660),  # harakat: tanween, fatha ... sukun, maddah, hamza marks
+    0x0640,  # tatweel
+    *range(0x06D6, 0x06EE),  # Quranic annotation: small high ligatures, waqf marks, small waw/ya
+    *range(0x08D3, 0x0900),  # extended Quranic marks
+]
+_FOLDED = {
+    "آ": "ا",  # alef with madda
+    "أ": "ا",  # alef with hamza above
+    "إ": "ا",  # alef with hamza below
+    "ٱ": "ا",  # alef wasla
+    "ٲ": "ا",  # alef with wavy hamza above
+    "ٳ": "ا",  # alef with wavy hamza below
+    "ؤ": "و",  # waw with hamza
+    "ئ": "ي",  # ya with hamza
+    "ى": "ي",  # alef maksura
+    "ی": "ي",  # farsi ya
+    "ة": "ه",  # ta marbuta
+}
+
+_TABLE = {code: None for code in _REMOVED}
+_TABLE.update({ord(source): target for source, target in _FOLDED.items()})
+_WITH_DAGGER_AS_ALEF = {**_TABLE, ord(DAGGER_ALEF): "ا"}
+_WITHOUT_DAGGER = {**_TABLE, ord(DAGGER_ALEF): None}
+
+_ARABIC_LETTER = re.compile("[ء-يٱ-ۓۺ-ۿ]")
+
+
+def skeleton(text: str, *, dagger_alef: bool = True) -> str:
+    """Bare, whitespace-collapsed letters of ``text``.
+
+    ``dagger_alef`` writes the superscript alef as a full alef; otherwise it
+    is dropped. Non-Arabic text is only casefolded.
+    """
+    table = _WITH_DAGGER_AS_ALEF if dagger_alef else _WITHOUT_DAGGER
+    return " ".join(text.casefold().translate(table).split())
+
+
+def contains_arabic(text: str) -> bool:
+    return _ARABIC_LETTER.search(text) is not None
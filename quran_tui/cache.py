@@ -0,0 +1,390 @@
+"""Binary, memory-mapped Quran cache (format v4).
+
+Layout (all integers little-endian)::
+
+    header        fixed struct, see ``_HEADER``
+    surah table   one ``_SURAH`` struct per surah
+    names         uint32 end offsets for (arabic, english) name pairs + UTF-8 blob
+    ayah numbers  uint16 per ayah
+    cell ends     uint32 per (ayah, column) cell, relative to the surah frame
+    frames        one UTF-8 frame per surah holding its cells row by row,
+                  stored raw or compressed on its own (see ``ENCODINGS``)
+    meta          small UTF-8 JSON object (column names, translation id,
+                  ``content_sha256`` of the uncompressed content, so it does
+                  not change with the encoding)
+
+Opening a cache only maps the file and reads the header, the surah table and
+the two small offset arrays; verse text is decoded one surah frame at a time.
+Compressed frames are independent zlib/lzma streams, so reading one surah
+inflates only that surah.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import lzma
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Sequence
+
+from .models import SurahInfo
+
+MAGIC = b"QTUI"
+FORMAT_VERSION = 4
+ENCODING_RAW = 0
+ENCODING_ZLIB = 1
+ENCODING_LZMA = 2
+ENCODINGS = {"raw": ENCODING_RAW, "zlib": ENCODING_ZLIB, "lzma": ENCODING_LZMA}
+
+_HEADER = struct.Struct("<4sHBxHxxIIIxxxxQQQQQQ4x")
+_SURAH = struct.Struct("<HBxIIQII")
+_ALIGNMENT = 8
+# Inflated frames kept per reader; sequential reads touch one surah at a time.
+_DECODED_FRAMES = 4
+
+
+class CacheFormatError(ValueError):
+    """Raised when a cache file is truncated, foreign or of another version."""
+
+
+def _pad(buffer: bytearray) -> None:
+    buffer.extend(b"\0" * (-len(buffer) % _ALIGNMENT))
+
+
+def _little_endian_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":  # pragma: no cover
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder != "little":  # pragma: no cover
+        values.byteswap()
+    return values
+
+
+def _compress(frame: bytes, encoding: int) -> bytes:
+    if encoding == ENCODING_ZLIB:
+        return zlib.compress(frame)
+    if encoding == ENCODING_LZMA:
+        return lzma.compress(frame, format=lzma.FORMAT_XZ, check=lzma.CHECK_NONE)
+    return frame
+
+
+def _decompress(frame: bytes, encoding: int) -> bytes:
+    if encoding == ENCODING_ZLIB:
+        return zlib.decompress(frame)
+    return lzma.decompress(frame, format=lzma.FORMAT_XZ)
+
+
+def write_cache(
+    path: Path,
+    surahs: Sequence[SurahInfo],
+    ayah_numbers: Sequence[int],
+    rows: Sequence[Sequence[str]],
+    *,
+    meta: dict[str, Any] | None = None,
+    encoding: int = ENCODING_RAW,
+) -> None:
+    """Write a v4 cache atomically (temp file, fsync, rename).
+
+    ``encoding`` is one of ``ENCODINGS``; each surah frame is compressed on
+    its own so readers can inflate a single surah.
+    """
+    if len(ayah_numbers) != len(rows):
+        raise ValueError("ayah_numbers and rows must have the same length.")
+    if encoding not in ENCODINGS.values():
+        raise ValueError(f"Unknown cache encoding {encoding}.")
+    column_count = len(rows[0]) if rows else 0
+
+    # The content hash covers what the cache holds, not how it is stored:
+    # uncompressed frames, and the surah table without frame offsets.
+    digest = hashlib.sha256()
+    frames = bytearray()
+    frame_entries: list[tuple[int, int, int]] = []
+    cell_ends: list[int] = []
+    for surah in surahs:
+        frame = bytearray()
+        for row in rows[surah.first_ayah : surah.first_ayah + surah.ayah_count]:
+            if len(row) != column_count:
+                raise ValueError("Every row must have the same number of columns.")
+            for cell in row:
+                frame.extend(cell.encode("utf-8"))
+                cell_ends.append(len(frame))
+        digest.update(frame)
+        bismillah = 1 if surah.bismillah_pre else 0
+        digest.update(_SURAH.pack(surah.number, bismillah, surah.first_ayah, surah.ayah_count, 0, 0, len(frame)))
+        stored = _compress(frame, encoding)
+        frame_entries.append((len(frames), len(stored), len(frame)))
+        frames.extend(stored)
+
+    if len(cell_ends) != len(rows) * column_count:
+        raise ValueError("Surah table does not cover every ayah exactly once.")
+
+    names_blob = bytearray()
+    name_ends: list[int] = []
+    for surah in surahs:
+        for name in (surah.name_arabic, surah.name_english):
+            names_blob.extend(name.encode("utf-8"))
+            name_ends.append(len(names_blob))
+
+    body = bytearray()
+    offset = _HEADER.size
+
+    surah_table_offset = offset + len(body)
+    for surah, (frame_offset, frame_length, raw_length) in zip(surahs, frame_entries):
+        body.extend(
+            _SURAH.pack(
+                surah.number,
+                1 if surah.bismillah_pre else 0,
+                surah.first_ayah,
+                surah.ayah_count,
+                frame_offset,
+                frame_length,
+                raw_length,
+            )
+        )
+    _pad(body)
+
+    names_offset = offset + len(body)
+    body.extend(_little_endian_bytes(array("I", name_ends)))
+    body.extend(names_blob)
+    _pad(body)
+
+    ayah_numbers_offset = offset + len(body)
+    body.extend(_little_endian_bytes(array("H", ayah_numbers)))
+    _pad(body)
+
+    cell_ends_offset = offset + len(body)
+    body.extend(_little_endian_bytes(array("I", cell_ends)))
+    _pad(body)
+
+    frames_offset = offset + len(body)
+
+    digest.update(body[names_offset - offset :])
+    meta = {**(meta or {}), "content_sha256": digest.hexdigest()}
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    meta_offset = frames_offset + len(frames)
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        encoding,
+        column_count,
+        len(surahs),
+        len(rows),
+        len(meta_bytes),
+        meta_offset,
+        surah_table_offset,
+        names_offset,
+        ayah_numbers_offset,
+        cell_ends_offset,
+        frames_offset,
+    )
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(header)
+        handle.write(body)
+        handle.write(frames)
+        handle.write(meta_bytes)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+class CacheReader:
+    """Read-only view over a memory-mapped v4 cache file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._decoded: OrderedDict[int, bytes] = OrderedDict()
+        self._decoded_lock = threading.Lock()
+        with open(path, "rb") as handle:
+            try:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise CacheFormatError("Cache file is empty.") from exc
+
+        try:
+            self._parse()
+        except (struct.error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+            self.close()
+            raise CacheFormatError(f"Corrupt cache file: {exc}") from exc
+        except CacheFormatError:
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        mm = self._mmap
+        if len(mm) < _HEADER.size:
+            raise CacheFormatError("Cache file is truncated.")
+        (
+            magic,
+            version,
+            self.encoding,
+            self.column_count,
+            surah_count,
+            self.ayah_count,
+            meta_length,
+            meta_offset,
+            surah_table_offset,
+            names_offset,
+            ayah_numbers_offset,
+            cell_ends_offset,
+            self._frames_offset,
+        ) = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise CacheFormatError("Not a Quran TUI cache file.")
+        if version != FORMAT_VERSION:
+            raise CacheFormatError(f"Unsupported cache version {version}.")
+        if self.encoding not in ENCODINGS.values():
+            raise CacheFormatError(f"Unsupported cache encoding {self.encoding}.")
+
+        self.meta: dict[str, Any] = json.loads(mm[meta_offset : meta_offset + meta_length].decode("utf-8"))
+
+        name_ends = _read_array("I", mm[names_offset : names_offset + 8 * surah_count])
+        names_blob_offset = names_offset + 8 * surah_count
+        names_blob = mm[names_blob_offset : names_blob_offset + (name_ends[-1] if name_ends else 0)]
+
+        self.surahs: list[SurahInfo] = []
+        self._frames: list[tuple[int, int, int]] = []
+        for index in range(surah_count):
+            number, bismillah, first_ayah, ayah_count, frame_offset, frame_length, raw_length = _SURAH.unpack_from(
+                mm, surah_table_offset + index * _SURAH.size
+            )
+            name_start = name_ends[2 * index - 1] if index else 0
+            name_mid = name_ends[2 * index]
+            name_end = name_ends[2 * index + 1]
+            self.surahs.append(
+                SurahInfo(
+                    number=number,
+                    name_arabic=names_blob[name_start:name_mid].decode("utf-8"),
+                    name_english=names_blob[name_mid:name_end].decode("utf-8"),
+                    bismillah_pre=bool(bismillah),
+                    first_ayah=first_ayah,
+                    ayah_count=ayah_count,
+                )
+            )
+            self._frames.append((frame_offset, frame_length, raw_length))
+        self._surah_starts = [surah.first_ayah for surah in self.surahs]
+
+        self.ayah_numbers = _read_array("H", mm[ayah_numbers_offset : ayah_numbers_offset + 2 * self.ayah_count])
+        cell_count = self.ayah_count * self.column_count
+        self._cell_ends = _read_array("I", mm[cell_ends_offset : cell_ends_offset + 4 * cell_count])
+        if len(self.ayah_numbers) != self.ayah_count or len(self._cell_ends) != cell_count:
+            raise CacheFormatError("Cache file is truncated.")
+
+        if self.surahs:
+            last_offset, last_length, _ = self._frames[-1]
+            if self._frames_offset + last_offset + last_length > len(mm):
+                raise CacheFormatError("Cache file is truncated.")
+
+    def surah_index_for_ayah(self, ayah_index: int) -> int:
+        """Index into ``surahs`` of the surah containing flat ayah ``ayah_index``."""
+        return bisect_right(self._surah_starts, ayah_index) - 1
+
+    def _frame(self, surah_index: int) -> bytes:
+        frame_offset, frame_length, raw_length = self._frames[surah_index]
+        start = self._frames_offset + frame_offset
+        if self.encoding == ENCODING_RAW:
+            return self._mmap[start : start + frame_length]
+
+        with self._decoded_lock:
+            frame = self._decoded.get(surah_index)
+            if frame is not None:
+                self._decoded.move_to_end(surah_index)
+                return frame
+        try:
+            frame = _decompress(self._mmap[start : start + frame_length], self.encoding)
+        except (zlib.error, lzma.LZMAError) as exc:
+            raise CacheFormatError(f"Corrupt frame for surah index {surah_index}: {exc}") from exc
+        if len(frame) != raw_length:
+            raise CacheFormatError(f"Corrupt frame for surah index {surah_index}.")
+        with self._decoded_lock:
+            self._decoded[surah_index] = frame
+            while len(self._decoded) > _DECODED_FRAMES:
+                self._decoded.popitem(last=False)
+        return frame
+
+    def surah_rows(self, surah_index: int) -> list[tuple[str, ...]]:
+        """Decode every (column...) row of one surah from its frame."""
+        surah = self.surahs[surah_index]
+        frame = self._frame(surah_index)
+        columns = self.column_count
+        ends = self._cell_ends
+        cell = surah.first_ayah * columns
+        position = 0
+        rows: list[tuple[str, ...]] = []
+        for _ in range(surah.ayah_count):
+            row: list[str] = []
+            for _ in range(columns):
+                end = ends[cell]
+                row.append(frame[position:end].decode("utf-8"))
+                position = end
+                cell += 1
+            rows.append(tuple(row))
+        return rows
+
+    def text(self, ayah_index: int, column: int) -> str:
+        surah_index = self.surah_index_for_ayah(ayah_index)
+        surah = self.surahs[surah_index]
+        cell = ayah_index * self.column_count + column
+        start = self._cell_ends[cell - 1] if cell > surah.first_ayah * self.column_count else 0
+        if self.encoding != ENCODING_RAW:
+            return self._frame(surah_index)[start : self._cell_ends[cell]].decode("utf-8")
+        frame_offset = self._frames[surah_index][0]
+        base = self._frames_offset + frame_offset
+        return self._mmap[base + start : base + self._cell_ends[cell]].decode("utf-8")
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the cached data, recorded when the cache was written."""
+        return str(self.meta.get("content_sha256", ""))
+
+    def prefetch(self) -> None:
+        """Fault every text frame into the page cache ahead of use."""
+        step = 1 << 20
+        end = len(self._mmap)
+        for start in range(self._frames_offset, end, step):
+            self._mmap[start : min(start + step, end)]
+
+    def column(self, column: int) -> CacheColumn:
+        return CacheColumn(self, column)
+
+    def close(self) -> None:
+        self._decoded.clear()
+        self._mmap.close()
+
+    def __enter__(self) -> CacheReader:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class CacheColumn:
+    """``TextSource`` reading one column straight from the mapped cache."""
+
+    __slots__ = ("_reader", "_column")
+
+    def __init__(self, reader: CacheReader, column: int) -> None:
+        self._reader = reader
+        self._column = column
+
+    def __len__(self) -> int:
+        return self._reader.ayah_count
+
+    def text(self, index: int) -> str:
+        return self._reader.text(index, self._column)
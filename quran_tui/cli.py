@@ -4,10 +4,28 @@ import argparse
 import os
 import shutil
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from . import __version__
+from .cache import ENCODINGS
+from .config import (
+    CACHE_ENCODING,
+    SEARCH_BACKEND,
+    SEARCH_CACHE_PATH,
+    SEARCH_INDEX_PATH,
+    SEARCH_RANKING,
+    SEARCH_WORKERS,
+    SNAPSHOT_PATH,
+    TRANSLATION_ID,
+)
 from .data import QuranRepository
-from .search import QuranSearchEngine
+from .models import QuranData
+from .result_cache import ResultCache
+from .scoring import BACKENDS, get_backend
+from .search import RANKINGS, QuranSearchEngine, SearchArtifacts
+from .search_index import open_search_index, search_index_key, write_search_index
+from .search_pool import SearchPool
+from .snapshot import load_snapshot, snapshot_key, write_snapshot
 from .state import ReadingStateStore
 from .ui import QuranTUIApplication
 from .rtl import set_rtl_mode
@@ -27,13 +45,58 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--refresh-cache",
         action="store_true",
-        help="Download fresh Quran data and overwrite local cache.",
+        help="Re-check Quran data with the API and update only what changed.",
     )
     parser.add_argument(
         "--download-data",
         action="store_true",
         help="Download Quran data and exit (used during install).",
     )
+    parser.add_argument(
+        "--cache-encoding",
+        choices=sorted(ENCODINGS),
+        default=CACHE_ENCODING,
+        help="Store the cache raw or compressed per surah (zlib/lzma); converts an existing cache.",
+    )
+    parser.add_argument(
+        "--add-translation",
+        action="append",
+        type=int,
+        default=[],
+        metavar="ID",
+        help="Download another quran.com translation by resource id (repeatable).",
+    )
+    parser.add_argument(
+        "--translation",
+        type=int,
+        default=None,
+        metavar="ID",
+        help=f"Translation to show first (default {TRANSLATION_ID}; see --add-translation).",
+    )
+    parser.add_argument(
+        "--search-backend",
+        choices=["auto", *BACKENDS],
+        default=SEARCH_BACKEND,
+        help="Fuzzy scoring backend (default: fastest available).",
+    )
+    parser.add_argument(
+        "--search-ranking",
+        choices=RANKINGS,
+        default=SEARCH_RANKING,
+        help="Rank by fuzzy score, or by BM25 term weights over the whole corpus (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--search-workers",
+        type=int,
+        default=SEARCH_WORKERS,
+        metavar="N",
+        help="Share full search scans out to N worker processes (default: search in-process).",
+    )
+    parser.add_argument(
+        "--no-search-cache",
+        action="store_true",
+        help="Do not load or save recent search results between runs.",
+    )
     parser.add_argument(
         "--plain",
         action="store_true",
@@ -58,17 +121,59 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _download_data_only() -> int:
-    repository = QuranRepository()
+def _download_data_only(translation_ids: list[int], cache_encoding: str | None) -> int:
+    repository = QuranRepository(cache_encoding=cache_encoding)
     print("Downloading Quran data...", file=sys.stderr)
     try:
-        repository.load(force_refresh=not repository.has_cache())
+        quran_data = repository.load(force_refresh=not repository.has_cache())
+        for translation_id in translation_ids:
+            repository.download_translation(translation_id, quran_data)
         print("Quran data ready.", file=sys.stderr)
-        return 0
     except Exception as exc:
         print(f"Failed to download: {exc}", file=sys.stderr)
         return 1
 
+    try:
+        _write_snapshot(repository, quran_data)
+        _write_search_index(repository, SearchArtifacts.build(quran_data.ayahs_flat))
+        print("Snapshot and search index ready.", file=sys.stderr)
+    except (OSError, ValueError) as exc:
+        # Both only speed up startup; the app works without them.
+        print(f"Skipped snapshot and search index: {exc}", file=sys.stderr)
+    return 0
+
+
+def _content_hash(repository: QuranRepository) -> str:
+    content_hash = repository.content_hash()
+    if content_hash is None:
+        raise ValueError("no readable cache to key the warm-start files on")
+    return content_hash
+
+
+def _write_snapshot(repository: QuranRepository, quran_data: QuranData) -> None:
+    write_snapshot(SNAPSHOT_PATH, quran_data, snapshot_key(_content_hash(repository)))
+
+
+def _write_search_index(repository: QuranRepository, artifacts: SearchArtifacts) -> None:
+    write_search_index(SEARCH_INDEX_PATH, artifacts, search_index_key(_content_hash(repository)))
+
+
+def _refresh_stale_files(
+    repository: QuranRepository,
+    quran_data: QuranData,
+    snapshot_stale: bool,
+    search_engine: Future[QuranSearchEngine] | None,
+) -> None:
+    """Rewrite the stale snapshot and, given the engine being built, the index."""
+    try:
+        if snapshot_stale:
+            _write_snapshot(repository, quran_data)
+        if search_engine is not None:
+            _write_search_index(repository, search_engine.result().artifacts)
+    except Exception:
+        # Best effort in the background; the next start simply tries again.
+        pass
+
 
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
@@ -81,7 +186,7 @@ def main(argv: list[str] | None = None) -> int:
         return 0 if update_result.updated else 1
 
     if args.download_data:
-        return _download_data_only()
+        return _download_data_only(args.add_translation, args.cache_encoding)
 
     if not args.no_update_check:
         should_exit = _check_and_prompt_update()
@@ -89,26 +194,119 @@ def main(argv: list[str] | None = None) -> int:
             return 0
 
     set_rtl_mode(args.rtl_mode)
+    try:
+        backend = get_backend(args.search_backend)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
 
-    repository = QuranRepository()
-    if args.refresh_cache or not repository.has_cache():
+    repository = QuranRepository(cache_encoding=args.cache_encoding)
+    if not repository.has_cache():
         print("Loading Quran data from API (first run may take a moment)...", file=sys.stderr)
+    elif args.refresh_cache:
+        print("Checking Quran data for updates...", file=sys.stderr)
 
     try:
         quran_data = repository.load(force_refresh=args.refresh_cache)
+        for translation_id in args.add_translation:
+            repository.download_translation(translation_id, quran_data)
     except Exception as exc:  # pragma: no cover
         print(f"Failed to load Quran data: {exc}", file=sys.stderr)
         return 1
 
-    search_engine = QuranSearchEngine(quran_data.ayahs_flat)
+    loader = ThreadPoolExecutor(max_workers=2, thread_name_prefix="quran-load")
+    content_hash = repository.content_hash()
+    snapshot = None
+    if content_hash is not None:
+        snapshot = load_snapshot(SNAPSHOT_PATH, snapshot_key(content_hash), memory_budget=repository.memory_budget)
+    if snapshot is not None:
+        quran_data = snapshot.quran_data
+    store = quran_data.store
+    if store is not None:
+        repository.bind_translations(store)
+
+    translation_id = args.translation or TRANSLATION_ID
+    if translation_id != TRANSLATION_ID and store is not None:
+        try:
+            store.select_translation(translation_id)
+        except (KeyError, OSError, ValueError) as exc:
+            print(f"Translation {translation_id} unavailable ({exc}); using the default.", file=sys.stderr)
+            translation_id = TRANSLATION_ID
+    else:
+        translation_id = TRANSLATION_ID
+
+    # Saved results only hold for the corpus and translation they came from.
+    result_cache = ResultCache()
+    result_cache_tag = None
+    if content_hash is not None and not args.no_search_cache:
+        result_cache_tag = f"{snapshot_key(content_hash)}|{translation_id}"
+        result_cache.load(SEARCH_CACHE_PATH, result_cache_tag)
+
+    # The search index holds the columns of the default translation.
+    artifacts = None
+    if content_hash is not None and translation_id == TRANSLATION_ID:
+        artifacts = open_search_index(SEARCH_INDEX_PATH, search_index_key(content_hash))
+
+    # Workers map the same index, so they only serve an engine built on it.
+    pool = None
+    if args.search_workers > 0:
+        if artifacts is not None and content_hash is not None:
+            pool = SearchPool(SEARCH_INDEX_PATH, search_index_key(content_hash), args.search_workers)
+        else:
+            print(
+                "Search workers need the current search index of the default translation; searching in-process.",
+                file=sys.stderr,
+            )
+
+    # Draw the UI right away; whatever is not on disk yet loads behind it.
+    if snapshot is None:
+        # The mapped cache is readable already; this only warms the page cache,
+        # so the reader does not wait for it.
+        loader.submit(repository.prefetch)
+    if pool is not None:
+        loader.submit(pool.warm)
+    stale_index_engine = None
+    if artifacts is not None:
+        search_engine: QuranSearchEngine | Future[QuranSearchEngine] = QuranSearchEngine(
+            quran_data.ayahs_flat,
+            artifacts=artifacts,
+            backend=backend,
+            result_cache=result_cache,
+            pool=pool,
+            ranking=args.search_ranking,
+        )
+    else:
+        search_engine = loader.submit(
+            QuranSearchEngine,
+            quran_data.ayahs_flat,
+            backend=backend,
+            result_cache=result_cache,
+            ranking=args.search_ranking,
+        )
+        if translation_id == TRANSLATION_ID and SEARCH_INDEX_PATH.exists():
+            stale_index_engine = search_engine
+    snapshot_stale = snapshot is None and SNAPSHOT_PATH.exists()
+    if snapshot_stale or stale_index_engine is not None:
+        loader.submit(_refresh_stale_files, repository, quran_data, snapshot_stale, stale_index_engine)
     state_store = ReadingStateStore()
-    app = QuranTUIApplication(
-        quran_data=quran_data,
-        search_engine=search_engine,
-        state_store=state_store,
-        enable_color=not args.plain,
-    )
-    app.run()
+    try:
+        app = QuranTUIApplication(
+            quran_data=quran_data,
+            search_engine=search_engine,
+            state_store=state_store,
+            enable_color=not args.plain,
+            translations=repository.installed_translations(),
+        )
+        app.run()
+    finally:
+        loader.shutdown(wait=False, cancel_futures=True)
+        if pool is not None:
+            pool.close()
+    if result_cache_tag is not None:
+        try:
+            result_cache.save(SEARCH_CACHE_PATH, result_cache_tag)
+        except OSError:
+            pass  # only a head start for the next run
     return 0
 
 
@@ -1,22 +1,64 @@
 from __future__ import annotations
 
 from pathlib import Path
+import os
 import shutil
 
 APP_DIR = Path.home() / ".quran-tui"
 LEGACY_APP_DIR = Path.home() / ".quran_tui"
 CACHE_DIR = APP_DIR / "cache"
 STATE_PATH = APP_DIR / "state.json"
-CACHE_PATH = CACHE_DIR / "quran-tui-cache-v1.json"
+SEARCH_CACHE_PATH = APP_DIR / "search-cache.json"
+CACHE_PATH = CACHE_DIR / "quran-tui-cache-v4.bin"
+LEGACY_CACHE_PATH = CACHE_DIR / "quran-tui-cache-v1.json"
+SNAPSHOT_PATH = CACHE_DIR / "quran-tui-snapshot.bin"
+SEARCH_INDEX_PATH = CACHE_DIR / "quran-tui-search-index.bin"
+TRANSLATIONS_DIR = CACHE_DIR / "translations"
 
-QURAN_API_BASE = "https://api.quran.com/api/v4"
-QURAN_CHAPTERS_URL = f"{QURAN_API_BASE}/chapters"
-QURAN_VERSES_URL = f"{QURAN_API_BASE}/quran/verses/uthmani"
-QURAN_TRANSLATIONS_URL = f"{QURAN_API_BASE}/quran/translations/85"
+# QURAN_TUI_API_BASE points the app at a mirror or a local stand-in
+# (see ``python -m benchmarks.fixture_server``).
+QURAN_API_BASE = os.environ.get("QURAN_TUI_API_BASE") or "https://api.quran.com/api/v4"
 TRANSLATION_ID = 85  # M.A.S. Abdel Haleem (English)
+QURAN_CHAPTERS_PATH = "/chapters"
+QURAN_VERSES_PATH = "/quran/verses/uthmani"
+QURAN_TRANSLATION_PATH_TEMPLATE = "/quran/translations/{translation_id}"
+QURAN_TRANSLATIONS_PATH = QURAN_TRANSLATION_PATH_TEMPLATE.format(translation_id=TRANSLATION_ID)
+# Known English translations by quran.com resource id; any other id also works.
+TRANSLATIONS = {
+    85: "Abdel Haleem",
+    20: "Saheeh International",
+    131: "The Clear Quran",
+    22: "Yusuf Ali",
+    19: "Pickthall",
+}
 HTTP_TIMEOUT_SECONDS = 30
+HTTP_RETRIES = 3
+HTTP_RETRY_BASE_SECONDS = 1.0
+HTTP_RETRY_MAX_SECONDS = 8.0
+DOWNLOAD_WORKERS = 3
+
+# On-disk frame encoding: "raw", "zlib" or "lzma". None keeps whatever the
+# existing cache uses (raw for a new one); compression trades CPU for I/O.
+CACHE_ENCODING: str | None = None
 
 MAX_SEARCH_RESULTS = 25
+# Pause in typing before the search prompt runs a live search.
+SEARCH_DEBOUNCE_SECONDS = 0.15
+# Bounds of the per-engine LRU of search results.
+SEARCH_CACHE_ENTRIES = 256
+SEARCH_CACHE_BYTES = 2 * 1024 * 1024
+# Fuzzy scoring backend: "auto" (fastest available), "cdist" (needs numpy),
+# "extract", "rapidfuzz" or "difflib".
+SEARCH_BACKEND = "auto"
+# Search ranking: "fuzzy" (the backend above, over index candidates) or
+# "bm25" (term weights over the whole corpus; fast, but no typo tolerance).
+SEARCH_RANKING = "fuzzy"
+# Worker processes that share out full scans (see ``search_pool``); 0 scores
+# in-process. Needs the search index written by ``quran --download-data``.
+SEARCH_WORKERS = 0
+
+# Upper bound on memory held by lazily built surahs; None disables eviction.
+SURAH_MEMORY_BUDGET_BYTES: int | None = 16 * 1024 * 1024
 
 
 def ensure_app_dirs() -> None:
@@ -1,199 +1,548 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import random
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
-from urllib.error import URLError
+from typing import Any, BinaryIO, Callable, Generic, Sequence, TypeVar
+from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+from .cache import ENCODING_RAW, ENCODINGS, CacheReader, write_cache
 from .config import (
+    CACHE_ENCODING,
     CACHE_PATH,
+    DOWNLOAD_WORKERS,
+    HTTP_RETRIES,
+    HTTP_RETRY_BASE_SECONDS,
+    HTTP_RETRY_MAX_SECONDS,
     HTTP_TIMEOUT_SECONDS,
-    QURAN_CHAPTERS_URL,
-    QURAN_VERSES_URL,
-    QURAN_TRANSLATIONS_URL,
+    LEGACY_CACHE_PATH,
+    QURAN_API_BASE,
+    QURAN_CHAPTERS_PATH,
+    QURAN_TRANSLATION_PATH_TEMPLATE,
+    QURAN_TRANSLATIONS_PATH,
+    QURAN_VERSES_PATH,
+    SURAH_MEMORY_BUDGET_BYTES,
+    TRANSLATION_ID,
+    TRANSLATIONS_DIR,
     ensure_app_dirs,
 )
-from .models import Ayah, QuranData, SurahData
+from .jsonstream import CHUNK_SIZE, iter_json_array
+from .models import AyahStore, QuranData, SurahInfo, TextSource
+
+T = TypeVar("T")
+
+# (surah number, arabic name, english name, bismillah_pre)
+ChapterRecord = tuple[int, str, str, bool]
+# (surah number, ayah number, uthmani text)
+VerseRecord = tuple[int, int, str]
+
+
+@dataclass(slots=True, frozen=True)
+class Validator:
+    """What we know about the last payload fetched from one endpoint."""
+
+    url: str
+    etag: str | None
+    last_modified: str | None
+    sha256: str
+
+
+@dataclass(slots=True, frozen=True)
+class FetchResult(Generic[T]):
+    """Parsed records, or ``None`` when the endpoint reported no change."""
+
+    records: list[T] | None
+    validator: Validator
 
 
 class QuranRepository:
     """Loads Quran data from local cache or quran.com API."""
 
-    def __init__(self, cache_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        cache_path: Path | None = None,
+        legacy_cache_path: Path | None = None,
+        *,
+        memory_budget: int | None = SURAH_MEMORY_BUDGET_BYTES,
+        api_base: str | None = None,
+        download_workers: int = DOWNLOAD_WORKERS,
+        translations_dir: Path | None = None,
+        cache_encoding: str | None = CACHE_ENCODING,
+    ) -> None:
+        """``cache_encoding`` names an entry of ``cache.ENCODINGS``; an existing
+        cache in another encoding is rewritten on the next load.
+        """
+        if cache_encoding is not None and cache_encoding not in ENCODINGS:
+            raise ValueError(f"Unknown cache encoding {cache_encoding!r}.")
         self.cache_path = cache_path or CACHE_PATH
+        self.legacy_cache_path = legacy_cache_path or LEGACY_CACHE_PATH
+        if translations_dir is None:
+            translations_dir = TRANSLATIONS_DIR if cache_path is None else self.cache_path.parent / "translations"
+        self.translations_dir = translations_dir
+        self.memory_budget = memory_budget
+        self.api_base = (api_base or QURAN_API_BASE).rstrip("/")
+        self.download_workers = max(1, download_workers)
+        self.validators_path = self.cache_path.with_suffix(".validators.json")
+        self.cache_encoding = cache_encoding
+        self._disk_encoding = ENCODING_RAW
+        self._reader: CacheReader | None = None
+        self._translation_readers: dict[int, CacheReader] = {}
 
     def has_cache(self) -> bool:
-        return self.cache_path.exists()
+        return self.cache_path.exists() or self.legacy_cache_path.exists()
 
     def load(self, force_refresh: bool = False) -> QuranData:
+        """Load from cache; with ``force_refresh``, revalidate it against the API.
+
+        A refresh sends conditional requests and rebuilds the cache only from
+        the payloads that actually changed.
+        """
         ensure_app_dirs()
-        if not force_refresh:
-            cached_data = self._load_from_cache()
-            if cached_data is not None:
-                return cached_data
+        cached_data = self._load_from_cache()
+        if cached_data is not None and not force_refresh:
+            if self._write_encoding() != self._disk_encoding:
+                return self._reencode(cached_data)
+            return cached_data
+        return self._download_data(current=cached_data)
+
+    def content_hash(self) -> str | None:
+        """Hash of the cached data, or ``None`` when there is no usable cache."""
+        if self._reader is not None:
+            return self._reader.content_hash or None
+        try:
+            with CacheReader(self.cache_path) as reader:
+                return reader.content_hash or None
+        except (OSError, ValueError):
+            return None
+
+    def prefetch(self) -> None:
+        """Warm the OS page cache for the mapped cache file, if one is open."""
+        reader = self._reader
+        if reader is not None:
+            reader.prefetch()
+
+    def installed_translations(self) -> list[int]:
+        """The default translation followed by every downloaded extra one."""
+        installed = [TRANSLATION_ID]
+        for path in sorted(self.translations_dir.glob("translation-*.bin")):
+            with suppress(ValueError):
+                translation_id = int(path.stem.removeprefix("translation-"))
+                if translation_id not in installed:
+                    installed.append(translation_id)
+        return installed
+
+    def translation_path(self, translation_id: int) -> Path:
+        return self.translations_dir / f"translation-{translation_id}.bin"
+
+    def download_translation(self, translation_id: int, quran_data: QuranData) -> None:
+        """Fetch one extra translation into its own single-column cache file."""
+        if translation_id == TRANSLATION_ID:
+            return
+        store = quran_data.store
+        if store is None:
+            raise ValueError("Translations need store-backed Quran data.")
+
+        print(f"Fetching translation {translation_id}...", file=sys.stderr)
+        path = QURAN_TRANSLATION_PATH_TEMPLATE.format(translation_id=translation_id)
+        texts = self._fetch_json(self._url(path), "translations", _translation_record).records
+        assert texts is not None
+        if len(texts) != len(store):
+            raise RuntimeError(
+                f"Translation {translation_id} has {len(texts)} verses, expected {len(store)}."
+            )
+
+        reader = self._translation_readers.pop(translation_id, None)
+        if reader is not None:
+            reader.close()
+        self.translations_dir.mkdir(parents=True, exist_ok=True)
+        write_cache(
+            self.translation_path(translation_id),
+            store.surahs,
+            store.ayah_numbers,
+            [(text,) for text in texts],
+            meta={"columns": ["translation"], "translation_id": translation_id},
+            encoding=self._write_encoding(),
+        )
+
+    def bind_translations(self, store: AyahStore) -> AyahStore:
+        """Let ``store`` open installed extra translations on first use."""
+        store.translation_loader = self._open_translation
+        return store
 
-        downloaded_data = self._download_data()
-        self._save_to_cache(downloaded_data)
-        return downloaded_data
+    def _open_translation(self, translation_id: int) -> TextSource:
+        reader = self._translation_readers.get(translation_id)
+        if reader is None:
+            path = self.translation_path(translation_id)
+            if not path.exists():
+                raise KeyError(f"Translation {translation_id} is not installed.")
+            reader = CacheReader(path)
+            if reader.column_count != 1:
+                reader.close()
+                raise ValueError(f"{path} is not a translation file.")
+            self._translation_readers[translation_id] = reader
+        return reader.column(0)
 
     def _load_from_cache(self) -> QuranData | None:
-        if not self.cache_path.exists():
+        if self.cache_path.exists():
+            try:
+                self._close_reader()
+                self._reader = CacheReader(self.cache_path)
+                self._disk_encoding = self._reader.encoding
+                return self._from_reader(self._reader)
+            except (OSError, ValueError):
+                pass
+        return self._migrate_legacy_cache()
+
+    def _migrate_legacy_cache(self) -> QuranData | None:
+        """Convert a v3 JSON cache into the binary format, then drop the JSON."""
+        if not self.legacy_cache_path.exists():
             return None
 
         try:
-            raw = json.loads(self.cache_path.read_text(encoding="utf-8"))
-            return self._deserialize(raw)
+            raw = json.loads(self.legacy_cache_path.read_text(encoding="utf-8"))
+            quran_data = self._deserialize(raw)
         except (OSError, json.JSONDecodeError, KeyError, ValueError, TypeError):
             return None
 
+        try:
+            self._save_to_cache(quran_data)
+        except OSError:
+            return quran_data
+        with suppress(OSError):
+            self.legacy_cache_path.unlink()
+        return quran_data
+
     def _save_to_cache(self, quran_data: QuranData) -> None:
-        serialized = self._serialize(quran_data)
-        tmp_path = self.cache_path.with_suffix(".tmp")
-        tmp_path.write_text(
-            json.dumps(serialized, ensure_ascii=False, separators=(",", ":")),
-            encoding="utf-8",
+        store = quran_data.store
+        if store is not None:
+            surahs = store.surahs
+            ayah_numbers: Sequence[int] = store.ayah_numbers
+            rows = [
+                (store.text(index, AyahStore.ARABIC), store.text(index, AyahStore.ENGLISH))
+                for index in range(len(store))
+            ]
+        else:
+            surahs, ayah_numbers, rows = _table_from_surahs(quran_data)
+
+        write_cache(
+            self.cache_path,
+            surahs,
+            ayah_numbers,
+            rows,
+            meta={"columns": ["arabic", "english"], "translation_id": TRANSLATION_ID},
+            encoding=self._write_encoding(),
         )
-        tmp_path.replace(self.cache_path)
+        self._disk_encoding = self._write_encoding()
 
-    def _download_data(self) -> QuranData:
-        print("Fetching chapters...", file=sys.stderr)
-        chapters = self._fetch_json(QURAN_CHAPTERS_URL)["chapters"]
+    def _write_encoding(self) -> int:
+        if self.cache_encoding is None:
+            return self._disk_encoding
+        return ENCODINGS[self.cache_encoding]
 
-        print("Fetching Arabic text...", file=sys.stderr)
-        all_verses = self._fetch_json(QURAN_VERSES_URL)["verses"]
+    def _reencode(self, quran_data: QuranData) -> QuranData:
+        """Rewrite the cache in ``cache_encoding`` and reopen it."""
+        store = quran_data.store
+        assert store is not None
+        rows = [
+            (store.text(index, AyahStore.ARABIC), store.text(index, AyahStore.ENGLISH))
+            for index in range(len(store))
+        ]
+        store = self.bind_translations(AyahStore.from_rows(store.surahs, store.ayah_numbers, rows))
+        in_memory = QuranData.from_store(store, memory_budget=self.memory_budget)
+        self._close_reader()
+        try:
+            self._save_to_cache(in_memory)
+        except OSError:
+            return in_memory
+        return self._load_from_cache() or in_memory
 
-        print("Fetching translations...", file=sys.stderr)
-        all_translations = self._fetch_json(QURAN_TRANSLATIONS_URL)["translations"]
+    def _from_reader(self, reader: CacheReader) -> QuranData:
+        """Lazy data backed by the mapped cache; only the surah table is read now."""
+        store = AyahStore(
+            reader.surahs,
+            reader.ayah_numbers,
+            [reader.column(AyahStore.ARABIC), reader.column(AyahStore.ENGLISH)],
+            translation_loader=self._open_translation,
+        )
+        return QuranData.from_store(store, memory_budget=self.memory_budget)
 
-        chapter_map = {int(ch["id"]): ch for ch in chapters}
-        verses_by_surah: dict[int, list[tuple[int, str]]] = {}
-        for verse in all_verses:
-            key = verse["verse_key"]
-            surah_num, ayah_num = map(int, key.split(":"))
-            if surah_num not in verses_by_surah:
-                verses_by_surah[surah_num] = []
-            verses_by_surah[surah_num].append((ayah_num, verse.get("text_uthmani", "")))
+    def _close_reader(self) -> None:
+        # A mapped cache file cannot be replaced on Windows, so release it first.
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
 
-        translations_list: list[str] = [t.get("text", "") for t in all_translations]
+    def _load_validators(self) -> dict[str, Validator]:
+        try:
+            raw = json.loads(self.validators_path.read_text(encoding="utf-8"))
+            return {key: Validator(**value) for key, value in raw.items()}
+        except (OSError, json.JSONDecodeError, TypeError, AttributeError):
+            return {}
 
-        surahs: list[SurahData] = []
-        ayahs_flat: list[Ayah] = []
-        translation_idx = 0
+    def _save_validators(self, results: dict[str, FetchResult[Any]]) -> None:
+        payload = {key: asdict(result.validator) for key, result in results.items()}
+        tmp_path = self.validators_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        tmp_path.replace(self.validators_path)
 
-        for surah_number in sorted(verses_by_surah.keys()):
-            chapter = chapter_map[surah_number]
-            name_arabic = str(chapter["name_arabic"])
-            name_english = str(chapter["name_simple"])
-            bismillah_pre = bool(chapter.get("bismillah_pre", False))
+    def _download_data(self, current: QuranData | None = None) -> QuranData:
+        """Fetch every payload and save the cache.
 
-            surah_ayahs: list[Ayah] = []
-            verses = sorted(verses_by_surah[surah_number], key=lambda x: x[0])
+        With ``current`` data, requests are conditional and unchanged payloads
+        are taken from ``current`` instead of being rebuilt.
+        """
+        store = current.store if current is not None else None
+        validators = self._load_validators() if store is not None else {}
+        endpoints: dict[str, tuple[str, Callable[[Any], Any]]] = {
+            "chapters": (QURAN_CHAPTERS_PATH, _chapter_record),
+            "verses": (QURAN_VERSES_PATH, _verse_record),
+            "translations": (QURAN_TRANSLATIONS_PATH, _translation_record),
+        }
 
-            for ayah_number, text_arabic in verses:
-                text_english = translations_list[translation_idx] if translation_idx < len(translations_list) else ""
-                translation_idx += 1
+        print("Fetching chapters, Arabic text and translation...", file=sys.stderr)
+        with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+            futures = {
+                key: executor.submit(self._fetch_json, self._url(path), key, transform, validator=validators.get(key))
+                for key, (path, transform) in endpoints.items()
+            }
+            try:
+                results = {key: future.result() for key, future in futures.items()}
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
 
-                ayah = Ayah(
-                    surah_number=surah_number,
-                    surah_name_arabic=name_arabic,
-                    surah_name_english=name_english,
-                    ayah_number=ayah_number,
-                    text_arabic=str(text_arabic).strip(),
-                    text_english=str(text_english).strip(),
-                )
-                surah_ayahs.append(ayah)
-                ayahs_flat.append(ayah)
+        if current is not None and store is not None and all(result.records is None for result in results.values()):
+            self._save_validators(results)
+            print("Quran data is up to date.", file=sys.stderr)
+            return current
+
+        chapters = results["chapters"].records
+        verses = results["verses"].records
+        translations = results["translations"].records
+        if store is not None:
+            chapters = chapters if chapters is not None else _chapters_from(store)
+            verses = verses if verses is not None else _verses_from(store)
+            translations = translations if translations is not None else _translations_from(store)
+        assert chapters is not None and verses is not None and translations is not None
+
+        quran_data = self._build(chapters, verses, translations)
+        self._close_reader()
+        self._save_to_cache(quran_data)
+        self._save_validators(results)
+        print("Done!", file=sys.stderr)
+        return quran_data
+
+    def _build(
+        self,
+        chapters: Sequence[ChapterRecord],
+        verses: Sequence[VerseRecord],
+        translations: Sequence[str],
+    ) -> QuranData:
+        chapter_map = {chapter[0]: chapter for chapter in chapters}
+        verses_by_surah: dict[int, list[tuple[int, str]]] = {}
+        for surah_num, ayah_num, text_arabic in verses:
+            if surah_num not in verses_by_surah:
+                verses_by_surah[surah_num] = []
+            verses_by_surah[surah_num].append((ayah_num, text_arabic))
+
+        surahs: list[SurahInfo] = []
+        ayah_numbers: list[int] = []
+        rows: list[tuple[str, str]] = []
+        translation_idx = 0
 
+        for surah_number in sorted(verses_by_surah.keys()):
+            _, name_arabic, name_english, bismillah_pre = chapter_map[surah_number]
+            surah_verses = sorted(verses_by_surah[surah_number], key=lambda x: x[0])
             surahs.append(
-                SurahData(
+                SurahInfo(
                     number=surah_number,
                     name_arabic=name_arabic,
                     name_english=name_english,
-                    ayahs=surah_ayahs,
                     bismillah_pre=bismillah_pre,
+                    first_ayah=len(rows),
+                    ayah_count=len(surah_verses),
                 )
             )
 
-        print("Done!", file=sys.stderr)
-        return QuranData(surahs=surahs, ayahs_flat=ayahs_flat)
+            for ayah_number, text_arabic in surah_verses:
+                text_english = translations[translation_idx] if translation_idx < len(translations) else ""
+                translation_idx += 1
+                ayah_numbers.append(ayah_number)
+                rows.append((text_arabic, text_english))
+
+        store = self.bind_translations(AyahStore.from_rows(surahs, ayah_numbers, rows))
+        return QuranData.from_store(store, memory_budget=self.memory_budget)
+
+    def _url(self, path: str) -> str:
+        return f"{self.api_base}{path}"
 
-    def _fetch_json(self, url: str, retries: int = 3) -> dict[str, Any]:
-        request = Request(url, headers={"User-Agent": "quran-tui/1.0"})
+    def _fetch_json(
+        self,
+        url: str,
+        key: str,
+        transform: Callable[[Any], T],
+        retries: int = HTTP_RETRIES,
+        *,
+        validator: Validator | None = None,
+    ) -> FetchResult[T]:
+        """Stream the array under ``key`` from ``url``, keeping only ``transform(item)``.
+
+        ``validator`` turns the request into a conditional one; a 304 or a body
+        with the same content hash comes back with ``records=None``.
+        """
+        headers = {"User-Agent": "quran-tui/1.0"}
+        if validator is not None and validator.url == url:
+            if validator.etag:
+                headers["If-None-Match"] = validator.etag
+            if validator.last_modified:
+                headers["If-Modified-Since"] = validator.last_modified
+        else:
+            validator = None
+        request = Request(url, headers=headers)
         last_error = None
 
         for attempt in range(retries):
             try:
                 with urlopen(request, timeout=HTTP_TIMEOUT_SECONDS) as response:
-                    payload = response.read().decode("utf-8")
-                return json.loads(payload)
-            except (URLError, TimeoutError, OSError) as exc:
+                    body = _HashingReader(response)
+                    records = [transform(item) for item in iter_json_array(body, key)]
+                    body.drain()
+                    fresh = Validator(
+                        url=url,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                        sha256=body.hexdigest(),
+                    )
+                if validator is not None and fresh.sha256 == validator.sha256:
+                    return FetchResult(records=None, validator=fresh)
+                return FetchResult(records=records, validator=fresh)
+            except HTTPError as exc:
+                if exc.code == 304 and validator is not None:
+                    return FetchResult(records=None, validator=validator)
+                last_error = exc
+            except (URLError, TimeoutError, OSError, ValueError) as exc:
                 last_error = exc
-                if attempt < retries - 1:
-                    import time
-                    time.sleep(1 * (attempt + 1))  # Backoff
-                    print(f"Retry {attempt + 2}/{retries}...", file=sys.stderr)
+            if attempt < retries - 1:
+                time.sleep(_retry_delay(attempt))
+                print(f"Retry {attempt + 2}/{retries}...", file=sys.stderr)
 
         raise RuntimeError(
             f"Failed to fetch data after {retries} attempts. "
             f"Check your internet connection.\nURL: {url}"
         ) from last_error
 
-    def _serialize(self, quran_data: QuranData) -> dict[str, Any]:
-        serialized_surahs: list[dict[str, Any]] = []
-        for surah in quran_data.surahs:
-            serialized_surahs.append(
-                {
-                    "number": surah.number,
-                    "name_arabic": surah.name_arabic,
-                    "name_english": surah.name_english,
-                    "bismillah_pre": surah.bismillah_pre,
-                    "ayahs": [
-                        {
-                            "ayah_number": ayah.ayah_number,
-                            "text_arabic": ayah.text_arabic,
-                            "text_english": ayah.text_english,
-                        }
-                        for ayah in surah.ayahs
-                    ],
-                }
-            )
-        return {"version": 3, "surahs": serialized_surahs}
-
     def _deserialize(self, raw: dict[str, Any]) -> QuranData:
         version = raw.get("version", 1)
         if version < 3:
             raise ValueError("Cache outdated, needs refresh.")
 
-        surahs: list[SurahData] = []
-        ayahs_flat: list[Ayah] = []
+        surahs: list[SurahInfo] = []
+        ayah_numbers: list[int] = []
+        rows: list[tuple[str, str]] = []
         for surah_raw in raw["surahs"]:
             surah_number = int(surah_raw["number"])
-            name_arabic = str(surah_raw["name_arabic"])
-            name_english = str(surah_raw["name_english"])
-            bismillah_pre = bool(surah_raw.get("bismillah_pre", surah_number != 1 and surah_number != 9))
-            surah_ayahs: list[Ayah] = []
-            for ayah_raw in surah_raw["ayahs"]:
-                ayah = Ayah(
-                    surah_number=surah_number,
-                    surah_name_arabic=name_arabic,
-                    surah_name_english=name_english,
-                    ayah_number=int(ayah_raw["ayah_number"]),
-                    text_arabic=str(ayah_raw["text_arabic"]),
-                    text_english=str(ayah_raw["text_english"]),
-                )
-                surah_ayahs.append(ayah)
-                ayahs_flat.append(ayah)
-
+            ayahs_raw = surah_raw["ayahs"]
             surahs.append(
-                SurahData(
+                SurahInfo(
                     number=surah_number,
-                    name_arabic=name_arabic,
-                    name_english=name_english,
-                    ayahs=surah_ayahs,
-                    bismillah_pre=bismillah_pre,
+                    name_arabic=str(surah_raw["name_arabic"]),
+                    name_english=str(surah_raw["name_english"]),
+                    bismillah_pre=bool(surah_raw.get("bismillah_pre", surah_number != 1 and surah_number != 9)),
+                    first_ayah=len(rows),
+                    ayah_count=len(ayahs_raw),
                 )
             )
+            for ayah_raw in ayahs_raw:
+                ayah_numbers.append(int(ayah_raw["ayah_number"]))
+                rows.append((str(ayah_raw["text_arabic"]), str(ayah_raw["text_english"])))
+
+        store = self.bind_translations(AyahStore.from_rows(surahs, ayah_numbers, rows))
+        return QuranData.from_store(store, memory_budget=self.memory_budget)
+
+
+class _HashingReader:
+    """Binary stream wrapper that hashes everything read through it."""
 
-        return QuranData(surahs=surahs, ayahs_flat=ayahs_flat)
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        self._digest.update(chunk)
+        return chunk
+
+    def drain(self) -> None:
+        while self.read(CHUNK_SIZE):
+            pass
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def _chapters_from(store: AyahStore) -> list[ChapterRecord]:
+    return [(info.number, info.name_arabic, info.name_english, info.bismillah_pre) for info in store.surahs]
+
+
+def _verses_from(store: AyahStore) -> list[VerseRecord]:
+    return [
+        (store.surah_numbers[index], store.ayah_numbers[index], store.text(index, AyahStore.ARABIC))
+        for index in range(len(store))
+    ]
+
+
+def _translations_from(store: AyahStore) -> list[str]:
+    return [store.text(index, AyahStore.ENGLISH) for index in range(len(store))]
+
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter: half the step is fixed, half random."""
+    ceiling = min(HTTP_RETRY_MAX_SECONDS, HTTP_RETRY_BASE_SECONDS * 2**attempt)
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def _chapter_record(chapter: dict[str, Any]) -> ChapterRecord:
+    return (
+        int(chapter["id"]),
+        str(chapter["name_arabic"]),
+        str(chapter["name_simple"]),
+        bool(chapter.get("bismillah_pre", False)),
+    )
+
+
+def _verse_record(verse: dict[str, Any]) -> VerseRecord:
+    surah_num, ayah_num = map(int, verse["verse_key"].split(":"))
+    return surah_num, ayah_num, str(verse.get("text_uthmani", "")).strip()
+
+
+def _translation_record(translation: dict[str, Any]) -> str:
+    return str(translation.get("text", "")).strip()
+
+
+def _table_from_surahs(quran_data: QuranData) -> tuple[list[SurahInfo], list[int], list[tuple[str, str]]]:
+    surahs: list[SurahInfo] = []
+    ayah_numbers: list[int] = []
+    rows: list[tuple[str, str]] = []
+    for surah in quran_data.surahs:
+        ayahs = surah.ayahs
+        surahs.append(
+            SurahInfo(
+                number=surah.number,
+                name_arabic=surah.name_arabic,
+                name_english=surah.name_english,
+                bismillah_pre=surah.bismillah_pre,
+                first_ayah=len(rows),
+                ayah_count=len(ayahs),
+            )
+        )
+        for ayah in ayahs:
+            ayah_numbers.append(ayah.ayah_number)
+            rows.append((ayah.text_arabic, ayah.text_english))
+    return surahs, ayah_numbers, rows
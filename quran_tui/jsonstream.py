@@ -0,0 +1,89 @@
+"""Incremental parsing of large JSON API payloads.
+
+The quran.com payloads are a single object wrapping one big array
+(``{"verses": [...], "meta": {...}}``). ``iter_json_array`` yields the
+array's items one at a time while reading the byte stream in chunks, so only
+about one chunk plus one record is held in memory.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Iterator
+
+CHUNK_SIZE = 64 * 1024
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+class _ChunkBuffer:
+    def __init__(self, stream: BinaryIO, chunk_size: int) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.eof = False
+
+    def fill(self) -> None:
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self.eof = True
+            self.text += self._decoder.decode(b"", final=True)
+            return
+        self.text += self._decoder.decode(chunk)
+
+
+def iter_json_array(stream: BinaryIO, key: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the items of the array stored under ``key`` in a JSON object stream.
+
+    The key is located by its first ``"key": [`` occurrence, which holds for
+    payloads whose array comes before any nested text that could repeat it.
+    """
+    buffer = _ChunkBuffer(stream, chunk_size)
+    marker = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    keep = len(key) + 64
+
+    while True:
+        match = marker.search(buffer.text)
+        if match:
+            buffer.text = buffer.text[match.end() :]
+            break
+        if buffer.eof:
+            raise ValueError(f"Key {key!r} not found in JSON payload.")
+        buffer.text = buffer.text[-keep:]
+        buffer.fill()
+
+    decoder = json.JSONDecoder()
+    position = 0
+    while True:
+        position = _SEPARATORS.match(buffer.text, position).end()
+        if position >= len(buffer.text):
+            if buffer.eof:
+                raise ValueError(f"Unterminated array {key!r} in JSON payload.")
+            buffer.text = buffer.text[position:]
+            position = 0
+            buffer.fill()
+            continue
+
+        if buffer.text[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer.text, position)
+        except json.JSONDecodeError:
+            if buffer.eof:
+                raise
+            item, end = None, -1
+        # A scalar ending exactly at the buffer edge may continue in the next chunk.
+        if end < 0 or (end == len(buffer.text) and not buffer.eof):
+            buffer.text = buffer.text[position:]
+            position = 0
+            buffer.fill()
+            continue
+
+        yield item
+        position = end
+        if position >= chunk_size:
+            buffer.text = buffer.text[position:]
+            position = 0
@@ -1,28 +1,499 @@
 from __future__ import annotations
 
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
 from dataclasses import dataclass
+from typing import Callable, Iterator, Protocol, Sequence, overload
 
+from .config import TRANSLATION_ID
+from .references import ReferenceIndex, VerseRange
 
-@dataclass(slots=True, frozen=True)
-class Ayah:
-    surah_number: int
-    surah_name_arabic: str
-    surah_name_english: str
-    ayah_number: int
-    text_arabic: str
-    text_english: str
 
+@dataclass(slots=True, frozen=True)
+class SurahInfo:
+    """Surah table entry: metadata plus the surah's slice of the flat ayah list."""
 
-@dataclass(slots=True)
-class SurahData:
     number: int
     name_arabic: str
     name_english: str
-    ayahs: list[Ayah]
-    bismillah_pre: bool = False
+    bismillah_pre: bool
+    first_ayah: int
+    ayah_count: int
+
+
+class TextSource(Protocol):
+    """One text column (Arabic, a translation, ...) indexed by flat ayah index."""
+
+    def text(self, index: int) -> str: ...
+
+    def __len__(self) -> int: ...
+
+
+class TextColumn:
+    """In-memory text column: one UTF-8 buffer plus uint32 end offsets."""
+
+    __slots__ = ("_buffer", "_ends")
+
+    def __init__(self, texts: Sequence[str]) -> None:
+        buffer = bytearray()
+        ends = array("I")
+        for text in texts:
+            buffer.extend(text.encode("utf-8"))
+            ends.append(len(buffer))
+        self._buffer = bytes(buffer)
+        self._ends = ends
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes, ends: array) -> TextColumn:
+        column = object.__new__(cls)
+        column._buffer = buffer
+        column._ends = ends
+        return column
+
+    @property
+    def buffer(self) -> bytes:
+        return self._buffer
+
+    @property
+    def ends(self) -> array:
+        return self._ends
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def text(self, index: int) -> str:
+        start = self._ends[index - 1] if index else 0
+        return self._buffer[start : self._ends[index]].decode("utf-8")
+
+
+# Opens the text column of one extra translation, given its resource id.
+TranslationLoader = Callable[[int], TextSource]
+
+
+class AyahStore:
+    """Columnar storage for every ayah; ``Ayah`` objects are views into it.
+
+    Surah names live once in the shared ``surahs`` table, numbers in compact
+    ``array('H')`` columns and verse text in shared UTF-8 buffers.
+
+    ``columns[ENGLISH]`` holds the default translation. Other translations are
+    opened through ``translation_loader`` the first time they are used, so
+    installed but unused translations cost nothing.
+    """
+
+    ARABIC = 0
+    ENGLISH = 1
+
+    __slots__ = (
+        "surahs",
+        "surah_numbers",
+        "ayah_numbers",
+        "columns",
+        "default_translation",
+        "active_translation",
+        "translation_loader",
+        "_translations",
+        "_active",
+        "_surah_slots",
+    )
+
+    def __init__(
+        self,
+        surahs: Sequence[SurahInfo],
+        ayah_numbers: Sequence[int],
+        columns: Sequence[TextSource],
+        *,
+        default_translation: int = TRANSLATION_ID,
+        translation_loader: TranslationLoader | None = None,
+    ) -> None:
+        self.surahs = list(surahs)
+        self.ayah_numbers = ayah_numbers if isinstance(ayah_numbers, array) else array("H", ayah_numbers)
+        self.columns = list(columns)
+        self.default_translation = default_translation
+        self.active_translation = default_translation
+        self.translation_loader = translation_loader
+        self._translations: dict[int, TextSource] = {}
+        self._active = self.columns[self.ENGLISH] if len(self.columns) > self.ENGLISH else None
+        self.surah_numbers = array("H")
+        self._surah_slots = array("H")
+        for slot, surah in enumerate(self.surahs):
+            self.surah_numbers.extend([surah.number] * surah.ayah_count)
+            self._surah_slots.extend([slot] * surah.ayah_count)
+
+    @classmethod
+    def from_rows(
+        cls,
+        surahs: Sequence[SurahInfo],
+        ayah_numbers: Sequence[int],
+        rows: Sequence[tuple[str, str]],
+    ) -> AyahStore:
+        """Build in-memory columns from ``(text_arabic, text_english)`` rows."""
+        return cls(
+            surahs,
+            ayah_numbers,
+            [TextColumn([row[0] for row in rows]), TextColumn([row[1] for row in rows])],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ayah_numbers)
+
+    def surah_info(self, index: int) -> SurahInfo:
+        return self.surahs[self._surah_slots[index]]
+
+    def text(self, index: int, column: int) -> str:
+        return self.columns[column].text(index)
+
+    def translation_column(self, translation_id: int) -> TextSource:
+        """Column for ``translation_id``, opening it on first use."""
+        if translation_id == self.default_translation:
+            return self.columns[self.ENGLISH]
+        column = self._translations.get(translation_id)
+        if column is None:
+            if self.translation_loader is None:
+                raise KeyError(f"Translation {translation_id} is not installed.")
+            column = self.translation_loader(translation_id)
+            if len(column) != len(self):
+                raise ValueError(f"Translation {translation_id} does not match the Quran text.")
+            self._translations[translation_id] = column
+        return column
+
+    def translation_text(self, index: int, translation_id: int) -> str:
+        return self.translation_column(translation_id).text(index)
+
+    def select_translation(self, translation_id: int) -> None:
+        """Make ``translation_id`` the text behind ``Ayah.text_english``."""
+        self._active = self.translation_column(translation_id)
+        self.active_translation = translation_id
+
+    @property
+    def loaded_translations(self) -> list[int]:
+        return [self.default_translation, *self._translations]
+
+    def active_text(self, index: int) -> str:
+        return self._active.text(index)  # type: ignore[union-attr]
+
+    def ayah(self, index: int) -> Ayah:
+        return Ayah._view(self, index)
+
+    def surah_ayahs(self, surah_index: int) -> list[Ayah]:
+        info = self.surahs[surah_index]
+        view = Ayah._view
+        return [view(self, index) for index in range(info.first_ayah, info.first_ayah + info.ayah_count)]
+
+
+class Ayah:
+    """Lightweight view of one ayah in an ``AyahStore``.
+
+    Constructing an ``Ayah`` from field values directly builds a one-row store,
+    which keeps ad-hoc and test usage working.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(
+        self,
+        surah_number: int,
+        surah_name_arabic: str,
+        surah_name_english: str,
+        ayah_number: int,
+        text_arabic: str,
+        text_english: str,
+    ) -> None:
+        info = SurahInfo(
+            number=surah_number,
+            name_arabic=surah_name_arabic,
+            name_english=surah_name_english,
+            bismillah_pre=False,
+            first_ayah=0,
+            ayah_count=1,
+        )
+        self._store = AyahStore.from_rows([info], [ayah_number], [(text_arabic, text_english)])
+        self._index = 0
+
+    @classmethod
+    def _view(cls, store: AyahStore, index: int) -> Ayah:
+        ayah = object.__new__(cls)
+        ayah._store = store
+        ayah._index = index
+        return ayah
+
+    @property
+    def surah_number(self) -> int:
+        return self._store.surah_numbers[self._index]
+
+    @property
+    def surah_name_arabic(self) -> str:
+        return self._store.surah_info(self._index).name_arabic
+
+    @property
+    def surah_name_english(self) -> str:
+        return self._store.surah_info(self._index).name_english
+
+    @property
+    def ayah_number(self) -> int:
+        return self._store.ayah_numbers[self._index]
+
+    @property
+    def text_arabic(self) -> str:
+        return self._store.text(self._index, AyahStore.ARABIC)
+
+    @property
+    def text_english(self) -> str:
+        """Text of the store's active translation."""
+        return self._store.active_text(self._index)
+
+    def translation(self, translation_id: int) -> str:
+        return self._store.translation_text(self._index, translation_id)
+
+    def _fields(self) -> tuple[int, str, str, int, str, str]:
+        return (
+            self.surah_number,
+            self.surah_name_arabic,
+            self.surah_name_english,
+            self.ayah_number,
+            self.text_arabic,
+            self.text_english,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Ayah):
+            return NotImplemented
+        if self._store is other._store:
+            return self._index == other._index
+        return self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash((self.surah_number, self.ayah_number, self.text_arabic))
+
+    def __repr__(self) -> str:
+        return f"Ayah(surah_number={self.surah_number}, ayah_number={self.ayah_number}, text_english={self.text_english!r})"
+
+
+# Builds the ayahs of one surah, given its index in ``QuranData.surahs``.
+AyahLoader = Callable[[int], list[Ayah]]
+
+
+class SurahData:
+    """One surah. ``ayahs`` is built on first access when the surah is lazy."""
+
+    __slots__ = ("number", "name_arabic", "name_english", "bismillah_pre", "_ayahs", "_owner", "_index")
+
+    def __init__(
+        self,
+        number: int,
+        name_arabic: str,
+        name_english: str,
+        ayahs: list[Ayah] | None = None,
+        bismillah_pre: bool = False,
+    ) -> None:
+        self.number = number
+        self.name_arabic = name_arabic
+        self.name_english = name_english
+        self.bismillah_pre = bismillah_pre
+        self._ayahs = ayahs if ayahs is not None else []
+        self._owner: QuranData | None = None
+        self._index = number - 1
+
+    @property
+    def ayahs(self) -> list[Ayah]:
+        ayahs = self._ayahs
+        owner = self._owner
+        if owner is None:
+            return ayahs  # type: ignore[return-value]
+        if ayahs is None:
+            return owner._materialize(self._index)
+        owner._touch(self._index)
+        return ayahs
+
+    @ayahs.setter
+    def ayahs(self, value: list[Ayah]) -> None:
+        self._ayahs = value
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._ayahs is not None
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "lazy"
+        return f"SurahData(number={self.number}, name_english={self.name_english!r}, {state})"
+
+
+class AyahSequence(Sequence[Ayah]):
+    """Flat, read-only view over every ayah that builds surahs on demand.
+
+    Data backed by an ``AyahStore`` hands out views into it instead, so a
+    pass over every ayah leaves lazy surahs unbuilt.
+    """
+
+    def __init__(self, quran_data: QuranData) -> None:
+        self._quran_data = quran_data
+
+    def __len__(self) -> int:
+        return self._quran_data.ayah_count
+
+    @overload
+    def __getitem__(self, index: int) -> Ayah: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Ayah]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ayah index out of range")
+        store = self._quran_data.store
+        if store is not None:
+            return Ayah._view(store, index)
+        starts = self._quran_data._surah_starts
+        surah_index = bisect_right(starts, index) - 1
+        return self._quran_data.surahs[surah_index].ayahs[index - starts[surah_index]]
+
+    def __iter__(self) -> Iterator[Ayah]:
+        store = self._quran_data.store
+        if store is not None:
+            view = Ayah._view
+            for index in range(len(self)):
+                yield view(store, index)
+            return
+        for surah in self._quran_data.surahs:
+            yield from surah.ayahs
 
 
-@dataclass(slots=True)
 class QuranData:
-    surahs: list[SurahData]
-    ayahs_flat: list[Ayah]
+    """All surahs, either fully built or materialized lazily per surah.
+
+    Lazy instances keep built surahs in an LRU and drop the least recently
+    used ones once their estimated size exceeds ``memory_budget`` bytes.
+    """
+
+    def __init__(
+        self,
+        surahs: list[SurahData],
+        ayahs_flat: Sequence[Ayah] | None = None,
+    ) -> None:
+        self.surahs = surahs
+        self._surah_starts: list[int] = []
+        total = 0
+        for surah in surahs:
+            self._surah_starts.append(total)
+            total += len(surah._ayahs or ())
+        self.ayah_count = total
+        self.ayahs_flat: Sequence[Ayah] = ayahs_flat if ayahs_flat is not None else AyahSequence(self)
+        self.memory_budget: int | None = None
+        self.store: AyahStore | None = None
+        self._loader: AyahLoader | None = None
+        self._loaded: OrderedDict[int, int] = OrderedDict()
+        self._loaded_bytes = 0
+        self._references: ReferenceIndex | None = None
+        # Surahs may be built from a background loader and the UI at once.
+        self._lock = threading.Lock()
+
+    @classmethod
+    def lazy(
+        cls,
+        surah_table: Sequence[SurahInfo],
+        loader: AyahLoader,
+        *,
+        memory_budget: int | None = None,
+    ) -> QuranData:
+        """Build from surah metadata only; ``loader`` fills in ayahs on demand."""
+        quran_data = cls([])
+        quran_data._loader = loader
+        quran_data.memory_budget = memory_budget
+        for index, info in enumerate(surah_table):
+            surah = SurahData(
+                number=info.number,
+                name_arabic=info.name_arabic,
+                name_english=info.name_english,
+                bismillah_pre=info.bismillah_pre,
+            )
+            surah._ayahs = None
+            surah._owner = quran_data
+            surah._index = index
+            quran_data.surahs.append(surah)
+            quran_data._surah_starts.append(info.first_ayah)
+        quran_data.ayah_count = sum(info.ayah_count for info in surah_table)
+        return quran_data
+
+    @classmethod
+    def from_store(cls, store: AyahStore, *, memory_budget: int | None = None) -> QuranData:
+        """Lazy data whose surahs are lists of views into ``store``."""
+        quran_data = cls.lazy(store.surahs, store.surah_ayahs, memory_budget=memory_budget)
+        quran_data.store = store
+        return quran_data
+
+    @property
+    def references(self) -> ReferenceIndex:
+        """Reference lookups over ``ayahs_flat``, built on first use."""
+        references = self._references
+        if references is None:
+            references = self._references = ReferenceIndex(
+                [surah.number for surah in self.surahs],
+                self._surah_starts,
+                self.ayah_count,
+                self._surah_ayah_numbers,
+            )
+        return references
+
+    def resolve(self, reference: str) -> VerseRange:
+        """The ayahs named by ``reference`` (``2:255``, ``2:255-260``, ``juz 30`` ...)."""
+        return self.references.resolve(reference)
+
+    def index_of(self, surah_number: int, ayah_number: int) -> int:
+        """Position of ``surah_number:ayah_number`` in ``ayahs_flat``."""
+        return self.references.index_of(surah_number, ayah_number)
+
+    def _surah_ayah_numbers(self, surah_index: int) -> Sequence[int]:
+        store = self.store
+        if store is not None:
+            info = store.surahs[surah_index]
+            return store.ayah_numbers[info.first_ayah : info.first_ayah + info.ayah_count]
+        return [ayah.ayah_number for ayah in self.surahs[surah_index].ayahs]
+
+    @property
+    def loaded_bytes(self) -> int:
+        """Estimated memory held by currently built lazy surahs."""
+        return self._loaded_bytes
+
+    def _touch(self, surah_index: int) -> None:
+        with self._lock:
+            if surah_index in self._loaded:
+                self._loaded.move_to_end(surah_index)
+
+    def _materialize(self, surah_index: int) -> list[Ayah]:
+        assert self._loader is not None
+        with self._lock:
+            surah = self.surahs[surah_index]
+            if surah._ayahs is not None:
+                return surah._ayahs
+            ayahs = self._loader(surah_index)
+            surah._ayahs = ayahs
+            size = _estimate_size(ayahs)
+            self._loaded[surah_index] = size
+            self._loaded_bytes += size
+            self._evict(keep=surah_index)
+            return ayahs
+
+    def _evict(self, keep: int) -> None:
+        budget = self.memory_budget
+        if budget is None:
+            return
+        while self._loaded_bytes > budget and len(self._loaded) > 1:
+            surah_index, size = next(iter(self._loaded.items()))
+            if surah_index == keep:
+                self._loaded.move_to_end(surah_index)
+                continue
+            del self._loaded[surah_index]
+            self._loaded_bytes -= size
+            self.surahs[surah_index]._ayahs = None
+
+
+def _estimate_size(ayahs: list[Ayah]) -> int:
+    # Views hold no text of their own, so the list and the views are the cost.
+    return sys.getsizeof(ayahs) + sum(sys.getsizeof(ayah) for ayah in ayahs)
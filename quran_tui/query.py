@@ -0,0 +1,173 @@
+"""Search query syntax: phrases, boolean operators and proximity.
+
+    "lord of the worlds"     exact phrase
+    patience prayer          both words (AND is implied; ``AND`` also works)
+    patience OR prayer       either word
+    -mercy, NOT mercy        without the word (or phrase)
+    patience NEAR prayer     within ``NEAR_DISTANCE`` words; ``NEAR/2`` for 2
+    (a OR b) c               grouping
+
+Operators are only recognized in capitals, so ordinary queries containing
+"and", "or" or "not" stay plain fuzzy queries: ``parse`` returns ``None`` for
+anything without operators, quotes, parentheses or a leading ``-``. It never
+raises; unfinished input (an open quote, a trailing ``OR``) parses as far as
+it goes, because the prompt searches while the user is typing. Words are kept
+as typed; the engine normalizes them.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Union
+
+NEAR_DISTANCE = 5
+# Upper bound on NEAR/n, well below the column offset of word positions.
+MAX_NEAR_DISTANCE = 1000
+
+# A "-" right before a word or phrase negates it; a lone dash is dropped.
+_LEXEME = re.compile(r'(-)(?=[^\s()])|("[^"]*"?|[()]|[^\s()"]+)')
+_NEAR = re.compile(r"NEAR(?:/(\d+))?")
+
+
+@dataclass(slots=True, frozen=True)
+class Term:
+    """A bare word, or the words of a quoted phrase (``phrase=True``)."""
+
+    words: tuple[str, ...]
+    phrase: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class Near:
+    left: Term
+    right: Term
+    distance: int = NEAR_DISTANCE
+
+
+@dataclass(slots=True, frozen=True)
+class And:
+    parts: tuple[Node, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class Or:
+    parts: tuple[Node, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class Not:
+    part: Node
+
+
+Node = Union[Term, Near, And, Or, Not]
+
+
+def parse(query: str) -> Node | None:
+    """The query tree of ``query``, or ``None`` for a plain fuzzy query."""
+    lexemes = [negation or lexeme for negation, lexeme in _LEXEME.findall(query) if lexeme != "-"]
+    if not any(_is_syntax(lexeme) for lexeme in lexemes):
+        return None
+    return _Parser(lexemes).parse()
+
+
+def positive_words(node: Node | None) -> list[str]:
+    """Words the matches must contain, in query order; used for ranking."""
+    if isinstance(node, Term):
+        return list(node.words)
+    if isinstance(node, Near):
+        return [*node.left.words, *node.right.words]
+    if isinstance(node, (And, Or)):
+        return [word for part in node.parts for word in positive_words(part)]
+    return []
+
+
+def _is_syntax(lexeme: str) -> bool:
+    return lexeme in ("AND", "OR", "NOT", "(", ")", "-") or lexeme.startswith('"') or bool(_NEAR.fullmatch(lexeme))
+
+
+class _Parser:
+    """Recursive descent over the lexemes; OR binds loosest, NEAR tightest."""
+
+    def __init__(self, lexemes: list[str]) -> None:
+        self.lexemes = lexemes
+        self.position = 0
+
+    def parse(self) -> Node | None:
+        node = self._or()
+        # Stray closing parentheses: parse what follows them too.
+        while self._peek() is not None:
+            self.position += 1
+            rest = self._or()
+            node = _combine(And, [node, rest])
+        return node
+
+    def _peek(self) -> str | None:
+        return self.lexemes[self.position] if self.position < len(self.lexemes) else None
+
+    def _or(self) -> Node | None:
+        parts = [self._and()]
+        while self._peek() == "OR":
+            self.position += 1
+            parts.append(self._and())
+        return _combine(Or, parts)
+
+    def _and(self) -> Node | None:
+        parts: list[Node | None] = []
+        while True:
+            lexeme = self._peek()
+            if lexeme is None or lexeme in (")", "OR"):
+                break
+            if lexeme == "AND":
+                self.position += 1
+                continue
+            parts.append(self._unary())
+        return _combine(And, parts)
+
+    def _unary(self) -> Node | None:
+        lexeme = self._peek()
+        if lexeme in ("NOT", "-"):
+            self.position += 1
+            part = self._unary()
+            return None if part is None else Not(part)
+        return self._near()
+
+    def _near(self) -> Node | None:
+        node = self._primary()
+        while True:
+            lexeme = self._peek()
+            match = _NEAR.fullmatch(lexeme) if lexeme is not None else None
+            if match is None:
+                return node
+            self.position += 1
+            right = self._primary()
+            distance = min(int(match.group(1)), MAX_NEAR_DISTANCE) if match.group(1) else NEAR_DISTANCE
+            # NEAR relates words and phrases; around anything else it reads as AND.
+            if isinstance(node, Term) and isinstance(right, Term):
+                node = Near(node, right, distance)
+            else:
+                node = _combine(And, [node, right])
+
+    def _primary(self) -> Node | None:
+        lexeme = self._peek()
+        if lexeme is None or lexeme in (")", "OR", "AND", "NOT", "-") or _NEAR.fullmatch(lexeme):
+            if lexeme is not None and lexeme != ")" and lexeme != "OR":
+                # A dangling operator where a word belongs, as in "a AND NEAR b".
+                self.position += 1
+            return None
+        self.position += 1
+        if lexeme == "(":
+            node = self._or()
+            if self._peek() == ")":
+                self.position += 1
+            return node
+        if lexeme.startswith('"'):
+            words = tuple(lexeme.strip('"').split())
+            return Term(words, phrase=True) if words else None
+        return Term((lexeme,))
+
+
+def _combine(kind: type[And] | type[Or], parts: list[Node | None]) -> Node | None:
+    kept = tuple(part for part in parts if part is not None)
+    if not kept:
+        return None
+    return kept[0] if len(kept) == 1 else kind(kept)
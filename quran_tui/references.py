@@ -0,0 +1,170 @@
+"""Verse references: ``2``, ``2:255``, ``2:255-260``, ``2:280-3:5``, ``juz 30``, ``hizb 60``.
+
+``ReferenceIndex`` answers them from tables instead of scanning ayahs. Surah
+numbers map to their slot in one dict; each surah gets an ayah number to flat
+index ``array`` the first time it is looked up, so ayah numbers need not be
+contiguous; juz and hizb boundaries are the fixed starts below, resolved
+through those tables. Flat indices are positions in ``QuranData.ayahs_flat``
+(and the ``AyahStore``); the global ordinal of an ayah is its flat index + 1.
+
+Page boundaries belong to a particular printed mushaf and the downloaded
+data carries none, so ``page N`` only resolves when a ``page_starts`` table
+is supplied.
+"""
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+# (surah, ayah) starting each of the 60 hizbs; a juz is two hizbs, so the
+# odd-numbered hizbs start the 30 juz.
+HIZB_STARTS: tuple[tuple[int, int], ...] = (
+    (1, 1), (2, 75), (2, 142), (2, 203), (2, 253), (3, 15), (3, 93), (3, 171), (4, 24), (4, 88),
+    (4, 148), (5, 27), (5, 82), (6, 36), (6, 111), (7, 1), (7, 88), (7, 171), (8, 41), (9, 34),
+    (9, 93), (10, 26), (11, 6), (11, 84), (12, 53), (13, 19), (15, 1), (16, 51), (17, 1), (17, 99),
+    (18, 75), (20, 1), (21, 1), (22, 1), (23, 1), (24, 21), (25, 21), (26, 111), (27, 56), (28, 51),
+    (29, 46), (31, 22), (33, 31), (34, 24), (36, 28), (37, 145), (39, 32), (40, 41), (41, 47), (43, 24),
+    (46, 1), (48, 18), (51, 31), (55, 1), (58, 1), (62, 1), (67, 1), (72, 1), (78, 1), (87, 1),
+)
+JUZ_STARTS = HIZB_STARTS[::2]
+
+REFERENCE_HELP = "Try 2, 2:255, 2:255-260, juz 30 or hizb 60."
+
+_MISSING = 0xFFFF
+_SURAH = re.compile(r"(\d+)")
+_VERSES = re.compile(r"(\d+)\s*:\s*(\d+)(?:\s*-\s*(?:(\d+)\s*:\s*)?(\d+))?")
+_DIVISION = re.compile(r"(juz|hizb|page)\s*(\d+)", re.IGNORECASE)
+
+
+@dataclass(slots=True, frozen=True)
+class VerseRange:
+    """Flat ayah indices ``start`` up to ``stop`` (exclusive), and their name."""
+
+    start: int
+    stop: int
+    label: str
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+
+class ReferenceIndex:
+    """Reference lookups over one corpus.
+
+    ``surah_numbers`` and ``surah_starts`` describe each surah slot;
+    ``surah_ayah_numbers(slot)`` returns a slot's ayah numbers in order and
+    is only called once per surah, when it is first looked up.
+    """
+
+    def __init__(
+        self,
+        surah_numbers: Sequence[int],
+        surah_starts: Sequence[int],
+        ayah_count: int,
+        surah_ayah_numbers: Callable[[int], Sequence[int]],
+        *,
+        page_starts: Sequence[tuple[int, int]] | None = None,
+    ) -> None:
+        self.surah_numbers = list(surah_numbers)
+        self.surah_starts = list(surah_starts)
+        self.ayah_count = ayah_count
+        self.page_starts = page_starts
+        self._surah_ayah_numbers = surah_ayah_numbers
+        self._slots = {number: slot for slot, number in enumerate(self.surah_numbers)}
+        self._tables: list[array | None] = [None] * len(self.surah_numbers)
+
+    def surah_slot(self, surah_number: int) -> int:
+        slot = self._slots.get(surah_number)
+        if slot is None:
+            raise ValueError(f"There is no surah {surah_number}; surahs are 1 to {len(self.surah_numbers)}.")
+        return slot
+
+    def index_of(self, surah_number: int, ayah_number: int) -> int:
+        """Flat index of ``surah_number:ayah_number``."""
+        slot = self.surah_slot(surah_number)
+        table = self._tables[slot]
+        if table is None:
+            table = self._tables[slot] = self._table(slot)
+        offset = table[ayah_number] if 0 <= ayah_number < len(table) else _MISSING
+        if offset == _MISSING:
+            raise ValueError(f"Surah {surah_number} has no ayah {ayah_number}.")
+        return self.surah_starts[slot] + offset
+
+    def index_of_ordinal(self, ordinal: int) -> int:
+        """Flat index of the ``ordinal``-th ayah of the whole Quran (from 1)."""
+        if not 1 <= ordinal <= self.ayah_count:
+            raise ValueError(f"Ayah ordinals are 1 to {self.ayah_count}.")
+        return ordinal - 1
+
+    def position(self, index: int) -> tuple[int, int]:
+        """``(surah slot, ayah offset within the surah)`` of a flat index."""
+        if not 0 <= index < self.ayah_count:
+            raise IndexError("ayah index out of range")
+        slot = bisect_right(self.surah_starts, index) - 1
+        return slot, index - self.surah_starts[slot]
+
+    def surah(self, surah_number: int) -> VerseRange:
+        slot = self.surah_slot(surah_number)
+        start = self.surah_starts[slot]
+        stop = self.surah_starts[slot + 1] if slot + 1 < len(self.surah_starts) else self.ayah_count
+        return VerseRange(start, stop, f"surah {surah_number}")
+
+    def verses(
+        self, surah_number: int, first: int, last_surah: int | None = None, last: int | None = None
+    ) -> VerseRange:
+        """``surah:first``, or through ``last`` (in ``last_surah`` if given)."""
+        start = self.index_of(surah_number, first)
+        if last is None:
+            return VerseRange(start, start + 1, f"{surah_number}:{first}")
+        end_surah = surah_number if last_surah is None else last_surah
+        stop = self.index_of(end_surah, last) + 1
+        if stop <= start:
+            raise ValueError(f"{end_surah}:{last} comes before {surah_number}:{first}.")
+        end = str(last) if end_surah == surah_number else f"{end_surah}:{last}"
+        return VerseRange(start, stop, f"{surah_number}:{first}-{end}")
+
+    def juz(self, number: int) -> VerseRange:
+        return self._division("juz", JUZ_STARTS, number)
+
+    def hizb(self, number: int) -> VerseRange:
+        return self._division("hizb", HIZB_STARTS, number)
+
+    def page(self, number: int) -> VerseRange:
+        if self.page_starts is None:
+            raise ValueError("Page numbers are not available for this copy of the Quran.")
+        return self._division("page", self.page_starts, number)
+
+    def resolve(self, reference: str) -> VerseRange:
+        """The ayahs ``reference`` names; ``ValueError`` says what is wrong."""
+        text = reference.strip()
+        if match := _SURAH.fullmatch(text):
+            return self.surah(int(match.group(1)))
+        if match := _VERSES.fullmatch(text):
+            surah_number, first, last_surah, last = match.groups()
+            return self.verses(
+                int(surah_number),
+                int(first),
+                None if last_surah is None else int(last_surah),
+                None if last is None else int(last),
+            )
+        if match := _DIVISION.fullmatch(text):
+            kind, number = match.group(1).lower(), int(match.group(2))
+            return getattr(self, kind)(number)
+        raise ValueError(REFERENCE_HELP if text else f"Type a reference. {REFERENCE_HELP}")
+
+    def _division(self, kind: str, starts: Sequence[tuple[int, int]], number: int) -> VerseRange:
+        if not 1 <= number <= len(starts):
+            raise ValueError(f"There is no {kind} {number}; they run 1 to {len(starts)}.")
+        start = self.index_of(*starts[number - 1])
+        stop = self.index_of(*starts[number]) if number < len(starts) else self.ayah_count
+        return VerseRange(start, stop, f"{kind} {number}")
+
+    def _table(self, slot: int) -> array:
+        ayah_numbers = self._surah_ayah_numbers(slot)
+        table = array("H", [_MISSING]) * (max(ayah_numbers, default=0) + 1)
+        for offset, ayah_number in enumerate(ayah_numbers):
+            table[ayah_number] = offset
+        return table
@@ -0,0 +1,118 @@
+"""Bounded LRU of search results for ``QuranSearchEngine``.
+
+Entries hold ayah indices and scores rather than ``SearchResult`` objects, so
+they stay small and a hit rebuilds previews from the active translation.
+The cache can be saved as JSON next to ``state.json``; the file carries a tag
+(corpus hash and translation) and is ignored when the tag no longer matches.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Sequence
+
+from .config import SEARCH_CACHE_BYTES, SEARCH_CACHE_ENTRIES
+
+# Normalized query, result limit and scoring backend name.
+CacheKey = tuple[str, int, str]
+Scored = list[tuple[int, float]]
+
+
+class ResultCache:
+    """LRU bounded by ``max_entries`` and by ``max_bytes`` of estimated size."""
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_ENTRIES, max_bytes: int = SEARCH_CACHE_BYTES) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[CacheKey, tuple[array, array, array | None, int]] = OrderedDict()
+        self._bytes = 0
+        # Searches run on a worker thread while the UI may read or save.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory held by the cached entries."""
+        return self._bytes
+
+    def get(self, key: CacheKey) -> tuple[Scored, list[int] | None] | None:
+        """``(scored, candidates)`` for ``key``, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        indices, scores, candidates, _ = entry
+        scored = list(zip(indices, scores))
+        return scored, None if candidates is None else candidates.tolist()
+
+    def put(self, key: CacheKey, scored: Scored, candidates: Sequence[int] | None) -> None:
+        indices = array("I", [index for index, _ in scored])
+        scores = array("d", [score for _, score in scored])
+        candidate_array = None if candidates is None else array("I", candidates)
+        size = sys.getsizeof(key[0]) + sys.getsizeof(indices) + sys.getsizeof(scores)
+        if candidate_array is not None:
+            size += sys.getsizeof(candidate_array)
+        with self._lock:
+            if size > self.max_bytes or self.max_entries <= 0:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[3]
+            self._entries[key] = (indices, scores, candidate_array, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted[3]
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry; the counters keep running."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def load(self, path: Path, tag: str) -> None:
+        """Add the entries saved at ``path`` if it was saved with ``tag``."""
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+            if raw.get("tag") != tag:
+                return
+            entries = [
+                (
+                    (str(query), int(limit), str(backend)),
+                    [(int(index), float(score)) for index, score in scored],
+                    None if candidates is None else [int(index) for index in candidates],
+                )
+                for query, limit, backend, scored, candidates in raw["entries"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return
+        for key, scored, candidates in entries:
+            self.put(key, scored, candidates)
+
+    def save(self, path: Path, tag: str) -> None:
+        """Write the entries, least recently used first, tagged with ``tag``."""
+        with self._lock:
+            entries = [
+                [
+                    *key,
+                    [[index, score] for index, score in zip(indices, scores)],
+                    None if candidates is None else candidates.tolist(),
+                ]
+                for key, (indices, scores, candidates, _) in self._entries.items()
+            ]
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"tag": tag, "entries": entries}), encoding="utf-8")
+        tmp_path.replace(path)
@@ -0,0 +1,171 @@
+"""Fuzzy scoring backends for ``QuranSearchEngine``.
+
+Every backend scores one query against a column of normalized texts and
+returns the positions scoring at least ``cutoff``, or only the best ``k`` of
+them. The batch backends hand the whole column to rapidfuzz in one call so
+the loop and the cutoff run in native code; ``cdist`` also spreads the work
+over every core but needs NumPy. The pairwise backends keep a heap of the
+best ``k`` and raise the cutoff to its worst score as they go. ``difflib`` is
+the pure-Python fallback used when rapidfuzz is missing.
+"""
+from __future__ import annotations
+
+import heapq
+from difflib import SequenceMatcher
+from typing import Protocol, Sequence
+
+try:
+    from rapidfuzz import fuzz, process  # type: ignore
+except ImportError:  # pragma: no cover
+    fuzz = None
+    process = None
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+# Every backend scores on a 0-100 scale.
+MAX_SCORE = 100.0
+
+
+class ScoringBackend(Protocol):
+    name: str
+
+    def ratio(self, query: str, choice: str) -> float:
+        """Score of a single pair, 0-100."""
+        ...
+
+    def scores(self, query: str, choices: Sequence[str], cutoff: float) -> list[tuple[int, float]]:
+        """``(position, score)`` for every choice scoring at least ``cutoff``."""
+        ...
+
+    def top(self, query: str, choices: Sequence[str], k: int, cutoff: float) -> list[tuple[int, float]]:
+        """The ``k`` best of ``scores``, in no particular order; ties go to
+        the lower position.
+        """
+        ...
+
+
+class DifflibBackend:
+    name = "difflib"
+
+    def ratio(self, query: str, choice: str) -> float:
+        return SequenceMatcher(None, query, choice).ratio() * 100
+
+    def bounded_ratio(self, query: str, choice: str, cutoff: float) -> float:
+        """``ratio``, or 0 as soon as it is known to be below ``cutoff``."""
+        matcher = SequenceMatcher(None, query, choice)
+        # Cheap upper bounds of ratio() first.
+        if matcher.real_quick_ratio() * 100 < cutoff or matcher.quick_ratio() * 100 < cutoff:
+            return 0.0
+        score = matcher.ratio() * 100
+        return score if score >= cutoff else 0.0
+
+    def scores(self, query: str, choices: Sequence[str], cutoff: float) -> list[tuple[int, float]]:
+        ratio = self.ratio
+        matches = []
+        for position, choice in enumerate(choices):
+            score = ratio(query, choice)
+            if score >= cutoff:
+                matches.append((position, score))
+        return matches
+
+    def top(self, query: str, choices: Sequence[str], k: int, cutoff: float) -> list[tuple[int, float]]:
+        if k <= 0:
+            return []
+        bounded_ratio = self.bounded_ratio
+        # Min-heap of (score, -position): the root is the entry to beat.
+        heap: list[tuple[float, int]] = []
+        for position, choice in enumerate(choices):
+            floor = heap[0][0] if len(heap) == k else cutoff
+            score = bounded_ratio(query, choice, floor)
+            if score < floor:
+                continue
+            if len(heap) < k:
+                heapq.heappush(heap, (score, -position))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, -position))
+        return [(-negative_position, score) for score, negative_position in heap]
+
+
+class RapidfuzzBackend(DifflibBackend):
+    """One ``WRatio`` call per pair from Python."""
+
+    name = "rapidfuzz"
+
+    def ratio(self, query: str, choice: str) -> float:
+        return float(fuzz.WRatio(query, choice))
+
+    def bounded_ratio(self, query: str, choice: str, cutoff: float) -> float:
+        return float(fuzz.WRatio(query, choice, score_cutoff=cutoff))
+
+
+class ExtractBackend(RapidfuzzBackend):
+    """``process.extract`` over the whole column in one native call."""
+
+    name = "extract"
+
+    def scores(self, query: str, choices: Sequence[str], cutoff: float) -> list[tuple[int, float]]:
+        matches = process.extract(query, choices, scorer=fuzz.WRatio, limit=None, score_cutoff=cutoff)
+        return [(position, float(score)) for _, score, position in matches]
+
+    def top(self, query: str, choices: Sequence[str], k: int, cutoff: float) -> list[tuple[int, float]]:
+        if k <= 0:
+            return []
+        matches = process.extract(query, choices, scorer=fuzz.WRatio, limit=k, score_cutoff=cutoff)
+        return [(position, float(score)) for _, score, position in matches]
+
+
+class CdistBackend(RapidfuzzBackend):
+    """``process.cdist`` with every core (``workers=-1``); needs NumPy."""
+
+    name = "cdist"
+    # Threads per call; ``search_pool`` workers set 1, the pool being the parallelism.
+    workers = -1
+
+    def scores(self, query: str, choices: Sequence[str], cutoff: float) -> list[tuple[int, float]]:
+        row = self._row(query, choices, cutoff)
+        positions = numpy.flatnonzero(row >= cutoff)
+        return list(zip(positions.tolist(), row[positions].tolist()))
+
+    def top(self, query: str, choices: Sequence[str], k: int, cutoff: float) -> list[tuple[int, float]]:
+        row = self._row(query, choices, cutoff)
+        positions = numpy.flatnonzero(row >= cutoff)
+        if len(positions) > k:
+            # Best score first, lower position first among ties.
+            positions = positions[numpy.lexsort((positions, -row[positions]))[:k]]
+        return list(zip(positions.tolist(), row[positions].tolist()))
+
+    def _row(self, query: str, choices: Sequence[str], cutoff: float):
+        return process.cdist(
+            [query], choices, scorer=fuzz.WRatio, score_cutoff=cutoff, dtype=numpy.float64, workers=self.workers
+        )[0]
+
+
+BACKENDS: dict[str, type[DifflibBackend]] = {
+    backend.name: backend for backend in (CdistBackend, ExtractBackend, RapidfuzzBackend, DifflibBackend)
+}
+
+
+def available_backends() -> list[str]:
+    """Usable backend names, fastest first."""
+    names = []
+    if fuzz is not None:
+        if numpy is not None:
+            names.append(CdistBackend.name)
+        names += [ExtractBackend.name, RapidfuzzBackend.name]
+    names.append(DifflibBackend.name)
+    return names
+
+
+def get_backend(name: str | None = None) -> ScoringBackend:
+    """The named backend, or the fastest available one for ``None``/"auto"."""
+    available = available_backends()
+    if name is None or name == "auto":
+        name = available[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown scoring backend {name!r}; choose from {', '.join(BACKENDS)}.")
+    if name not in available:
+        raise ValueError(f"Scoring backend {name!r} is not available (missing rapidfuzz or numpy).")
+    return BACKENDS[name]()
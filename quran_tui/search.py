@@ -1,33 +1,303 @@
 from __future__ import annotations
 
+import heapq
+import math
+import re
+import string
+import threading
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass
-from difflib import SequenceMatcher
-from typing import Callable, Sequence
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence, overload
 
-from .config import MAX_SEARCH_RESULTS
+from .arabic import DAGGER_ALEF, contains_arabic, skeleton
+from .config import MAX_SEARCH_RESULTS, SEARCH_BACKEND, SEARCH_RANKING
 from .models import Ayah
+from .query import Near, Node, Not, Or, Term, parse, positive_words
+from .result_cache import ResultCache
+from .scoring import MAX_SCORE, ScoringBackend, fuzz, get_backend
 
 try:
-    from rapidfuzz import fuzz  # type: ignore
-except ImportError:  # pragma: no cover
-    fuzz = None
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from .search_pool import SearchPool
+
+MIN_SCORE = 45
+CONTAINS_BONUS = 35
+# Ayahs handed from the token index to the fuzzy re-ranker.
+CANDIDATE_LIMIT = 50
+# A query token also matches up to this many longer words it is a prefix of.
+PREFIX_EXPANSION = 32
+# Length of the character n-grams indexed for exact substring lookup.
+TRIGRAM = 3
+# BM25 saturation and length normalization for candidate ranking.
+BM25_K1 = 1.2
+BM25_B = 0.75
+# How ayahs are ranked: "fuzzy" re-ranks index candidates with the scoring
+# backend; "bm25" scores the whole corpus with the precomputed term weights.
+RANKINGS = ("fuzzy", "bm25")
+_PHRASE_WEIGHT = 1e6
+# Word positions are packed as ``ayah index << 16 | position``. Positions in
+# the Arabic column start at 0x8000, so no phrase or NEAR spans both columns.
+_POSITION_BITS = 16
+_POSITION_MASK = (1 << _POSITION_BITS) - 1
+_ARABIC_POSITIONS = 0x8000
+
+_PUNCTUATION = string.punctuation + "،؛؟«»“”‘’"
+_WORD = re.compile(r"\S+")
+# Least rapidfuzz alignment score for highlighting a misspelled query.
+_ALIGNMENT_CUTOFF = 80
 
 
 def _normalize(text: str) -> str:
     return " ".join(text.casefold().split())
 
 
-def _fallback_ratio(left: str, right: str) -> float:
-    return SequenceMatcher(None, left, right).ratio() * 100
+def _has_latin(text: str) -> bool:
+    return any(char.isalpha() and not contains_arabic(char) for char in text)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[start : start + TRIGRAM] for start in range(len(text) - TRIGRAM + 1)}
+
+
+def _tokens(normalized: str) -> Iterable[str]:
+    for word in normalized.split():
+        token = word.strip(_PUNCTUATION)
+        if token:
+            yield token
+
+
+def _ayah_words(english: str, arabic: str, variants: list[str] | None) -> dict[str, list[int]]:
+    """Word positions of each token of one ayah (see ``_POSITION_BITS``)."""
+    words: dict[str, list[int]] = {}
+    for position, token in enumerate(_tokens(english)):
+        words.setdefault(token, []).append(position)
+    arabic_tokens = list(_tokens(arabic))
+    for position, token in enumerate(arabic_tokens, _ARABIC_POSITIONS):
+        words.setdefault(token, []).append(position)
+    if variants is not None:
+        # The dagger-less spelling of a word sits at the same position.
+        aligned = len(variants) == len(arabic_tokens)
+        for position, variant in enumerate(variants, _ARABIC_POSITIONS):
+            word_positions = words.setdefault(variant, [])
+            if aligned and position not in word_positions:
+                word_positions.append(position)
+    return words
+
+
+def _positional_index(
+    normalized_english: Sequence[str],
+    arabic_skeleton: Sequence[str],
+    variants: dict[int, list[str]],
+    vocabulary: Sequence[str],
+    postings: Sequence[bytes],
+    token_counts: array,
+) -> tuple[list[bytes], list[bytes]]:
+    """``SearchArtifacts.positions`` and ``term_weights``, in vocabulary order."""
+    terms = {token: term for term, token in enumerate(vocabulary)}
+    positions = [array("I") for _ in vocabulary]
+    weights = [array("f") for _ in vocabulary]
+    # BM25 with the length norms of ``QuranSearchEngine._candidates``.
+    corpus_size = len(token_counts)
+    average = sum(token_counts) / max(1, corpus_size)
+    idfs = []
+    for posting in postings:
+        frequency = len(posting) // 4
+        idfs.append(math.log(1 + (corpus_size - frequency + 0.5) / (frequency + 0.5)) * (BM25_K1 + 1))
+    for ayah_index, (english, arabic) in enumerate(zip(normalized_english, arabic_skeleton)):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * token_counts[ayah_index] / average)
+        base = ayah_index << _POSITION_BITS
+        for token, word_positions in _ayah_words(english, arabic, variants.get(ayah_index)).items():
+            term = terms[token]
+            positions[term].extend([base | position for position in sorted(word_positions)])
+            # A dagger-less variant that could not be aligned still occurs once.
+            frequency = min(max(len(word_positions), 1), 0xFFFF)
+            weights[term].append(idfs[term] * frequency / (frequency + norm))
+    return [column.tobytes() for column in positions], [column.tobytes() for column in weights]
+
+
+class _Deferred:
+    """The value of ``make()``, computed once on first use from any thread."""
+
+    __slots__ = ("_make", "_value", "_lock")
+
+    def __init__(self, make: Callable[[], Any]) -> None:
+        self._make: Callable[[], Any] | None = make
+        self._value: Any = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        if self._make is not None:
+            with self._lock:
+                if self._make is not None:
+                    self._value = self._make()
+                    self._make = None
+        return self._value
+
+
+class _DeferredColumn(Sequence[bytes]):
+    """One per-token list of a ``_Deferred`` tuple of lists."""
+
+    __slots__ = ("_source", "_column", "_length")
+
+    def __init__(self, source: _Deferred, column: int, length: int) -> None:
+        self._source = source
+        self._column = column
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> bytes: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[bytes]: ...
+
+    def __getitem__(self, index):
+        return self._source.get()[self._column][index]
 
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._source.get()[self._column])
 
-def _rapidfuzz_ratio(left: str, right: str) -> float:
-    assert fuzz is not None
-    return float(fuzz.WRatio(left, right))
 
+@dataclass(slots=True, frozen=True)
+class SearchArtifacts:
+    """Per-ayah search data that only depends on the corpus.
+
+    ``build`` makes lists and bytes, deferring the positional index and
+    the BM25 weights until they are first read; ``search_index`` maps the
+    same fields from disk.
+    """
+
+    normalized_english: Sequence[str]
+    # ``arabic.skeleton`` of each ayah; Arabic queries are matched against it.
+    arabic_skeleton: Sequence[str]
+    # Inverted index over both columns: sorted tokens and, per token, the
+    # ayah indices containing it as native uint32 bytes. Words written with
+    # a dagger alef are indexed with and without it.
+    vocabulary: Sequence[str]
+    postings: Sequence[bytes | memoryview]
+    # Per token, its packed word positions (see ``_POSITION_BITS``) as
+    # sorted uint32 bytes, for phrase and proximity queries.
+    positions: Sequence[bytes | memoryview]
+    # Distinct tokens per ayah as native uint16 bytes, for BM25 length norms.
+    token_counts: bytes | memoryview
+    # Per token, the BM25 weight of each ayah in its postings as float32
+    # bytes: the columns of the term-ayah matrix of the "bm25" ranking.
+    term_weights: Sequence[bytes | memoryview]
+    # Character trigrams of the vocabulary: sorted trigrams and, per
+    # trigram, the positions of the tokens containing it as uint32 bytes.
+    trigrams: Sequence[str]
+    trigram_postings: Sequence[bytes | memoryview]
+
+    @classmethod
+    def build(cls, ayahs: Sequence[Ayah]) -> SearchArtifacts:
+        """Everything a fuzzy search needs is built here; ``positions`` and
+        ``term_weights`` are filled in by a second pass over the normalized
+        columns the first time either is read.
+        """
+        normalized_english = []
+        arabic_skeleton = []
+        # Dagger-less Arabic tokens of the ayahs written with a dagger alef.
+        variants: dict[int, list[str]] = {}
+        index: dict[str, list[int]] = {}
+        token_counts = array("H")
+        for ayah_index, ayah in enumerate(ayahs):
+            english = _normalize(ayah.text_english)
+            text_arabic = ayah.text_arabic
+            arabic = skeleton(text_arabic)
+            normalized_english.append(english)
+            arabic_skeleton.append(arabic)
+            words = set(_tokens(english))
+            words.update(_tokens(arabic))
+            token_counts.append(min(len(words), 0xFFFF))
+            if DAGGER_ALEF in text_arabic:
+                variants[ayah_index] = list(_tokens(skeleton(text_arabic, dagger_alef=False)))
+                words.update(variants[ayah_index])
+            for token in words:
+                ayah_indices = index.get(token)
+                if ayah_indices is None:
+                    index[token] = [ayah_index]
+                else:
+                    ayah_indices.append(ayah_index)
+        vocabulary = sorted(index)
+        postings = [array("I", index[token]).tobytes() for token in vocabulary]
+        trigram_index: dict[str, list[int]] = {}
+        for term, token in enumerate(vocabulary):
+            for trigram in _trigrams(token):
+                trigram_index.setdefault(trigram, []).append(term)
+        trigrams = sorted(trigram_index)
+        positional = _Deferred(
+            lambda: _positional_index(normalized_english, arabic_skeleton, variants, vocabulary, postings, token_counts)
+        )
+        return cls(
+            normalized_english=normalized_english,
+            arabic_skeleton=arabic_skeleton,
+            vocabulary=vocabulary,
+            postings=postings,
+            positions=_DeferredColumn(positional, 0, len(vocabulary)),
+            token_counts=token_counts.tobytes(),
+            term_weights=_DeferredColumn(positional, 1, len(vocabulary)),
+            trigrams=trigrams,
+            trigram_postings=[array("I", trigram_index[trigram]).tobytes() for trigram in trigrams],
+        )
+
+    def matching_terms(self, token: str) -> list[int]:
+        """Vocabulary positions of ``token`` and of words it is a prefix of."""
+        vocabulary = self.vocabulary
+        start = bisect_left(vocabulary, token)
+        end = start
+        limit = min(len(vocabulary), start + PREFIX_EXPANSION)
+        while end < limit and vocabulary[end].startswith(token):
+            end += 1
+        return list(range(start, end))
+
+    def term(self, token: str) -> int | None:
+        """Vocabulary position of exactly ``token``."""
+        vocabulary = self.vocabulary
+        position = bisect_left(vocabulary, token)
+        return position if position < len(vocabulary) and vocabulary[position] == token else None
 
-def _score_func() -> Callable[[str, str], float]:
-    return _rapidfuzz_ratio if fuzz is not None else _fallback_ratio
+    def ayahs_with(self, term: int) -> memoryview:
+        return memoryview(self.postings[term]).cast("I")
+
+    def positions_in(self, term: int, ayah_index: int) -> list[int]:
+        """Word positions of ``term`` in an ayah; the Arabic column's are
+        offset by ``_ARABIC_POSITIONS``.
+        """
+        packed = memoryview(self.positions[term]).cast("I")
+        start = bisect_left(packed, ayah_index << _POSITION_BITS)
+        end = bisect_left(packed, (ayah_index + 1) << _POSITION_BITS, start)
+        return [value & _POSITION_MASK for value in packed[start:end]]
+
+    def terms_containing(self, fragment: str) -> list[int] | None:
+        """Vocabulary positions of tokens containing ``fragment``, or ``None``
+        if it is shorter than a trigram.
+        """
+        if len(fragment) < TRIGRAM:
+            return None
+        trigrams = self.trigrams
+        postings = []
+        for trigram in _trigrams(fragment):
+            position = bisect_left(trigrams, trigram)
+            if position == len(trigrams) or trigrams[position] != trigram:
+                return []
+            postings.append(memoryview(self.trigram_postings[position]).cast("I"))
+        postings.sort(key=len)
+        # Probe the survivors of the rarest list into the longer ones.
+        found = list(postings[0])
+        for terms in postings[1:]:
+            if not found:
+                break
+            found = [term for term in found if _contains_sorted(terms, term)]
+        vocabulary = self.vocabulary
+        return [term for term in found if fragment in vocabulary[term]]
 
 
 @dataclass(slots=True, frozen=True)
@@ -37,41 +307,597 @@ class SearchResult:
     preview: str
 
 
+@dataclass(slots=True, frozen=True)
+class Snippet:
+    """A preview of an ayah's translation and where the query matches it."""
+
+    text: str
+    # ``(start, end)`` offsets into ``text``, in order.
+    spans: tuple[tuple[int, int], ...]
+
+
+@dataclass(slots=True, frozen=True)
+class SearchRun:
+    """Results of one query and the ayahs that were scored for it."""
+
+    query: str
+    results: list[SearchResult]
+    # Corpus index of each result.
+    indices: list[int]
+    # Corpus indices handed to the scorer; ``None`` when the whole corpus was scanned.
+    candidates: list[int] | None
+
+
+class SearchCursor:
+    """Ranked results of one query, handed out a page at a time.
+
+    The first page taken scores the whole corpus once (every match, for a
+    query syntax query) and keeps only a heap of ``(score, index)`` pairs;
+    every page pops from that heap, so no page outranks an earlier one and
+    ``SearchResult`` objects only exist for the pages a caller takes.
+
+    ``first`` stands in for the first page when it was ranked the same way,
+    that is when it scanned the whole corpus (``candidates`` is ``None``).
+    A run that scored only the index candidates can order its results
+    differently, so it is refused.
+    """
+
+    def __init__(self, engine: QuranSearchEngine, query: str, page_size: int, first: SearchRun | None = None) -> None:
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.engine = engine
+        self.query = query
+        self.page_size = page_size
+        self.exhausted = False
+        # Results handed out so far, including ``first``.
+        self.taken = 0
+        self._shown: set[int] = set()
+        self._heap: list[tuple[float, int]] | None = None
+        if first is not None:
+            if first.candidates is not None:
+                raise ValueError("first must be a run over the whole corpus")
+            self._shown.update(first.indices)
+            self.taken = len(first.results)
+            # A full scan that came up short of a page has nothing more to give.
+            self.exhausted = len(first.results) < page_size
+
+    def next_page(self) -> list[SearchResult]:
+        """The next ``page_size`` results; empty once the query has no more."""
+        return self.take(self.page_size)
+
+    def take(self, count: int) -> list[SearchResult]:
+        """The next ``count`` results in rank order."""
+        if self.exhausted:
+            return []
+        engine = self.engine
+        if self._heap is None:
+            self._heap = engine._ranking(self.query, self._shown)
+        heap = self._heap
+        page = []
+        while heap and len(page) < count:
+            negative_score, index = heapq.heappop(heap)
+            page.append(engine._result(index, -negative_score))
+        self.taken += len(page)
+        if not heap:
+            self.exhausted = True
+        return page
+
+    def __iter__(self) -> Iterator[SearchResult]:
+        while True:
+            page = self.next_page()
+            if not page:
+                return
+            yield from page
+
+
 class QuranSearchEngine:
     """Fuzzy verse search with direct-match boost."""
 
-    def __init__(self, ayahs: Sequence[Ayah]) -> None:
-        self.ayahs = list(ayahs)
-        self._ratio = _score_func()
+    def __init__(
+        self,
+        ayahs: Sequence[Ayah],
+        *,
+        artifacts: SearchArtifacts | None = None,
+        candidate_limit: int | None = CANDIDATE_LIMIT,
+        backend: str | ScoringBackend | None = SEARCH_BACKEND,
+        result_cache: ResultCache | None = None,
+        pool: SearchPool | None = None,
+        ranking: str = SEARCH_RANKING,
+    ) -> None:
+        """``candidate_limit`` caps how many index candidates are fuzzy scored;
+        ``None`` always scans the whole corpus. ``backend`` is a scoring
+        backend or its name (see ``scoring.BACKENDS``); ``None`` picks the
+        fastest available. ``result_cache`` defaults to an empty one; it
+        must only be shared by engines over the same corpus and translation.
+        ``pool`` shards large scans over worker processes mapping the search
+        index of this corpus; small ones are still scored in-process.
+        ``ranking`` is one of ``RANKINGS``; "bm25" ignores the backend, the
+        candidate limit and the pool.
+        """
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown ranking {ranking!r}; choose from {', '.join(RANKINGS)}.")
+        # Kept as given: a list copy would build every lazy surah of ``QuranData.ayahs_flat``.
+        self.ayahs = ayahs
+        self.candidate_limit = candidate_limit
+        if backend is None or isinstance(backend, str):
+            backend = get_backend(backend)
+        self.backend = backend
+        self.ranking = ranking
+        # Scorer named in result cache keys.
+        self._scorer = backend.name if ranking == "fuzzy" else ranking
+        # BM25 scores are relative to the best ayah, so MIN_SCORE would drop
+        # matches on its fuzzy scale; any shared term makes a match instead.
+        self._min_score = MIN_SCORE if ranking == "fuzzy" else 0.0
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+        self.pool = pool
+        self._norms: list[float] | None = None
+        self.artifacts = artifacts if artifacts is not None else SearchArtifacts.build(self.ayahs)
+        if len(self.artifacts.normalized_english) != len(self.ayahs):
+            raise ValueError("Search artifacts do not match the corpus.")
 
     def search(self, query: str, limit: int = MAX_SEARCH_RESULTS) -> list[SearchResult]:
-        normalized_query = _normalize(query)
-        if not normalized_query:
-            return []
+        return self.run(query, limit).results
+
+    def run(self, query: str, limit: int = MAX_SEARCH_RESULTS, *, previous: SearchRun | None = None) -> SearchRun:
+        """Search for ``query``, keeping the scored candidates.
+
+        When ``query`` extends ``previous.query`` (search as you type) the
+        previous candidates are scored again instead of consulting the index.
+        Only such refined runs bypass the result cache. Queries using the
+        ``query`` syntax (phrases, AND/OR/NOT, NEAR) go to ``_run_query``.
+        """
+        node = parse(query)
+        if node is not None:
+            return self._run_query(query, node, limit)
+        forms = self._query_forms(query)
+        if not forms:
+            return SearchRun(query=query, results=[], indices=[], candidates=[])
+
+        key = ("\n".join(query_text for query_text, _ in forms), limit, self._scorer)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            scored, candidates = cached
+            results = [self._result(index, score) for index, score in scored]
+            return SearchRun(
+                query=query, results=results, indices=[index for index, _ in scored], candidates=candidates
+            )
+
+        containing = self._containing(forms)
+        refined = previous is not None and previous.candidates is not None and _extends(query, previous.query)
+        if refined:
+            candidates: list[int] | None = previous.candidates
+        elif self.ranking == "bm25":
+            # One pass scores every ayah; there is nothing to prune.
+            candidates = None
+        else:
+            candidates = self._candidates(forms, limit, containing)
+        indices: Sequence[int] = range(len(self.ayahs)) if candidates is None else candidates
+
+        if containing is not None and candidates is not None:
+            allowed = set(candidates)
+            containing = [index for index in containing if index in allowed]
+        best = self._fuzzy_scores(forms, indices, containing, limit)
+
+        # Best score first, corpus order among ties.
+        minimum = self._min_score
+        top = heapq.nlargest(limit, ((score, -index) for index, score in best.items() if score >= minimum))
+        scored = [(-negative_index, score) for score, negative_index in top]
+        if not refined:
+            self.result_cache.put(key, scored, candidates)
+        results = [self._result(index, score) for index, score in scored]
+        return SearchRun(query=query, results=results, indices=[index for index, _ in scored], candidates=candidates)
+
+    def cursor(
+        self, query: str, page_size: int = MAX_SEARCH_RESULTS, *, first: SearchRun | None = None
+    ) -> SearchCursor:
+        """Results of ``query`` page by page (see ``SearchCursor``).
+
+        ``first`` is a full scan run of the same query already shown as the
+        first page.
+        """
+        return SearchCursor(self, query, page_size, first)
+
+    def _ranking(self, query: str, exclude: set[int]) -> list[tuple[float, int]]:
+        """Heap of ``(-score, index)`` over every result of ``query`` except
+        ``exclude``: the whole corpus is scored, or every match of a query
+        syntax query.
+        """
+        node = parse(query)
+        if node is not None:
+            matches = [index for index in sorted(self._matching(node)) if index not in exclude]
+            forms = self._query_forms(" ".join(positive_words(node)))
+            best = self._scores(forms, matches, 0.0) if forms and matches else {}
+            entries = [(-best.get(index, 0.0), index) for index in matches]
+        else:
+            forms = self._query_forms(query)
+            if not forms:
+                return []
+            indices = [index for index in range(len(self.ayahs)) if index not in exclude]
+            containing = self._containing(forms)
+            if containing is not None:
+                containing = [index for index in containing if index not in exclude]
+            best = self._fuzzy_scores(forms, indices, containing, None)
+            entries = [(-score, index) for index, score in best.items() if score >= self._min_score]
+        heapq.heapify(entries)
+        return entries
 
-        results: list[SearchResult] = []
-        for ayah in self.ayahs:
-            normalized_en = _normalize(ayah.text_english)
-            normalized_ar = _normalize(ayah.text_arabic)
+    def _fuzzy_scores(
+        self,
+        forms: list[tuple[str, Sequence[str]]],
+        indices: Sequence[int],
+        containing: list[int] | None,
+        limit: int | None,
+    ) -> dict[int, float]:
+        """Scores of the ayahs in ``indices``, with ``CONTAINS_BONUS`` for
+        those containing a query form (``containing``, a subset of
+        ``indices``; ``None`` checks each ayah); only the best ``limit`` are
+        sure to be kept.
 
-            english_score = self._ratio(normalized_query, normalized_en)
-            arabic_score = self._ratio(normalized_query, normalized_ar)
+        The containing ayahs are scored first. Once there are ``limit`` of
+        them, the worst of the best is the score any other ayah has to reach;
+        the backend uses it as its cutoff and keeps only its top ``limit``,
+        and above MAX_SCORE the others are not scored at all.
 
-            contains_bonus = 35 if normalized_query in normalized_en or normalized_query in normalized_ar else 0
-            best_score = max(english_score, arabic_score) + contains_bonus
-            if best_score < 45:
-                continue
+        The "bm25" ranking scores every ayah of ``indices`` in one pass, one
+        row per form; every ayah sharing a term with the query is kept.
+        """
+        if self.ranking == "bm25":
+            best = {index: score for index, score in self._bm25_scores(forms, indices, 0.0).items() if score > 0}
+            if containing is None:
+                containing = [
+                    index for index in best if any(query_text in column[index] for query_text, column in forms)
+                ]
+            for index in containing:
+                if index in best:
+                    best[index] += CONTAINS_BONUS
+            return best
+        if containing is None:
+            containing = [
+                index for index in indices if any(query_text in column[index] for query_text, column in forms)
+            ]
+        best = self._scores(forms, containing, 0.0)
+        for index in best:
+            best[index] += CONTAINS_BONUS
+        floor: float = MIN_SCORE
+        if limit is not None and 0 < limit <= len(best):
+            floor = max(floor, heapq.nlargest(limit, best.values())[-1])
+        if floor <= MAX_SCORE:
+            if containing:
+                contained = set(containing)
+                indices = [index for index in indices if index not in contained]
+            best.update(self._scores(forms, indices, floor, limit))
+        return best
 
-            results.append(
-                SearchResult(
-                    ayah=ayah,
-                    score=best_score,
-                    preview=_build_preview(ayah.text_english),
+    def _run_query(self, query: str, node: Node, limit: int) -> SearchRun:
+        """Ayahs matching ``node``, ranked by their fuzzy score against the
+        query's positive words (corpus order among ties).
+
+        Matches come from the posting lists alone; the fuzzy scorer only
+        orders them, so there is no ``MIN_SCORE``. Such runs are not
+        refined while typing: an added word can widen an OR or a NOT.
+        """
+        key = (_normalize(query), limit, self._scorer)
+        cached = self.result_cache.get(key)
+        if cached is None:
+            matches = sorted(self._matching(node))
+            forms = self._query_forms(" ".join(positive_words(node)))
+            if forms and matches:
+                best = self._scores(forms, matches, 0.0, limit)
+                top = heapq.nlargest(limit, ((score, -index) for index, score in best.items()))
+                scored = [(-negative_index, score) for score, negative_index in top]
+            else:
+                scored = [(index, 0.0) for index in matches[:limit]]
+            self.result_cache.put(key, scored, None)
+        else:
+            scored, _ = cached
+        results = [self._result(index, score) for index, score in scored]
+        return SearchRun(query=query, results=results, indices=[index for index, _ in scored], candidates=None)
+
+    def _matching(self, node: Node) -> set[int]:
+        """Ayah indices matching ``node``, from posting list intersections."""
+        if isinstance(node, Term):
+            return self._term_matches(self._term_options(node), node.phrase)
+        if isinstance(node, Near):
+            left, right = self._term_options(node.left), self._term_options(node.right)
+            ayahs = self._term_matches(left, node.left.phrase) & self._term_matches(right, node.right.phrase)
+            return {
+                ayah_index
+                for ayah_index in ayahs
+                if _near(self._spans(left, ayah_index), self._spans(right, ayah_index), node.distance)
+            }
+        if isinstance(node, Or):
+            return set().union(*(self._matching(part) for part in node.parts))
+        if isinstance(node, Not):
+            return set(range(len(self.ayahs))) - self._matching(node.part)
+        # And: intersect the positive parts, smallest first, then subtract the negated ones.
+        included = sorted((self._matching(part) for part in node.parts if not isinstance(part, Not)), key=len)
+        found = included[0] if included else set(range(len(self.ayahs)))
+        for ayahs in included[1:]:
+            found &= ayahs
+        for part in node.parts:
+            if isinstance(part, Not) and found:
+                found -= self._matching(part.part)
+        return found
+
+    def _term_options(self, term: Term) -> list[list[int]]:
+        """Per word of ``term``, the vocabulary positions it matches: a bare
+        word also matches words it is a prefix of, a phrase word only itself.
+        """
+        artifacts = self.artifacts
+        options = []
+        for word in term.words:
+            for token in _tokens(skeleton(word) if contains_arabic(word) else _normalize(word)):
+                if term.phrase:
+                    position = artifacts.term(token)
+                    options.append([] if position is None else [position])
+                else:
+                    options.append(artifacts.matching_terms(token))
+        return options
+
+    def _term_matches(self, options: list[list[int]], phrase: bool) -> set[int]:
+        if not options:
+            return set()
+        artifacts = self.artifacts
+        per_word = sorted(
+            ({ayah_index for term in terms for ayah_index in artifacts.ayahs_with(term)} for terms in options), key=len
+        )
+        found = per_word[0]
+        for ayahs in per_word[1:]:
+            found &= ayahs
+        if phrase and len(options) > 1:
+            found = {ayah_index for ayah_index in found if self._spans(options, ayah_index)}
+        return found
+
+    def _spans(self, options: list[list[int]], ayah_index: int) -> list[tuple[int, int]]:
+        """``(first, last)`` word positions where the words of ``options``
+        occur one after another in an ayah.
+        """
+        artifacts = self.artifacts
+
+        def positions(terms: list[int]) -> set[int]:
+            return {position for term in terms for position in artifacts.positions_in(term, ayah_index)}
+
+        starts = positions(options[0])
+        for offset, terms in enumerate(options[1:], 1):
+            if not starts:
+                break
+            following = positions(terms)
+            starts = {start for start in starts if start + offset in following}
+        return [(start, start + len(options) - 1) for start in sorted(starts)]
+
+    def _scores(
+        self, forms: list[tuple[str, Sequence[str]]], indices: Sequence[int], cutoff: float, k: int | None = None
+    ) -> dict[int, float]:
+        """Best score over ``forms`` of each ayah in ``indices`` reaching
+        ``cutoff``; only the best ``k`` when given.
+        """
+        if self.ranking == "bm25":
+            return self._bm25_scores(forms, indices, cutoff, k)
+        backend = self.backend
+        pool = self.pool
+        whole_corpus = isinstance(indices, range) and len(indices) == len(self.ayahs)
+        best: dict[int, float] = {}
+        for query_text, column in forms:
+            scored = None
+            if pool is not None:
+                column_name = "arabic_skeleton" if column is self.artifacts.arabic_skeleton else "normalized_english"
+                scored = pool.scores(backend.name, column_name, query_text, indices, cutoff, k)
+            if scored is None:
+                choices = column if whole_corpus else [column[index] for index in indices]
+                if k is None:
+                    matches = backend.scores(query_text, choices, cutoff)
+                else:
+                    matches = backend.top(query_text, choices, k, cutoff)
+                scored = [(indices[position], score) for position, score in matches]
+            for index, score in scored:
+                if score > best.get(index, -1.0):
+                    best[index] = score
+        return best
+
+    def _bm25_scores(
+        self, forms: list[tuple[str, Sequence[str]]], indices: Sequence[int], cutoff: float, k: int | None = None
+    ) -> dict[int, float]:
+        """``_scores`` for the "bm25" ranking."""
+        whole_corpus = isinstance(indices, range) and len(indices) == len(self.ayahs)
+        best: dict[int, float] = {}
+        for query_text, _ in forms:
+            row = self._bm25_row(query_text)
+            if numpy is not None:
+                positions = numpy.arange(len(row)) if whole_corpus else numpy.asarray(indices, dtype=numpy.int64)
+                values = row[positions]
+                keep = numpy.flatnonzero(values >= cutoff)
+                if k is not None and len(keep) > k:
+                    # Best score first, lower index first among ties.
+                    keep = keep[numpy.lexsort((positions[keep], -values[keep]))[:k]]
+                scored = zip(positions[keep].tolist(), values[keep].tolist())
+            else:
+                matches = [(index, row[index]) for index in indices if row[index] >= cutoff]
+                scored = matches if k is None else heapq.nlargest(k, matches, key=lambda match: (match[1], -match[0]))
+            for index, score in scored:
+                if score > best.get(index, -1.0):
+                    best[index] = score
+        return best
+
+    def _bm25_row(self, query_text: str) -> Sequence[float]:
+        """BM25 score of every ayah for ``query_text``, scaled so the best
+        one scores MAX_SCORE.
+
+        The query's terms select columns of the term-ayah matrix
+        (``SearchArtifacts.term_weights``); summing them per ayah is its
+        product with the query vector, one ``bincount`` over the posting
+        lists with NumPy. A token matches itself, or the words it is a
+        prefix of when it is not a word of the corpus.
+        """
+        artifacts = self.artifacts
+        terms = []
+        for token in dict.fromkeys(_tokens(query_text)):
+            term = artifacts.term(token)
+            terms.extend(artifacts.matching_terms(token) if term is None else [term])
+        corpus_size = len(self.ayahs)
+        row: Sequence[float]
+        if numpy is not None:
+            if terms:
+                ayah_indices = numpy.concatenate(
+                    [numpy.frombuffer(artifacts.postings[term], dtype=numpy.uint32) for term in terms]
                 )
-            )
+                weights = numpy.concatenate(
+                    [numpy.frombuffer(artifacts.term_weights[term], dtype=numpy.float32) for term in terms]
+                )
+                row = numpy.bincount(ayah_indices, weights=weights, minlength=corpus_size)
+            else:
+                row = numpy.zeros(corpus_size)
+            top = row.max(initial=0.0)
+            if top > 0:
+                row *= MAX_SCORE / top
+        else:
+            totals = [0.0] * corpus_size
+            for term in terms:
+                column_weights = memoryview(artifacts.term_weights[term]).cast("f")
+                for ayah_index, weight in zip(artifacts.ayahs_with(term), column_weights):
+                    totals[ayah_index] += weight
+            top = max(totals, default=0.0)
+            scale = MAX_SCORE / top if top > 0 else 0.0
+            row = [total * scale for total in totals]
+        return row
+
+    def _query_forms(self, query: str) -> list[tuple[str, Sequence[str]]]:
+        """``(normalized query, column)`` pairs to score: Arabic script runs
+        against the skeleton column, anything else against the translation.
+        """
+        artifacts = self.artifacts
+        forms = []
+        if contains_arabic(query):
+            arabic_query = skeleton(query)
+            if arabic_query:
+                forms.append((arabic_query, artifacts.arabic_skeleton))
+        if _has_latin(query) or not forms:
+            english_query = _normalize(query)
+            if english_query:
+                forms.append((english_query, artifacts.normalized_english))
+        return forms
+
+    def _containing(self, forms: list[tuple[str, Sequence[str]]]) -> list[int] | None:
+        """Sorted ayahs containing a query form verbatim, or ``None`` when
+        every word of a form is too short for the trigram index.
+
+        Such an ayah has each (punctuation-stripped) query word inside one of
+        its tokens, so the ayahs of the rarest word's tokens are a complete
+        candidate set; a substring check settles each of them.
+        """
+        artifacts = self.artifacts
+        found: set[int] = set()
+        for query_text, column in forms:
+            rarest: list[int] | None = None
+            rarest_size = 0
+            for token in set(_tokens(query_text)):
+                terms = artifacts.terms_containing(token)
+                if terms is None:
+                    continue
+                size = sum(len(artifacts.postings[term]) for term in terms)
+                if rarest is None or size < rarest_size:
+                    rarest, rarest_size = terms, size
+            if rarest is None:
+                return None
+            candidates = {ayah_index for term in rarest for ayah_index in artifacts.ayahs_with(term)}
+            found.update(ayah_index for ayah_index in candidates if query_text in column[ayah_index])
+        return sorted(found)
+
+    def _candidates(
+        self, forms: list[tuple[str, Sequence[str]]], limit: int, containing: list[int] | None = None
+    ) -> list[int] | None:
+        """Ayah indices worth fuzzy scoring, in corpus order, or ``None`` for a full scan.
+
+        Ayahs containing a query form get the contains bonus from the
+        re-ranker, so they go first; the rest are ranked by BM25 over the
+        query tokens (a query token also matches words it is a prefix of),
+        short ayahs higher, as with the fuzzy scorer. A query token with no
+        match anywhere, fewer candidates than ``limit``, or more containing
+        ayahs than ``candidate_limit`` means the index cannot vouch for
+        recall, so the caller scans everything. A full scan scores the
+        containing ayahs first and skips the rest once they fill ``limit``.
+
+        So the containing ayahs are always ranked as a full scan ranks them;
+        below them BM25 stands in for the fuzzy scorer, and a result the two
+        disagree on can be left out (``candidate_limit=None`` is exact).
+        """
+        if self.candidate_limit is None:
+            return None
+        if containing is not None and len(containing) > self.candidate_limit:
+            return None
+        artifacts = self.artifacts
+        corpus_size = len(self.ayahs)
+        postings: list[memoryview] = []
+        for token in {token for query_text, _ in forms for token in _tokens(query_text)}:
+            terms = artifacts.matching_terms(token)
+            if not terms:
+                return None
+            postings.extend(artifacts.ayahs_with(term) for term in terms)
+
+        # Words in most ayahs ("the", "of") barely move the ranking but cost
+        # the most to accumulate, so they only count when nothing else does.
+        selective = [ayah_indices for ayah_indices in postings if 2 * len(ayah_indices) <= corpus_size]
+        token_counts = memoryview(artifacts.token_counts).cast("H")
+        norms = self._length_norms(token_counts)
+        overlap: dict[int, float] = {}
+        for ayah_indices in selective or postings:
+            frequency = len(ayah_indices)
+            weight = math.log(1 + (corpus_size - frequency + 0.5) / (frequency + 0.5)) * (BM25_K1 + 1)
+            for ayah_index in ayah_indices:
+                overlap[ayah_index] = overlap.get(ayah_index, 0.0) + weight / norms[ayah_index]
+
+        # Ayahs containing the whole query get the contains bonus from the
+        # re-ranker, so they go first regardless of their BM25 score.
+        if containing is None:
+            containing = [
+                ayah_index
+                for ayah_index in overlap
+                if any(query_text in column[ayah_index] for query_text, column in forms)
+            ]
+        if len(containing) > self.candidate_limit:
+            return None
+        for ayah_index in containing:
+            overlap[ayah_index] = overlap.get(ayah_index, 0.0) + _PHRASE_WEIGHT
+
+        if len(overlap) < limit:
+            return None
+        if len(overlap) > self.candidate_limit:
+            best = heapq.nlargest(self.candidate_limit, overlap.items(), key=itemgetter(1))
+            return sorted(ayah_index for ayah_index, _ in best)
+        return sorted(overlap)
+
+    def _length_norms(self, token_counts: memoryview) -> list[float]:
+        # BM25's per-ayah denominator for a term seen once; fixed per corpus.
+        norms = self._norms
+        if norms is None:
+            average = sum(token_counts) / max(1, len(token_counts))
+            norms = self._norms = [
+                1 + BM25_K1 * (1 - BM25_B + BM25_B * count / average) for count in token_counts
+            ]
+        return norms
+
+    def _result(self, index: int, score: float) -> SearchResult:
+        ayah = self.ayahs[index]
+        return SearchResult(ayah=ayah, score=score, preview=_build_preview(ayah.text_english))
 
-        results.sort(key=lambda item: item.score, reverse=True)
-        return results[:limit]
+
+def _near(left: list[tuple[int, int]], right: list[tuple[int, int]], distance: int) -> bool:
+    """Whether a span of ``left`` and one of ``right`` are at most ``distance`` words apart."""
+    for left_first, left_last in left:
+        for right_first, right_last in right:
+            gap = right_first - left_last if right_first > left_last else left_first - right_last
+            if gap <= distance:
+                return True
+    return False
+
+
+def _contains_sorted(values: memoryview, value: int) -> bool:
+    position = bisect_left(values, value)
+    return position < len(values) and values[position] == value
+
+
+def _extends(query: str, previous: str) -> bool:
+    previous = _normalize(previous)
+    return bool(previous) and _normalize(query).startswith(previous)
 
 
 def _build_preview(text: str, max_length: int = 110) -> str:
@@ -79,3 +905,72 @@ def _build_preview(text: str, max_length: int = 110) -> str:
     if len(compact) <= max_length:
         return compact
     return compact[: max_length - 3].rstrip() + "..."
+
+
+def match_snippet(text: str, query: str, max_length: int = 110) -> Snippet:
+    """``_build_preview`` of ``text`` with the words matching ``query``
+    marked; when the first match lies past the cut, the preview starts a
+    little before it instead.
+
+    Far too slow for the ranking loop; the UI calls it for the results on
+    screen only.
+    """
+    compact = " ".join(text.split())
+    spans = _match_spans(compact, query)
+    start = 0
+    if len(compact) > max_length and spans and spans[0][1] > max_length - 3:
+        start = compact.rfind(" ", 0, max(0, spans[0][0] - max_length // 4)) + 1
+        # Near the end, start earlier so the preview is still full.
+        fill = len(compact) - (max_length - 3)
+        if fill < start:
+            start = compact.find(" ", fill) + 1
+    prefix = "..." if start else ""
+    visible = compact[start:]
+    suffix = ""
+    if len(prefix) + len(visible) > max_length:
+        visible = visible[: max_length - len(prefix) - 3].rstrip()
+        suffix = "..."
+    shift = len(prefix) - start
+    limit = len(prefix) + len(visible)
+    kept = tuple(
+        (span_start + shift, min(span_end + shift, limit))
+        for span_start, span_end in spans
+        if span_start >= start and span_start + shift < limit
+    )
+    return Snippet(prefix + visible + suffix, kept)
+
+
+def _match_spans(text: str, query: str) -> list[tuple[int, int]]:
+    """Words of ``text`` a (Latin) query word matches as the index does:
+    whole, or as their beginning. Words under a trigram are left out when
+    the query has longer ones. If no word matches, the rapidfuzz alignment
+    of the query, widened to whole words without their punctuation, stands
+    in for a misspelling.
+    """
+    node = parse(query)
+    words = [word for word in (positive_words(node) if node is not None else query.split()) if _has_latin(word)]
+    tokens = {token for word in words for token in _tokens(_normalize(word))}
+    tokens = {token for token in tokens if len(token) >= TRIGRAM} or tokens
+    spans = []
+    for match in _WORD.finditer(text):
+        word = match.group()
+        stripped = word.strip(_PUNCTUATION)
+        if stripped and stripped.casefold().startswith(tuple(tokens)):
+            begin = match.start() + word.index(stripped)
+            spans.append((begin, begin + len(stripped)))
+    if spans or not tokens or fuzz is None:
+        return spans
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        return spans
+    alignment = fuzz.partial_ratio_alignment(_normalize(" ".join(words)), lowered, score_cutoff=_ALIGNMENT_CUTOFF)
+    if alignment is None:
+        return spans
+    begin = text.rfind(" ", 0, alignment.dest_start) + 1
+    end = text.find(" ", alignment.dest_end)
+    aligned = text[begin : len(text) if end < 0 else end]
+    stripped = aligned.strip(_PUNCTUATION)
+    if not stripped:
+        return spans
+    begin += aligned.index(stripped)
+    return [(begin, begin + len(stripped))]
@@ -0,0 +1,203 @@
+"""Memory-mapped search index: ``SearchArtifacts`` on disk.
+
+``quran --download-data`` writes it under ``CACHE_DIR`` next to the snapshot.
+Opening it maps the file and parses the small JSON table at its end. The
+vocabulary, trigrams and postings are then read straight from the mapping,
+so a session pays next to nothing to become searchable and sessions on one
+host share those pages through the OS page cache. Only the two normalized
+text columns are decoded on open (``_LINES``), with one decode and a split:
+every query scores them and the scorer needs ``str`` objects anyway.
+
+Layout::
+
+    header    magic, format, meta offset and length (``_HEADER``)
+    sections  8-byte aligned, native byte order; per artifact field either
+              one blob (bytes), newline-joined UTF-8 (the normalized text
+              columns) or a blob plus uint32 end offsets (other lists of
+              strings or of byte strings)
+    meta      UTF-8 JSON: the key and each field's kind, offsets and length
+
+The key ties the file to the index format, the package version, the byte
+order (sections are mapped, never swapped) and the cache content hash.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Iterator, Sequence, overload
+
+from . import __version__
+from .search import SearchArtifacts
+
+MAGIC = b"QTSI"
+INDEX_FORMAT = 3
+
+_HEADER = struct.Struct("<4sHxxQQ")
+_ALIGNMENT = 8
+_BLOB = "blob"
+_STRINGS = "strings"
+_BLOBS = "blobs"
+_LINES = "lines"
+# Whitespace-collapsed per-ayah columns; they never contain a newline.
+_LINE_FIELDS = ("normalized_english", "arabic_skeleton")
+
+
+def search_index_key(content_hash: str) -> str:
+    return f"{INDEX_FORMAT}|{__version__}|{sys.byteorder}|{content_hash}"
+
+
+class MappedStrings(Sequence[str]):
+    """Read-only list of strings over a UTF-8 blob and uint32 end offsets."""
+
+    __slots__ = ("_data", "_ends")
+
+    def __init__(self, data: memoryview, ends: memoryview) -> None:
+        self._data = data
+        self._ends = ends
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        ends = self._ends
+        end = ends[index]
+        if index < 0:
+            index += len(ends)
+        start = ends[index - 1] if index else 0
+        return str(self._data[start:end], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        data = self._data
+        start = 0
+        for end in self._ends:
+            yield str(data[start:end], "utf-8")
+            start = end
+
+
+class MappedBlobs(Sequence[memoryview]):
+    """Read-only list of byte strings (as memoryviews) over one blob."""
+
+    __slots__ = ("_data", "_ends")
+
+    def __init__(self, data: memoryview, ends: memoryview) -> None:
+        self._data = data
+        self._ends = ends
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    @overload
+    def __getitem__(self, index: int) -> memoryview: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[memoryview]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        ends = self._ends
+        end = ends[index]
+        if index < 0:
+            index += len(ends)
+        start = ends[index - 1] if index else 0
+        return self._data[start:end]
+
+
+def write_search_index(path: Path, artifacts: SearchArtifacts, key: str) -> None:
+    body = bytearray()
+    table: dict[str, list[Any]] = {}
+
+    def append(data: bytes) -> int:
+        body.extend(b"\0" * (-(_HEADER.size + len(body)) % _ALIGNMENT))
+        offset = _HEADER.size + len(body)
+        body.extend(data)
+        return offset
+
+    for field in fields(artifacts):
+        value = getattr(artifacts, field.name)
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            table[field.name] = [_BLOB, append(bytes(value)), len(value)]
+            continue
+        items = list(value)
+        if field.name in _LINE_FIELDS:
+            data = "\n".join(items).encode("utf-8")
+            table[field.name] = [_LINES, append(data), len(data), len(items)]
+            continue
+        kind = _STRINGS if all(isinstance(item, str) for item in items) else _BLOBS
+        blob = bytearray()
+        ends = array("I")
+        for item in items:
+            blob.extend(item.encode("utf-8") if kind == _STRINGS else bytes(item))
+            ends.append(len(blob))
+        table[field.name] = [kind, append(bytes(blob)), len(blob), append(ends.tobytes()), len(ends)]
+
+    meta = json.dumps({"key": key, "fields": table}, separators=(",", ":")).encode("utf-8")
+    meta_offset = _HEADER.size + len(body)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, INDEX_FORMAT, meta_offset, len(meta)))
+        handle.write(body)
+        handle.write(meta)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def open_search_index(path: Path, key: str) -> SearchArtifacts | None:
+    """Map the index at ``path`` if it matches ``key``, else ``None``.
+
+    The mapping stays open for as long as the returned artifacts are used.
+    """
+    try:
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        magic, version, meta_offset, meta_length = _HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != INDEX_FORMAT or meta_offset + meta_length > len(mapped):
+            raise ValueError("not a search index of this format")
+        meta = json.loads(mapped[meta_offset : meta_offset + meta_length].decode("utf-8"))
+        if meta.get("key") != key:
+            raise ValueError("stale search index")
+        view = memoryview(mapped)
+        values: dict[str, Any] = {}
+        for field in fields(SearchArtifacts):
+            kind, offset, length, *rest = meta["fields"][field.name]
+            if offset + length > meta_offset:
+                raise ValueError(f"section {field.name} is out of bounds")
+            data = view[offset : offset + length]
+            if kind == _BLOB:
+                values[field.name] = data
+                continue
+            if kind == _LINES:
+                (count,) = rest
+                lines = str(data, "utf-8").split("\n") if count else []
+                if len(lines) != count:
+                    raise ValueError(f"section {field.name} has {len(lines)} lines, expected {count}")
+                values[field.name] = lines
+                continue
+            ends_offset, count = rest
+            if ends_offset + 4 * count > meta_offset:
+                raise ValueError(f"section {field.name} is out of bounds")
+            end_offsets = view[ends_offset : ends_offset + 4 * count].cast("I")
+            values[field.name] = (MappedStrings if kind == _STRINGS else MappedBlobs)(data, end_offsets)
+        return SearchArtifacts(**values)
+    except (struct.error, ValueError, TypeError, KeyError, UnicodeDecodeError):
+        # The mapping is released with the last view into it.
+        return None
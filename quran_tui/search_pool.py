@@ -0,0 +1,152 @@
+"""Sharded scoring of large scans on a pool of worker processes.
+
+Each worker maps the search index (``search_index``) once, in its
+initializer, so the corpus reaches it through the page cache instead of being
+pickled per call: a task carries only the query, a column name and the ayah
+indices of its shard (a ``range`` for the whole corpus). Every shard returns
+its own top ``k``, which the caller merges into the overall top ``k``.
+
+Scans shorter than ``min_shard`` ayahs are not worth the round trip, and
+``scores`` returns ``None`` for them, as it does once the pool is broken or
+closed; the engine then scores in-process.
+"""
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Sequence
+
+from .config import SEARCH_WORKERS
+from .scoring import CdistBackend, ScoringBackend, get_backend
+from .search import SearchArtifacts
+from .search_index import open_search_index
+
+# Fewest ayahs per shard; below this the round trip costs more than the scoring.
+MIN_SHARD = 512
+
+Scored = list[tuple[int, float]]
+
+_artifacts: SearchArtifacts | None = None
+_backends: dict[str, ScoringBackend] = {}
+
+
+def _init_worker(path: str, key: str) -> None:
+    global _artifacts
+    _artifacts = open_search_index(Path(path), key)
+    if _artifacts is None:
+        raise RuntimeError(f"search index {path} is missing or stale")
+
+
+def _ready() -> bool:
+    return _artifacts is not None
+
+
+def _backend(name: str) -> ScoringBackend:
+    backend = _backends.get(name)
+    if backend is None:
+        backend = _backends[name] = get_backend(name)
+        if isinstance(backend, CdistBackend):
+            backend.workers = 1
+    return backend
+
+
+def _score_shard(
+    backend_name: str, column_name: str, query: str, indices: Sequence[int], cutoff: float, k: int | None
+) -> Scored:
+    column = getattr(_artifacts, column_name)
+    if isinstance(indices, range) and indices.step == 1:
+        choices = column[indices.start : indices.stop]
+    else:
+        choices = [column[index] for index in indices]
+    backend = _backend(backend_name)
+    if k is None:
+        matches = backend.scores(query, choices, cutoff)
+    else:
+        matches = backend.top(query, choices, k, cutoff)
+    return [(indices[position], score) for position, score in matches]
+
+
+class SearchPool:
+    """Worker processes scoring shards of scans over the index at ``path``.
+
+    ``key`` is the index key (``search_index.search_index_key``); engines
+    using the pool must search the same corpus and translation.
+    """
+
+    def __init__(
+        self, path: Path, key: str, workers: int = SEARCH_WORKERS, *, min_shard: int = MIN_SHARD
+    ) -> None:
+        if workers < 1:
+            raise ValueError("A search pool needs at least one worker.")
+        self.workers = workers
+        self.min_shard = min_shard
+        self._broken = False
+        # Spawned rather than forked: the app forks from a threaded process.
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(path), key),
+        )
+
+    def warm(self) -> bool:
+        """Start the workers and map the index; ``False`` if that failed."""
+        try:
+            ready = [self._executor.submit(_ready) for _ in range(self.workers)]
+            return all(future.result() for future in ready)
+        except (BrokenProcessPool, RuntimeError):
+            self._broken = True
+            return False
+
+    def shards(self, size: int) -> int:
+        """How many shards a scan of ``size`` ayahs is split into; 0 means in-process."""
+        if self._broken:
+            return 0
+        return min(self.workers, size // self.min_shard)
+
+    def scores(
+        self,
+        backend_name: str,
+        column_name: str,
+        query: str,
+        indices: Sequence[int],
+        cutoff: float,
+        k: int | None = None,
+    ) -> Scored | None:
+        """``(index, score)`` of the ayahs in ``indices`` scoring at least
+        ``cutoff`` against ``column_name`` (only the best ``k`` when given, ties
+        to the lower index), or ``None`` if the caller should score in-process.
+        """
+        shards = self.shards(len(indices))
+        if shards == 0:
+            return None
+        bounds = [len(indices) * shard // shards for shard in range(shards + 1)]
+        try:
+            futures = [
+                self._executor.submit(
+                    _score_shard, backend_name, column_name, query, indices[start:stop], cutoff, k
+                )
+                for start, stop in zip(bounds, bounds[1:])
+            ]
+            parts = [future.result() for future in futures]
+        except (BrokenProcessPool, RuntimeError):
+            # A dead worker or a closed pool: the engine carries on in-process.
+            self._broken = True
+            return None
+        merged = [match for part in parts for match in part]
+        if k is None:
+            return merged
+        return heapq.nlargest(k, merged, key=lambda match: (match[1], -match[0]))
+
+    def close(self) -> None:
+        self._broken = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> SearchPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,94 @@
+"""Warm-start snapshot: the whole corpus in one file.
+
+``quran --download-data`` writes it next to the cache, together with the
+memory-mapped search index (``search_index``). The file is a short magic
+followed by one ``marshal`` blob, so loading is a single read and a single
+C-level decode. Its key ties it to the snapshot format, the package
+version, the Python version (marshal's format is version specific) and the
+content hash of the cache it was built from; any other key means stale.
+"""
+from __future__ import annotations
+
+import marshal
+import os
+import sys
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+from .models import AyahStore, QuranData, SurahInfo, TextColumn
+
+SNAPSHOT_MAGIC = b"QTSN\n"
+SNAPSHOT_FORMAT = 5
+
+
+@dataclass(slots=True, frozen=True)
+class Snapshot:
+    quran_data: QuranData
+
+
+def snapshot_key(content_hash: str) -> str:
+    python = f"{sys.version_info[0]}.{sys.version_info[1]}"
+    return f"{SNAPSHOT_FORMAT}|{__version__}|{python}|{content_hash}"
+
+
+def write_snapshot(path: Path, quran_data: QuranData, key: str) -> None:
+    store = quran_data.store
+    if store is None:
+        raise ValueError("Snapshots need store-backed Quran data.")
+
+    columns = []
+    for column in (AyahStore.ARABIC, AyahStore.ENGLISH):
+        source = store.columns[column]
+        if not isinstance(source, TextColumn):
+            source = TextColumn([store.text(index, column) for index in range(len(store))])
+        columns.append((source.buffer, source.ends.tobytes()))
+
+    payload: dict[str, Any] = {
+        "key": key,
+        "surahs": [
+            (info.number, info.name_arabic, info.name_english, info.bismillah_pre, info.first_ayah, info.ayah_count)
+            for info in store.surahs
+        ],
+        "ayah_numbers": store.ayah_numbers.tobytes(),
+        "columns": columns,
+    }
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(SNAPSHOT_MAGIC)
+        handle.write(marshal.dumps(payload))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: Path, key: str, *, memory_budget: int | None = None) -> Snapshot | None:
+    """Return the snapshot at ``path`` if it matches ``key``, else ``None``."""
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return None
+    if not raw.startswith(SNAPSHOT_MAGIC):
+        return None
+
+    try:
+        payload = marshal.loads(memoryview(raw)[len(SNAPSHOT_MAGIC) :])
+        if payload.get("key") != key:
+            return None
+
+        surahs = [SurahInfo(*entry) for entry in payload["surahs"]]
+        ayah_numbers = array("H")
+        ayah_numbers.frombytes(payload["ayah_numbers"])
+        columns = []
+        for buffer, ends_bytes in payload["columns"]:
+            ends = array("I")
+            ends.frombytes(ends_bytes)
+            columns.append(TextColumn.from_buffer(buffer, ends))
+        store = AyahStore(surahs, ayah_numbers, columns)
+        quran_data = QuranData.from_store(store, memory_budget=memory_budget)
+    except (EOFError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+    return Snapshot(quran_data=quran_data)
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Sequence
+
 from prompt_toolkit.application import Application
 from prompt_toolkit.filters import Condition, has_focus
 from prompt_toolkit.key_binding import KeyBindings
@@ -9,9 +13,11 @@ from prompt_toolkit.layout.dimension import Dimension
 from prompt_toolkit.styles import Style
 from prompt_toolkit.widgets import Frame, TextArea
 
+from .config import SEARCH_DEBOUNCE_SECONDS, SEARCH_RANKING, TRANSLATIONS
 from .models import Ayah, QuranData, SurahData
+from .references import REFERENCE_HELP
 from .rtl import reshape_arabic
-from .search import QuranSearchEngine, SearchResult
+from .search import QuranSearchEngine, SearchCursor, SearchResult, SearchRun, Snippet, match_snippet
 from .state import ReadingState, ReadingStateStore
 
 
@@ -21,18 +27,56 @@ class QuranTUIApplication:
     def __init__(
         self,
         quran_data: QuranData,
-        search_engine: QuranSearchEngine,
+        search_engine: QuranSearchEngine | Future[QuranSearchEngine],
         state_store: ReadingStateStore,
         *,
         enable_color: bool = True,
+        text_ready: Future[object] | None = None,
+        translations: Sequence[int] = (),
     ) -> None:
+        """``search_engine`` and ``text_ready`` may still be loading in the
+        background; search and the reader show a loading state until they finish.
+        Only pass ``text_ready`` when the verse text cannot be read before it.
+
+        ``translations`` lists the installed translation ids the reader can
+        switch between (``t``) or show side by side (``T``).
+        """
         self.quran_data = quran_data
-        self.search_engine = search_engine
+        self.search_engine: QuranSearchEngine | None = None
+        self.search_error: str | None = None
         self.state_store = state_store
+        self._pending_search: Future[QuranSearchEngine] | None = None
+        self._text_ready = text_ready
+        self._queued_query: str | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        # Searches run on the executor; a newer query bumps the generation so
+        # results of superseded ones are dropped.
+        self._search_job: Future[SearchRun] | Future[list[SearchResult]] | None = None
+        self._search_generation = 0
+        self._last_run: SearchRun | None = None
+        # Later pages of the results on screen (``m``).
+        self._search_cursor: SearchCursor | None = None
+        self._debounce: asyncio.TimerHandle | None = None
+        self.translations = list(translations)
+        self.side_by_side = False
+        if isinstance(search_engine, Future):
+            self._pending_search = search_engine
+        else:
+            self.search_engine = search_engine
+        # Engines by translation id, so switching back to one reuses its index.
+        self._search_engines: dict[int, Future[QuranSearchEngine]] = {}
+        if quran_data.store is not None:
+            if not isinstance(search_engine, Future):
+                built: Future[QuranSearchEngine] = Future()
+                built.set_result(search_engine)
+                search_engine = built
+            self._search_engines[quran_data.store.active_translation] = search_engine
 
         self.mode = "browse"
         self.search_results: list[SearchResult] = []
         self.search_index = 0
+        # Highlighted previews by (result position, query), made as results come on screen.
+        self._snippets: dict[tuple[int, str], Snippet] = {}
         self.last_query = ""
         self.message = "Ready."
 
@@ -53,11 +97,11 @@ class QuranTUIApplication:
             prompt="Search> ",
             style="class:prompt",
         )
+        self.prompt_input.buffer.on_text_changed += self._on_prompt_changed
 
-        loaded_state = self.state_store.load()
-        self.current_surah_index = self._clamp(loaded_state.surah_number - 1, 0, len(self.quran_data.surahs) - 1)
+        self.current_surah_index = 0
         self.current_ayah_index = 0
-        self._set_current_ayah_index(loaded_state.ayah_number - 1)
+        self._go_to_saved(self.state_store.load())
 
         root = HSplit(
             [
@@ -93,8 +137,59 @@ class QuranTUIApplication:
             mouse_support=False,
         )
 
+        if self._pending_search is not None:
+            self._set_pending_search(self._pending_search)
+        if self._text_ready is not None:
+            self._text_ready.add_done_callback(lambda _future: self.app.invalidate())
+
     def run(self) -> None:
-        self.app.run()
+        try:
+            self.app.run()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _background(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quran-search")
+        return self._executor
+
+    def _call_on_loop(self, callback: Callable[..., None], *args: object) -> None:
+        # Done callbacks run on worker threads; UI state is only touched on the loop.
+        loop = self.app.loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(callback, *args)
+        else:
+            callback(*args)
+
+    def _set_pending_search(self, future: Future[QuranSearchEngine]) -> None:
+        self._cancel_search()
+        self.search_engine = None
+        self.search_error = None
+        self._last_run = None
+        self._pending_search = future
+        future.add_done_callback(self._on_search_ready)
+
+    def _on_search_ready(self, future: Future[QuranSearchEngine]) -> None:
+        self._call_on_loop(self._after_search_ready, future)
+
+    def _after_search_ready(self, future: Future[QuranSearchEngine]) -> None:
+        if future is not self._pending_search:
+            return  # superseded by a later translation switch
+        try:
+            self.search_engine = future.result()
+        except Exception as exc:
+            self.search_error = str(exc) or type(exc).__name__
+        query, self._queued_query = self._queued_query, None
+        if self.search_error is not None:
+            self.message = f"Search unavailable: {self.search_error}"
+        elif query is not None:
+            self._run_search(query)
+        self.app.invalidate()
+
+    @property
+    def text_loading(self) -> bool:
+        return self._text_ready is not None and not self._text_ready.done()
 
     def _build_key_bindings(self) -> KeyBindings:
         kb = KeyBindings()
@@ -167,6 +262,19 @@ class QuranTUIApplication:
         def _resume(event) -> None:
             self._resume_from_saved_state()
 
+        @kb.add("t", filter=~has_focus(self.prompt_input))
+        def _next_translation(event) -> None:
+            self._cycle_translation()
+
+        @kb.add("T", filter=~has_focus(self.prompt_input))
+        def _toggle_side_by_side(event) -> None:
+            self._toggle_side_by_side()
+
+        @kb.add("m", filter=~has_focus(self.prompt_input))
+        def _more_results(event) -> None:
+            if self.mode == "search":
+                self._load_more_results()
+
         @kb.add("enter", filter=~has_focus(self.prompt_input))
         def _enter(event) -> None:
             if self.mode == "search" and event.app.layout.current_control == self.main_control:
@@ -188,11 +296,12 @@ class QuranTUIApplication:
         self.prompt_visible = True
         self.prompt_kind = prompt_kind
         self.prompt_input.text = ""
-        self.prompt_input.prompt = "Search> " if prompt_kind == "search" else "Surah #> "
+        self.prompt_input.prompt = "Search> " if prompt_kind == "search" else "Go to> "
         event.app.layout.focus(self.prompt_input)
-        self.message = "Type and press Enter."
+        self.message = "Type to search, Enter to confirm." if prompt_kind == "search" else REFERENCE_HELP
 
     def _close_prompt(self, event, message: str) -> None:
+        self._cancel_search()
         self.prompt_visible = False
         self.prompt_input.text = ""
         self.message = message
@@ -201,6 +310,7 @@ class QuranTUIApplication:
     def _submit_prompt(self, event) -> None:
         raw = self.prompt_input.text.strip()
         prompt_kind = self.prompt_kind
+        self._cancel_search()
         self.prompt_visible = False
         self.prompt_input.text = ""
         event.app.layout.focus(self.main_window)
@@ -208,7 +318,7 @@ class QuranTUIApplication:
         if prompt_kind == "search":
             self._run_search(raw)
             return
-        self._jump_to_surah(raw)
+        self._jump_to(raw)
 
     def _run_search(self, query: str) -> None:
         self.last_query = query
@@ -216,15 +326,126 @@ class QuranTUIApplication:
             self.message = "Search text is empty."
             return
 
-        self.search_results = self.search_engine.search(query)
-        if not self.search_results:
+        if self.search_engine is None:
+            if self.search_error is not None:
+                self.message = f"Search unavailable: {self.search_error}"
+                return
+            self._queued_query = query
+            self.message = f"Search index is loading; will search for: {query}"
+            return
+
+        self.message = f"Searching for: {query}"
+        self._start_search(self.search_engine, query)
+
+    def _on_prompt_changed(self, _buffer) -> None:
+        if not self.prompt_visible or self.prompt_kind != "search":
+            return
+        self._cancel_search()
+        loop = self.app.loop
+        if loop is not None and loop.is_running():
+            self._debounce = loop.call_later(SEARCH_DEBOUNCE_SECONDS, self._search_as_you_type)
+
+    def _search_as_you_type(self) -> None:
+        self._debounce = None
+        query = self.prompt_input.text.strip()
+        if query and self.search_engine is not None:
+            self._start_search(self.search_engine, query, previous=self._last_run)
+
+    def _start_search(self, engine: QuranSearchEngine, query: str, previous: SearchRun | None = None) -> None:
+        """Score ``query`` off the UI loop; ``previous`` lets a longer query
+        reuse the candidates of the one it extends.
+        """
+        self._cancel_search()
+        generation = self._search_generation
+        job = self._background().submit(engine.run, query, previous=previous)
+        self._search_job = job
+        job.add_done_callback(lambda future: self._call_on_loop(self._finish_search, future, generation))
+
+    def _cancel_search(self) -> None:
+        # Queued searches are cancelled; one already scoring finishes unseen.
+        if self._debounce is not None:
+            self._debounce.cancel()
+            self._debounce = None
+        self._search_generation += 1
+        if self._search_job is not None:
+            self._search_job.cancel()
+            self._search_job = None
+            # A page being loaded is lost with its job, so the cursor cannot resume.
+            self._search_cursor = None
+
+    def _finish_search(self, future: Future[SearchRun], generation: int) -> None:
+        if generation != self._search_generation or future.cancelled():
+            return
+        self._search_job = None
+        try:
+            run = future.result()
+        except Exception as exc:
+            self.message = f"Search failed: {exc}"
+            self.app.invalidate()
+            return
+
+        query = run.query
+        self._last_run = run
+        self.last_query = query
+        self.search_results = run.results
+        self.search_index = 0
+        self._snippets.clear()
+        engine = self.search_engine
+        if engine is not None and run.results:
+            # A pruned run is ranked again from the top when more are asked for.
+            first = run if run.candidates is None else None
+            self._search_cursor = engine.cursor(query, first=first)
+        else:
+            self._search_cursor = None
+        if run.results:
+            self.mode = "search"
+            self.message = f"{len(run.results)} results for: {query}"
+        else:
             self.mode = "browse"
             self.message = f"No result for: {query}"
+        self.app.invalidate()
+
+    def _load_more_results(self) -> None:
+        cursor = self._search_cursor
+        if cursor is None or cursor.exhausted:
+            self.message = f"No more results for: {self.last_query}"
+            return
+        if self._search_job is not None:
             return
+        generation = self._search_generation
+        # Results of a pruned run are replaced by the ranking of the whole corpus.
+        restart = cursor.taken == 0
+        count = len(self.search_results) + cursor.page_size if restart else cursor.page_size
+        job = self._background().submit(cursor.take, count)
+        self._search_job = job
+        self.message = f"Loading more results for: {self.last_query}"
+        job.add_done_callback(
+            lambda future: self._call_on_loop(self._finish_more_results, future, generation, restart)
+        )
 
-        self.mode = "search"
-        self.search_index = 0
-        self.message = f"{len(self.search_results)} results for: {query}"
+    def _finish_more_results(self, future: Future[list[SearchResult]], generation: int, restart: bool) -> None:
+        if generation != self._search_generation or future.cancelled():
+            return
+        self._search_job = None
+        try:
+            page = future.result()
+        except Exception as exc:
+            self._search_cursor = None
+            self.message = f"Search failed: {exc}"
+            self.app.invalidate()
+            return
+
+        if restart and page:
+            self.search_results = page
+            self.search_index = min(self.search_index, len(page) - 1)
+            self._snippets.clear()
+            self.message = f"{len(self.search_results)} results for: {self.last_query}"
+        elif page:
+            self.search_results = [*self.search_results, *page]
+            self.message = f"{len(self.search_results)} results for: {self.last_query}"
+        else:
+            self.message = f"No more results for: {self.last_query}"
+        self.app.invalidate()
 
     def _open_selected_search_result(self) -> None:
         if not self.search_results:
@@ -232,40 +453,85 @@ class QuranTUIApplication:
             return
 
         selected = self.search_results[self.search_index]
-        self.current_surah_index = self._clamp(selected.ayah.surah_number - 1, 0, len(self.quran_data.surahs) - 1)
-        self._set_current_ayah_index(selected.ayah.ayah_number - 1)
+        try:
+            self._go_to_index(self.quran_data.index_of(selected.ayah.surah_number, selected.ayah.ayah_number))
+        except ValueError as exc:
+            self.message = str(exc)
+            return
         self.mode = "browse"
         self.message = f"Jumped to {selected.ayah.surah_number}:{selected.ayah.ayah_number}"
         self._save_state()
 
-    def _jump_to_surah(self, raw_value: str) -> None:
-        if not raw_value:
-            self.message = "Type a number from 1 to 114."
-            return
-
+    def _jump_to(self, reference: str) -> None:
+        """Open the first ayah of a surah, ayah, range, juz or hizb reference."""
         try:
-            surah_number = int(raw_value)
-        except ValueError:
-            self.message = "Surah must be a number."
-            return
-
-        if not (1 <= surah_number <= len(self.quran_data.surahs)):
-            self.message = f"Range is 1 to {len(self.quran_data.surahs)}."
+            verses = self.quran_data.resolve(reference)
+        except ValueError as exc:
+            self.message = str(exc)
             return
 
-        self.current_surah_index = surah_number - 1
-        self.current_ayah_index = 0
+        self._go_to_index(verses.start)
         self.mode = "browse"
-        self.message = f"Opened surah {surah_number}."
+        count = len(verses)
+        self.message = f"Opened {verses.label}." if count == 1 else f"Opened {verses.label} ({count} ayahs)."
         self._save_state()
 
+    def _go_to_index(self, index: int) -> None:
+        self.current_surah_index, self.current_ayah_index = self.quran_data.references.position(index)
+
+    def _go_to_saved(self, state: ReadingState) -> None:
+        try:
+            self._go_to_index(self.quran_data.index_of(state.surah_number, state.ayah_number))
+        except (ValueError, IndexError):
+            # An ayah this corpus lacks: the nearest surah and ayah position.
+            self.current_surah_index = self._clamp(state.surah_number - 1, 0, len(self.quran_data.surahs) - 1)
+            self._set_current_ayah_index(state.ayah_number - 1)
+
     def _resume_from_saved_state(self) -> None:
-        state = self.state_store.load()
-        self.current_surah_index = self._clamp(state.surah_number - 1, 0, len(self.quran_data.surahs) - 1)
-        self._set_current_ayah_index(state.ayah_number - 1)
+        self._go_to_saved(self.state_store.load())
         self.mode = "browse"
         self.message = f"Resumed at {self.current_surah.number}:{self.current_ayah.ayah_number}"
 
+    def _cycle_translation(self) -> None:
+        store = self.quran_data.store
+        if store is None or len(self.translations) < 2:
+            self.message = "No other translations installed (quran --add-translation ID)."
+            return
+        try:
+            position = self.translations.index(store.active_translation)
+        except ValueError:
+            position = -1
+        translation_id = self.translations[(position + 1) % len(self.translations)]
+        try:
+            store.select_translation(translation_id)
+        except (KeyError, OSError, ValueError) as exc:
+            self.message = f"Translation {translation_id} unavailable: {exc}"
+            return
+
+        # The search columns are built from the active translation, once.
+        future = self._search_engines.get(translation_id)
+        if future is None or (future.done() and (future.cancelled() or future.exception() is not None)):
+            engine = self.search_engine
+            future = self._background().submit(
+                QuranSearchEngine,
+                self.quran_data.ayahs_flat,
+                backend=engine.backend if engine is not None else None,
+                ranking=engine.ranking if engine is not None else SEARCH_RANKING,
+            )
+            self._search_engines[translation_id] = future
+        self._set_pending_search(future)
+        self._snippets.clear()
+        if self.mode == "search":
+            self.mode = "browse"
+        self.message = f"Translation: {_translation_name(translation_id)}"
+
+    def _toggle_side_by_side(self) -> None:
+        if self.quran_data.store is None or len(self.translations) < 2:
+            self.message = "No other translations installed (quran --add-translation ID)."
+            return
+        self.side_by_side = not self.side_by_side
+        self.message = "Showing all translations." if self.side_by_side else "Showing one translation."
+
     def _move_surah(self, step: int) -> None:
         old_index = self.current_surah_index
         self.current_surah_index = self._clamp(old_index + step, 0, len(self.quran_data.surahs) - 1)
@@ -324,7 +590,7 @@ class QuranTUIApplication:
         if self.prompt_visible:
             focus_name = "Command"
         location = f"{self.current_surah.number}:{self.current_ayah.ayah_number}"
-        help_text = " ↑↓/jk move  tab switch  / search  g jump  enter open  b browse  r resume  q quit "
+        help_text = " ↑↓/jk move  tab switch  / search  g jump  enter open  b browse  r resume  t/T translation  q quit "
         text = f" {focus_name} | {location} | {self.message} |{help_text}"
         return [("class:status", text)]
 
@@ -380,6 +646,10 @@ class QuranTUIApplication:
             )
         )
 
+        if self.text_loading:
+            output.append(("class:muted", "\nLoading verses...\n"))
+            return output
+
         if surah.bismillah_pre:
             bismillah_ar = "بِسْمِ ٱللَّهِ ٱلرَّحْمَـٰنِ ٱلرَّحِيمِ"
             bismillah_en = "In the name of Allah, the Most Gracious, the Most Merciful"
@@ -398,7 +668,10 @@ class QuranTUIApplication:
         english_style = "class:active-translation" if main_focus else "class:active-translation-soft"
 
         output.append((arabic_style, f"{reshape_arabic(ayah.text_arabic)}\n"))
-        output.append((english_style, f"> {ayah.ayah_number}. {ayah.text_english}\n\n"))
+        output.append((english_style, f"> {ayah.ayah_number}. {ayah.text_english}\n"))
+        if self.side_by_side:
+            output.extend(self._render_other_translations(ayah))
+        output.append(("", "\n"))
 
         if self.current_ayah_index < total - 1:
             output.append(("class:muted", f"  ↓ Ayah {current_num + 1} below (j/↓)\n"))
@@ -408,6 +681,20 @@ class QuranTUIApplication:
 
         return output
 
+    def _render_other_translations(self, ayah: Ayah) -> list[tuple[str, str]]:
+        store = self.quran_data.store
+        active = store.active_translation if store is not None else None
+        output: list[tuple[str, str]] = []
+        for translation_id in self.translations:
+            if translation_id == active:
+                continue
+            try:
+                text = ayah.translation(translation_id)
+            except (KeyError, OSError, ValueError):
+                continue
+            output.append(("class:translation", f"  [{_translation_name(translation_id)}] {text}\n"))
+        return output
+
     def _render_search_results(self):
         output: list[tuple[str, str]] = []
         header = f"Search: {self.last_query!r} ({len(self.search_results)} results)\n\n"
@@ -417,20 +704,50 @@ class QuranTUIApplication:
             output.append(("class:muted", "No results.\n"))
             return output
 
-        for index, result in enumerate(self.search_results):
+        # Only the results around the selection are drawn, so only they get previews.
+        results = self.search_results
+        info = self.main_window.render_info
+        shown = max(1, ((info.window_height if info is not None else 24) - 4) // 4)
+        start = max(0, self.search_index - shown // 2)
+        end = min(len(results), start + shown)
+        start = max(0, end - shown)
+        if start > 0:
+            output.append(("class:muted", f"  ↑ {start} more above\n\n"))
+        for index in range(start, end):
+            result = results[index]
             ayah = result.ayah
             is_active = index == self.search_index
             marker = ">" if is_active else " "
             style = "class:result-active" if is_active else "class:result"
             snippet_style = "class:result-active-snippet" if is_active else "class:translation"
+            match_style = "class:result-active-match" if is_active else "class:result-match"
             ref = f"{ayah.surah_number}:{ayah.ayah_number}"
             line = f"{marker} {ref} {ayah.surah_name_english} (score {result.score:.1f})\n"
             output.append((style, line))
-            output.append((snippet_style, f"    {result.preview}\n\n"))
-
-        output.append(("class:muted", "Press Enter to open highlighted ayah, or b to go back.\n"))
+            snippet = self._snippet(index)
+            output.append((snippet_style, "    "))
+            position = 0
+            for span_start, span_end in snippet.spans:
+                output.append((snippet_style, snippet.text[position:span_start]))
+                output.append((match_style, snippet.text[span_start:span_end]))
+                position = span_end
+            output.append((snippet_style, f"{snippet.text[position:]}\n\n"))
+        if end < len(results):
+            output.append(("class:muted", f"  ↓ {len(results) - end} more below\n\n"))
+
+        cursor = self._search_cursor
+        more = ", m for more results" if cursor is not None and not cursor.exhausted else ""
+        output.append(("class:muted", f"Press Enter to open highlighted ayah{more}, or b to go back.\n"))
         return output
 
+    def _snippet(self, index: int) -> Snippet:
+        key = (index, self.last_query)
+        snippet = self._snippets.get(key)
+        if snippet is None:
+            text = self.search_results[index].ayah.text_english
+            snippet = self._snippets[key] = match_snippet(text, self.last_query)
+        return snippet
+
     def _focus_is_surah(self) -> bool:
         try:
             return self.app.layout.current_control == self.surah_control
@@ -465,6 +782,8 @@ class QuranTUIApplication:
                 "result": "#e4e4e4",
                 "result-active": "bg:#5f2a5f #ffffff bold",
                 "result-active-snippet": "bg:#5f2a5f #f0e7f0",
+                "result-match": "#ffd75f bold",
+                "result-active-match": "bg:#5f2a5f #ffd75f bold",
                 "prompt": "bg:#202020 #f0f0f0",
             }
         )
@@ -472,3 +791,7 @@ class QuranTUIApplication:
     @staticmethod
     def _clamp(value: int, low: int, high: int) -> int:
         return max(low, min(value, high))
+
+
+def _translation_name(translation_id: int) -> str:
+    return TRANSLATIONS.get(translation_id, f"translation {translation_id}")
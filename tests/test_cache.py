@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from quran_tui.cache import ENCODING_RAW, ENCODINGS, CacheFormatError, CacheReader, write_cache
+from quran_tui.data import QuranRepository
+from quran_tui.models import SurahInfo
+
+
+def _sample_table() -> tuple[list[SurahInfo], list[int], list[tuple[str, str]]]:
+    surahs = [
+        SurahInfo(
+            number=1,
+            name_arabic="الفاتحة",
+            name_english="Al-Fatihah",
+            bismillah_pre=False,
+            first_ayah=0,
+            ayah_count=2,
+        ),
+        SurahInfo(
+            number=2,
+            name_arabic="البقرة",
+            name_english="Al-Baqarah",
+            bismillah_pre=True,
+            first_ayah=2,
+            ayah_count=1,
+        ),
+    ]
+    ayah_numbers = [1, 2, 255]
+    rows = [
+        ("بِسْمِ اللَّهِ الرَّحْمَٰنِ الرَّحِيمِ", "In the name of Allah."),
+        ("الْحَمْدُ لِلَّهِ رَبِّ الْعَالَمِينَ", "All praise is for Allah, Lord of all worlds."),
+        ("اللَّهُ لَا إِلَٰهَ إِلَّا هُوَ", ""),
+    ]
+    return surahs, ayah_numbers, rows
+
+
+def _legacy_payload() -> dict:
+    return {
+        "version": 3,
+        "surahs": [
+            {
+                "number": 1,
+                "name_arabic": "الفاتحة",
+                "name_english": "Al-Fatihah",
+                "bismillah_pre": False,
+                "ayahs": [
+                    {"ayah_number": 1, "text_arabic": "بِسْمِ اللَّهِ", "text_english": "In the name of Allah."},
+                    {"ayah_number": 2, "text_arabic": "الْحَمْدُ لِلَّهِ", "text_english": "All praise is for Allah."},
+                ],
+            }
+        ],
+    }
+
+
+class CacheFormatTests(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        surahs, ayah_numbers, rows = _sample_table()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "cache.bin"
+            write_cache(path, surahs, ayah_numbers, rows, meta={"translation_id": 85})
+
+            with CacheReader(path) as reader:
+                self.assertEqual(reader.surahs, surahs)
+                self.assertEqual(list(reader.ayah_numbers), ayah_numbers)
+                self.assertEqual(reader.meta["translation_id"], 85)
+                self.assertEqual(len(reader.content_hash), 64)
+                self.assertEqual(reader.surah_rows(0), rows[:2])
+                self.assertEqual(reader.surah_rows(1), rows[2:])
+                self.assertEqual(reader.text(1, 1), rows[1][1])
+                self.assertEqual(reader.text(2, 0), rows[2][0])
+                self.assertEqual(reader.surah_index_for_ayah(2), 1)
+            self.assertFalse(path.with_suffix(".bin.tmp").exists())
+
+    def test_compressed_encodings_round_trip_per_surah(self) -> None:
+        surahs, ayah_numbers, rows = _sample_table()
+        content_hashes = set()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name, encoding in ENCODINGS.items():
+                path = Path(tmp_dir) / f"{name}.bin"
+                write_cache(path, surahs, ayah_numbers, rows, encoding=encoding)
+                with CacheReader(path) as reader:
+                    self.assertEqual(reader.encoding, encoding)
+                    self.assertEqual(reader.text(2, 0), rows[2][0])
+                    self.assertEqual(reader.surah_rows(0), rows[:2])
+                    self.assertEqual([reader.text(index, 1) for index in range(3)], [row[1] for row in rows])
+                    content_hashes.add(reader.content_hash)
+            # The snapshot and search index keys survive a change of encoding.
+            self.assertEqual(len(content_hashes), 1)
+
+            write_cache(path, surahs, ayah_numbers, [*rows[:2], (rows[2][0], "changed")])
+            with CacheReader(path) as reader:
+                self.assertNotIn(reader.content_hash, content_hashes)
+
+    def test_rejects_foreign_and_truncated_files(self) -> None:
+        surahs, ayah_numbers, rows = _sample_table()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "cache.bin"
+            path.write_bytes(b"")
+            with self.assertRaises(CacheFormatError):
+                CacheReader(path)
+
+            path.write_text("{}", encoding="utf-8")
+            with self.assertRaises(CacheFormatError):
+                CacheReader(path)
+
+            write_cache(path, surahs, ayah_numbers, rows)
+            path.write_bytes(path.read_bytes()[:-10])
+            with self.assertRaises(CacheFormatError):
+                CacheReader(path)
+
+
+class RepositoryCacheTests(unittest.TestCase):
+    def test_migrates_legacy_json_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = Path(tmp_dir) / "cache.bin"
+            legacy_path = Path(tmp_dir) / "cache.json"
+            legacy_path.write_text(json.dumps(_legacy_payload()), encoding="utf-8")
+            repository = QuranRepository(cache_path=cache_path, legacy_cache_path=legacy_path)
+
+            self.assertTrue(repository.has_cache())
+            migrated = repository._load_from_cache()
+            self.assertIsNotNone(migrated)
+            self.assertTrue(cache_path.exists())
+            self.assertFalse(legacy_path.exists())
+
+            reloaded = repository._load_from_cache()
+            assert reloaded is not None and migrated is not None
+            self.assertEqual(list(reloaded.ayahs_flat), list(migrated.ayahs_flat))
+            self.assertEqual(reloaded.surahs[0].ayahs[1].text_english, "All praise is for Allah.")
+
+    def test_requested_encoding_converts_existing_cache(self) -> None:
+        surahs, ayah_numbers, rows = _sample_table()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_path = Path(tmp_dir) / "cache.bin"
+            write_cache(cache_path, surahs, ayah_numbers, rows)
+
+            repository = QuranRepository(cache_path=cache_path, cache_encoding="lzma")
+            converted = repository.load()
+            self.assertEqual(converted.surahs[1].ayahs[0].text_arabic, rows[2][0])
+            with CacheReader(cache_path) as reader:
+                self.assertEqual(reader.encoding, ENCODINGS["lzma"])
+
+            # Without a preference the encoding on disk is kept.
+            QuranRepository(cache_path=cache_path).load()
+            with CacheReader(cache_path) as reader:
+                self.assertNotEqual(reader.encoding, ENCODING_RAW)
+
+
+if __name__ == "__main__":
+    unittest.main()
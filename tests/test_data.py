@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.fixtures import FixtureAPIServer
+from quran_tui import data
+from quran_tui.data import QuranRepository
+from quran_tui.jsonstream import iter_json_array
+
+
+def _small_payloads() -> dict[str, bytes]:
+    def encode(payload: dict) -> bytes:
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    return {
+        "/chapters": encode(
+            {
+                "chapters": [
+                    {"id": 1, "name_arabic": "الفاتحة", "name_simple": "Al-Fatihah", "bismillah_pre": False},
+                    {"id": 2, "name_arabic": "البقرة", "name_simple": "Al-Baqarah", "bismillah_pre": True},
+                ]
+            }
+        ),
+        "/quran/verses/uthmani": encode(
+            {
+                "verses": [
+                    {"id": 1, "verse_key": "1:1", "text_uthmani": "بِسْمِ اللَّهِ "},
+                    {"id": 2, "verse_key": "1:2", "text_uthmani": "الْحَمْدُ لِلَّهِ"},
+                    {"id": 3, "verse_key": "2:1", "text_uthmani": "الم"},
+                ],
+                "meta": {},
+            }
+        ),
+        "/quran/translations/85": encode(
+            {
+                "translations": [
+                    {"resource_id": 85, "text": "In the name of God"},
+                    {"resource_id": 85, "text": "Praise belongs to God"},
+                    {"resource_id": 85, "text": "Alif Lam Mim"},
+                ]
+            }
+        ),
+    }
+
+
+class JsonStreamTests(unittest.TestCase):
+    def test_yields_items_across_tiny_chunks(self) -> None:
+        payload = json.dumps(
+            {"meta": {"n": 3}, "verses": [{"text": "بِسْمِ"}, 12345, "الم", [1, 2]], "tail": "x"},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        for chunk_size in (1, 2, 3, 7, 1024):
+            items = list(iter_json_array(io.BytesIO(payload), "verses", chunk_size=chunk_size))
+            self.assertEqual(items, [{"text": "بِسْمِ"}, 12345, "الم", [1, 2]])
+
+    def test_missing_key_and_truncated_payload_raise(self) -> None:
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.BytesIO(b'{"chapters": []}'), "verses"))
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.BytesIO(b'{"verses": [{"a": 1}, {"b"'), "verses", chunk_size=4))
+
+
+class DownloadTests(unittest.TestCase):
+    def test_retry_delay_grows_with_jitter(self) -> None:
+        for attempt in range(6):
+            ceiling = min(data.HTTP_RETRY_MAX_SECONDS, data.HTTP_RETRY_BASE_SECONDS * 2**attempt)
+            for _ in range(20):
+                delay = data._retry_delay(attempt)
+                self.assertGreaterEqual(delay, ceiling / 2)
+                self.assertLessEqual(delay, ceiling)
+
+    def test_downloads_from_api_stand_in(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir, FixtureAPIServer(_small_payloads()) as server:
+            repository = QuranRepository(
+                cache_path=Path(tmp_dir) / "cache.bin",
+                legacy_cache_path=Path(tmp_dir) / "cache.json",
+                api_base=server.base_url,
+            )
+            with redirect_stderr(io.StringIO()):
+                quran_data = repository.load(force_refresh=True)
+
+            self.assertEqual(sorted(server.requests), ["/chapters", "/quran/translations/85", "/quran/verses/uthmani"])
+            self.assertEqual([surah.name_english for surah in quran_data.surahs], ["Al-Fatihah", "Al-Baqarah"])
+            self.assertEqual(quran_data.surahs[0].ayahs[0].text_arabic, "بِسْمِ اللَّهِ")
+            self.assertEqual(quran_data.surahs[1].ayahs[0].text_english, "Alif Lam Mim")
+
+            cached = repository.load()
+            self.assertEqual(list(cached.ayahs_flat), list(quran_data.ayahs_flat))
+
+    def test_failed_fetch_retries_then_raises(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir, FixtureAPIServer({}) as server:
+            repository = QuranRepository(cache_path=Path(tmp_dir) / "cache.bin", api_base=server.base_url)
+            with patch.object(data.time, "sleep") as sleep, redirect_stderr(io.StringIO()):
+                with self.assertRaises(RuntimeError):
+                    repository._fetch_json(f"{server.base_url}/chapters", "chapters", dict, retries=3)
+            self.assertEqual(sleep.call_count, 2)
+            self.assertEqual(server.requests, ["/chapters"] * 3)
+
+    def test_injected_failures_are_retried(self) -> None:
+        for mode in ("error", "truncate"):
+            failures = {path: 1 for path in _small_payloads()}
+            with tempfile.TemporaryDirectory() as tmp_dir, FixtureAPIServer(
+                _small_payloads(), failures=failures, failure_mode=mode
+            ) as server:
+                repository = QuranRepository(cache_path=Path(tmp_dir) / "cache.bin", api_base=server.base_url)
+                with patch.object(data.time, "sleep"), redirect_stderr(io.StringIO()):
+                    quran_data = repository.load(force_refresh=True)
+                self.assertEqual(len(server.requests), 6, mode)
+                self.assertEqual(quran_data.surahs[1].ayahs[0].text_english, "Alif Lam Mim")
+
+
+class TranslationTests(unittest.TestCase):
+    def test_extra_translation_is_cached_and_opened_on_first_use(self) -> None:
+        payloads = _small_payloads()
+        payloads["/quran/translations/20"] = json.dumps(
+            {"translations": [{"text": "In the name of Allah"}, {"text": "All praise"}, {"text": "A.L.M."}]}
+        ).encode("utf-8")
+        with tempfile.TemporaryDirectory() as tmp_dir, FixtureAPIServer(payloads) as server:
+            repository = QuranRepository(cache_path=Path(tmp_dir) / "cache.bin", api_base=server.base_url)
+            with redirect_stderr(io.StringIO()):
+                quran_data = repository.load()
+                repository.download_translation(20, quran_data)
+            self.assertEqual(repository.installed_translations(), [85, 20])
+
+            reloaded = QuranRepository(cache_path=Path(tmp_dir) / "cache.bin").load()
+            store = reloaded.store
+            assert store is not None
+            self.assertEqual(store.loaded_translations, [85])
+            ayah = reloaded.surahs[1].ayahs[0]
+            self.assertEqual(ayah.translation(20), "A.L.M.")
+            self.assertEqual(store.loaded_translations, [85, 20])
+
+            store.select_translation(20)
+            self.assertEqual(ayah.text_english, "A.L.M.")
+            self.assertEqual(ayah.translation(85), "Alif Lam Mim")
+            with self.assertRaises(KeyError):
+                store.select_translation(131)
+
+
+class ConditionalRefreshTests(unittest.TestCase):
+    def _repository(self, tmp_dir: str, base_url: str) -> QuranRepository:
+        return QuranRepository(
+            cache_path=Path(tmp_dir) / "cache.bin",
+            legacy_cache_path=Path(tmp_dir) / "cache.json",
+            api_base=base_url,
+        )
+
+    def test_unchanged_payloads_are_not_rebuilt(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir, FixtureAPIServer(_small_payloads()) as server:
+            repository = self._repository(tmp_dir, server.base_url)
+            with redirect_stderr(io.StringIO()):
+                repository.load()
+                cache_stat = repository.cache_path.stat()
+                server.statuses.clear()
+                refreshed = repository.load(force_refresh=True)
+
+            self.assertEqual(sorted(status for _, status in server.statuses), [304, 304, 304])
+            self.assertEqual(repository.cache_path.stat().st_mtime_ns, cache_stat.st_mtime_ns)
+            self.assertEqual(refreshed.surahs[1].ayahs[0].text_english, "Alif Lam Mim")
+
+    def test_only_changed_payload_is_rebuilt(self) -> None:
+        payloads = _small_payloads()
+        with tempfile.TemporaryDirectory() as tmp_dir, FixtureAPIServer(payloads) as server:
+            repository = self._repository(tmp_dir, server.base_url)
+            with redirect_stderr(io.StringIO()):
+                repository.load()
+                payloads["/quran/translations/85"] = payloads["/quran/translations/85"].replace(b"Alif", b"Alif!")
+                server.statuses.clear()
+                refreshed = repository.load(force_refresh=True)
+
+            self.assertEqual(
+                dict(server.statuses),
+                {"/chapters": 304, "/quran/verses/uthmani": 304, "/quran/translations/85": 200},
+            )
+            self.assertEqual(refreshed.surahs[1].ayahs[0].text_english, "Alif! Lam Mim")
+            self.assertEqual(refreshed.surahs[0].ayahs[1].text_arabic, "الْحَمْدُ لِلَّهِ")
+            self.assertEqual(repository.load().surahs[1].ayahs[0].text_english, "Alif! Lam Mim")
+
+    def test_content_hash_detects_unchanged_payload_without_etags(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir, FixtureAPIServer(_small_payloads(), etags=False) as server:
+            repository = self._repository(tmp_dir, server.base_url)
+            with redirect_stderr(io.StringIO()):
+                repository.load()
+                cache_stat = repository.cache_path.stat()
+                server.statuses.clear()
+                repository.load(force_refresh=True)
+
+            self.assertEqual(sorted(status for _, status in server.statuses), [200, 200, 200])
+            self.assertEqual(repository.cache_path.stat().st_mtime_ns, cache_stat.st_mtime_ns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import unittest
+
+from benchmarks.fixtures import synthetic_corpus
+from quran_tui.models import Ayah, AyahStore, QuranData, SurahInfo
+from quran_tui.references import HIZB_STARTS, JUZ_STARTS
+
+
+def _surah_table() -> list[SurahInfo]:
+    return [
+        SurahInfo(number=1, name_arabic="الفاتحة", name_english="Al-Fatihah", bismillah_pre=False, first_ayah=0, ayah_count=7),
+        SurahInfo(number=2, name_arabic="البقرة", name_english="Al-Baqarah", bismillah_pre=True, first_ayah=7, ayah_count=3),
+        SurahInfo(number=3, name_arabic="آل عمران", name_english="Ali 'Imran", bismillah_pre=True, first_ayah=10, ayah_count=2),
+    ]
+
+
+class LazyQuranDataTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = _surah_table()
+        self.loaded: list[int] = []
+
+    def _loader(self, surah_index: int) -> list[Ayah]:
+        self.loaded.append(surah_index)
+        info = self.table[surah_index]
+        return [
+            Ayah(
+                surah_number=info.number,
+                surah_name_arabic=info.name_arabic,
+                surah_name_english=info.name_english,
+                ayah_number=number,
+                text_arabic=f"ar {info.number}:{number}",
+                text_english=f"en {info.number}:{number}",
+            )
+            for number in range(1, info.ayah_count + 1)
+        ]
+
+    def test_surahs_are_built_on_first_access(self) -> None:
+        quran_data = QuranData.lazy(self.table, self._loader)
+        self.assertEqual([surah.name_english for surah in quran_data.surahs], ["Al-Fatihah", "Al-Baqarah", "Ali 'Imran"])
+        self.assertEqual(self.loaded, [])
+
+        self.assertEqual(len(quran_data.surahs[0].ayahs), 7)
+        self.assertEqual(len(quran_data.surahs[0].ayahs), 7)
+        self.assertEqual(self.loaded, [0])
+        self.assertFalse(quran_data.surahs[1].is_loaded)
+
+    def test_flat_view_indexes_across_surahs(self) -> None:
+        quran_data = QuranData.lazy(self.table, self._loader)
+        self.assertEqual(len(quran_data.ayahs_flat), 12)
+        self.assertEqual(quran_data.ayahs_flat[8].text_english, "en 2:2")
+        self.assertEqual(quran_data.ayahs_flat[-1].text_english, "en 3:2")
+        self.assertEqual(self.loaded, [1, 2])
+        self.assertEqual([ayah.ayah_number for ayah in quran_data.ayahs_flat[6:8]], [7, 1])
+        self.assertEqual(len(list(quran_data.ayahs_flat)), 12)
+
+    def test_memory_budget_evicts_least_recently_used(self) -> None:
+        probe = QuranData.lazy(self.table, self._loader)
+        probe.surahs[0].ayahs
+        budget = probe.loaded_bytes + 1
+
+        quran_data = QuranData.lazy(self.table, self._loader, memory_budget=budget)
+        quran_data.surahs[0].ayahs
+        quran_data.surahs[1].ayahs
+        self.assertFalse(quran_data.surahs[0].is_loaded)
+        self.assertTrue(quran_data.surahs[1].is_loaded)
+        self.assertLessEqual(quran_data.loaded_bytes, budget)
+
+        self.assertEqual(quran_data.surahs[0].ayahs[0].text_english, "en 1:1")
+
+
+class ReferenceTests(unittest.TestCase):
+    def test_resolves_references_without_building_surahs(self) -> None:
+        # Surah 2 holds only ayahs 1, 255 and 256: ayah numbers need not be contiguous.
+        ayah_numbers = [*range(1, 8), 1, 255, 256, 1, 2]
+        rows = [(f"ar {index}", f"en {index}") for index in range(len(ayah_numbers))]
+        quran_data = QuranData.from_store(AyahStore.from_rows(_surah_table(), ayah_numbers, rows))
+
+        self.assertEqual(quran_data.index_of(2, 255), 8)
+        self.assertEqual(len(quran_data.resolve("2:255-256")), 2)
+        self.assertEqual(quran_data.resolve(" 2:256 - 3:2 ").label, "2:256-3:2")
+        self.assertEqual((quran_data.resolve("3").start, quran_data.resolve("3").stop), (10, 12))
+        self.assertEqual(quran_data.references.position(8), (1, 1))
+        self.assertFalse(any(surah.is_loaded for surah in quran_data.surahs))
+
+        for reference, message in (
+            ("2:2", "Surah 2 has no ayah 2."),
+            ("2:256-1", "2:1 comes before 2:256."),
+            ("4", "There is no surah 4; surahs are 1 to 3."),
+            ("page 1", "Page numbers are not available for this copy of the Quran."),
+            ("al-baqarah", "Try 2, 2:255, 2:255-260, juz 30 or hizb 60."),
+        ):
+            with self.subTest(reference=reference):
+                with self.assertRaisesRegex(ValueError, message):
+                    quran_data.resolve(reference)
+
+    def test_juz_and_hizb_tables_cover_the_quran_in_order(self) -> None:
+        surahs, ayah_numbers, rows = synthetic_corpus()
+        quran_data = QuranData.from_store(AyahStore.from_rows(surahs, ayah_numbers, rows))
+        self.assertEqual((len(JUZ_STARTS), len(HIZB_STARTS)), (30, 60))
+
+        juz = [quran_data.resolve(f"juz {number}") for number in range(1, 31)]
+        self.assertEqual([part.start for part in juz], sorted({part.start for part in juz}))
+        self.assertEqual(sum(len(part) for part in juz), 6236)
+        self.assertEqual((len(juz[0]), len(juz[-1])), (148, 564))
+        hizb = quran_data.resolve("Hizb 60")
+        self.assertEqual((hizb.start, hizb.stop), (quran_data.index_of(87, 1), 6236))
+
+
+class AyahStoreTests(unittest.TestCase):
+    def test_views_read_shared_columns(self) -> None:
+        table = _surah_table()
+        rows = [(f"ar {index}", f"en {index}") for index in range(12)]
+        numbers = list(range(1, 8)) + [1, 2, 3, 1, 2]
+        store = AyahStore.from_rows(table, numbers, rows)
+
+        ayah = store.ayah(8)
+        self.assertEqual((ayah.surah_number, ayah.ayah_number), (2, 2))
+        self.assertEqual(ayah.surah_name_english, "Al-Baqarah")
+        self.assertEqual(ayah.text_english, "en 8")
+        self.assertIs(store.surah_info(8), store.surah_info(9))
+        self.assertEqual(store.ayah(8), store.ayah(8))
+
+        quran_data = QuranData.from_store(store)
+        self.assertEqual(quran_data.surahs[2].ayahs[1].text_arabic, "ar 11")
+        self.assertEqual(quran_data.ayahs_flat[8], ayah)
+
+    def test_standalone_ayah_compares_by_value(self) -> None:
+        fields = dict(
+            surah_number=1,
+            surah_name_arabic="الفاتحة",
+            surah_name_english="Al-Fatihah",
+            ayah_number=1,
+            text_arabic="بِسْمِ اللَّهِ",
+            text_english="In the name of Allah.",
+        )
+        self.assertEqual(Ayah(**fields), Ayah(**fields))
+        self.assertEqual(hash(Ayah(**fields)), hash(Ayah(**fields)))
+        self.assertEqual(Ayah(**fields).surah_name_arabic, "الفاتحة")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
-from quran_tui.models import Ayah
-from quran_tui.search import QuranSearchEngine
+from benchmarks.fixtures import synthetic_corpus
+from quran_tui import search
+from quran_tui.models import Ayah, AyahStore, QuranData, SurahInfo
+from quran_tui.result_cache import ResultCache
+from quran_tui.query import Near, Not, Term, parse
+from quran_tui.scoring import MAX_SCORE, available_backends, fuzz, get_backend
+from quran_tui.search import QuranSearchEngine, SearchArtifacts, _build_preview, match_snippet
+from quran_tui.search_index import search_index_key, write_search_index
+from quran_tui.search_pool import SearchPool
 
 
 def _sample_ayahs() -> list[Ayah]:
@@ -35,6 +45,26 @@ def _sample_ayahs() -> list[Ayah]:
     ]
 
 
+def _uthmani_ayahs() -> list[Ayah]:
+    texts = [
+        "بِسْمِ ٱللَّهِ ٱلرَّحْمَٰنِ ٱلرَّحِيمِ",
+        "ٱلْحَمْدُ لِلَّهِ رَبِّ ٱلْعَٰلَمِينَ",
+        "ٱلرَّحْمَٰنِ ٱلرَّحِيمِ",
+        "ذَٰلِكَ ٱلْكِتَٰبُ لَا رَيْبَ ۛ فِيهِ ۛ هُدًى لِّلْمُتَّقِينَ",
+    ]
+    return [
+        Ayah(
+            surah_number=1 if index < 3 else 2,
+            surah_name_arabic="",
+            surah_name_english="",
+            ayah_number=index + 1 if index < 3 else 2,
+            text_arabic=text,
+            text_english="",
+        )
+        for index, text in enumerate(texts)
+    ]
+
+
 class QuranSearchEngineTests(unittest.TestCase):
     def test_search_finds_english_text(self) -> None:
         engine = QuranSearchEngine(_sample_ayahs())
@@ -49,10 +79,337 @@ class QuranSearchEngineTests(unittest.TestCase):
         self.assertTrue(results)
         self.assertTrue(any(item.ayah.ayah_number == 2 for item in results))
 
+    def test_extended_query_reuses_previous_candidates(self) -> None:
+        engine = QuranSearchEngine(_sample_ayahs(), candidate_limit=1)
+        first = engine.run("merc", limit=1)
+        self.assertEqual(first.candidates, [0])
+
+        refined = engine.run("merciful", limit=1, previous=first)
+        self.assertIs(refined.candidates, first.candidates)
+        self.assertEqual(refined.results[0].ayah.ayah_number, 1)
+        # A query that does not extend the previous one asks the index again.
+        self.assertEqual(engine.run("lord", limit=1, previous=refined).candidates, [1])
+
+    def test_unvocalized_arabic_query_matches_uthmani_text(self) -> None:
+        ayahs = _uthmani_ayahs()
+        engine = QuranSearchEngine(ayahs, candidate_limit=1)
+        expected = {"الحمد لله": 1, "رب العالمين": 1, "الْحَمْدُ لِلَّهِ": 1, "الرحمن الرحيم": 2, "ذلك الكتاب": 3}
+        for query, index in expected.items():
+            with self.subTest(query=query):
+                results = engine.search(query, limit=1)
+                self.assertTrue(results)
+                self.assertIs(results[0].ayah, ayahs[index])
+
+    def test_engine_over_lazy_data_builds_no_surahs(self) -> None:
+        ayahs = _sample_ayahs()
+        surahs = [
+            SurahInfo(number=1, name_arabic="الفاتحة", name_english="Al-Fatihah", bismillah_pre=False, first_ayah=0, ayah_count=2),
+            SurahInfo(number=2, name_arabic="البقرة", name_english="Al-Baqarah", bismillah_pre=True, first_ayah=2, ayah_count=1),
+        ]
+        rows = [(ayah.text_arabic, ayah.text_english) for ayah in ayahs]
+        quran_data = QuranData.from_store(AyahStore.from_rows(surahs, [1, 2, 255], rows))
+        results = QuranSearchEngine(quran_data.ayahs_flat).search("allah")
+        self.assertEqual(results, QuranSearchEngine(ayahs).search("allah"))
+        self.assertFalse(any(surah.is_loaded for surah in quran_data.surahs))
+
     def test_search_empty_query_returns_no_results(self) -> None:
         engine = QuranSearchEngine(_sample_ayahs())
         self.assertEqual(engine.search(""), [])
 
+    def test_token_index_prunes_candidates_and_falls_back(self) -> None:
+        engine = QuranSearchEngine(_sample_ayahs(), candidate_limit=1)
+
+        def candidates(query: str, limit: int) -> list[int] | None:
+            return engine._candidates(engine._query_forms(query), limit)
+
+        self.assertEqual(candidates("merciful", 1), [0])
+        self.assertEqual(candidates("lord of all", 1), [1])
+        # Unknown words (typos) and too few candidates mean a full scan.
+        self.assertIsNone(candidates("mercyful", 1))
+        self.assertIsNone(candidates("merciful", 2))
+
+        results = engine.search("merci", limit=1)
+        self.assertEqual((results[0].ayah.surah_number, results[0].ayah.ayah_number), (1, 1))
+
+    def test_pruned_top_results_score_like_a_full_scan(self) -> None:
+        surahs, ayah_numbers, rows = synthetic_corpus()
+        ayahs = QuranData.from_store(AyahStore.from_rows(surahs, ayah_numbers, rows)).ayahs_flat
+        full_scan = QuranSearchEngine(ayahs, candidate_limit=None)
+        engine = QuranSearchEngine(ayahs, artifacts=full_scan.artifacts)
+        pruned = 0
+        for query in ("merciful", "lord of the worlds", "charity to orphans", "those who believe", "gardens flowing"):
+            with self.subTest(query=query):
+                run = engine.run(query, 25)
+                if run.candidates is not None:
+                    # The index had more candidates than it hands on.
+                    self.assertEqual(len(run.candidates), engine.candidate_limit)
+                    pruned += 1
+                expected = full_scan.search(query, 25)
+                self.assertEqual([result.score for result in run.results], [result.score for result in expected])
+        self.assertGreater(pruned, 0)
+
+    def test_every_ayah_containing_the_query_is_ranked(self) -> None:
+        ayahs = [
+            Ayah(
+                surah_number=1,
+                surah_name_arabic="",
+                surah_name_english="",
+                ayah_number=number,
+                text_arabic="",
+                text_english=text,
+            )
+            for number, text in enumerate(("mercifully merciful", "Merciful", "Lord of the worlds."), 1)
+        ]
+        engine = QuranSearchEngine(ayahs, candidate_limit=1)
+        forms = engine._query_forms("merciful")
+        # BM25 prefers the first ayah; the fuzzy scorer the second.
+        self.assertEqual(engine._candidates(forms, 1, []), [0])
+        self.assertEqual(engine._containing(forms), [0, 1])
+        self.assertIsNone(engine._candidates(forms, 1, [0, 1]))
+        full_scan = QuranSearchEngine(ayahs, candidate_limit=None)
+        self.assertEqual(engine.search("merciful", limit=1), full_scan.search("merciful", limit=1))
+        self.assertEqual(engine.search("merciful", limit=1)[0].ayah.ayah_number, 2)
+
+    def test_cursor_pages_through_every_result_once(self) -> None:
+        ayahs = _sample_ayahs()
+        full_scan = QuranSearchEngine(ayahs, candidate_limit=None)
+        for query in ("merciful lord", "allah", "allah OR merciful"):
+            with self.subTest(query=query):
+                cursor = full_scan.cursor(query, page_size=1)
+                self.assertEqual(list(cursor), full_scan.search(query, limit=len(ayahs)))
+                self.assertTrue(cursor.exhausted)
+
+        # A pruned engine pages through the same ranking as a full scan.
+        engine = QuranSearchEngine(ayahs, candidate_limit=1)
+        first = engine.run("merciful", 1)
+        self.assertEqual(first.candidates, [0])
+        with self.assertRaises(ValueError):
+            engine.cursor("merciful", page_size=1, first=first)
+        cursor = engine.cursor("merciful", page_size=1)
+        pages = [cursor.next_page() for _ in range(len(ayahs))]
+        everything = [result for page in pages for result in page]
+        self.assertEqual(everything, full_scan.search("merciful", limit=len(ayahs)))
+        scores = [result.score for result in everything]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(cursor.taken, len(everything))
+        self.assertEqual(cursor.next_page(), [])
+
+        # A full scan run stands in for the first page.
+        first = full_scan.run("allah", 1)
+        cursor = full_scan.cursor("allah", page_size=1, first=first)
+        everything = [*first.results, *cursor]
+        self.assertEqual(everything, full_scan.search("allah", limit=len(ayahs)))
+        scores = [result.score for result in everything]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_bm25_ranking_sums_term_weights(self) -> None:
+        engine = QuranSearchEngine(_sample_ayahs(), ranking="bm25")
+        results = engine.search("merciful lord")
+        self.assertEqual([result.ayah.ayah_number for result in results], [1, 2])
+        self.assertEqual(results[0].score, MAX_SCORE)
+        # Only words of the corpus count, or the words a partial one begins.
+        self.assertEqual([result.ayah.ayah_number for result in engine.search("merci")], [1])
+        self.assertEqual(engine.search("mercyful"), [])
+
+        for query in ("merciful lord", "الله", "allah -merciful"):
+            with self.subTest(query=query):
+                expected = engine.search(query)
+                with patch.object(search, "numpy", None):
+                    fallback = QuranSearchEngine(_sample_ayahs(), artifacts=engine.artifacts, ranking="bm25")
+                    self.assertEqual(fallback.search(query), expected)
+        with self.assertRaises(ValueError):
+            QuranSearchEngine(_sample_ayahs(), ranking="tfidf")
+
+    def test_bm25_ranking_keeps_every_ayah_sharing_a_term(self) -> None:
+        texts = ("Merciful, forgiving.", "He is forgiving to those who believe and do good deeds at night and by day.")
+        ayahs = [
+            Ayah(
+                surah_number=1,
+                surah_name_arabic="",
+                surah_name_english="",
+                ayah_number=number,
+                text_arabic="",
+                text_english=text,
+            )
+            for number, text in enumerate(texts, 1)
+        ]
+        engine = QuranSearchEngine(ayahs, ranking="bm25")
+        with patch.object(engine, "_bm25_row", wraps=engine._bm25_row) as bm25_row:
+            results = engine.search("merciful forgiving")
+        bm25_row.assert_called_once()
+        # Far below MIN_SCORE of the best ayah's weight, but a match all the same.
+        self.assertEqual([result.ayah.ayah_number for result in results], [1, 2])
+        self.assertLess(results[1].score, search.MIN_SCORE)
+
+    def test_positional_index_and_term_weights_are_built_on_first_use(self) -> None:
+        with patch.object(search, "_positional_index", wraps=search._positional_index) as positional_index:
+            engine = QuranSearchEngine(_sample_ayahs())
+            engine.search("merciful lord")
+            positional_index.assert_not_called()
+            engine.search('"lord of all"')
+            QuranSearchEngine(_sample_ayahs(), artifacts=engine.artifacts, ranking="bm25").search("lord")
+            positional_index.assert_called_once()
+
+    def test_match_snippet_marks_matches_and_follows_them_past_the_cut(self) -> None:
+        text = 2 * "Allah! There is no god worthy of worship except Him, the Ever-Living, All-Sustaining. " + "Merciful."
+
+        def marked(query: str) -> tuple[str, list[str]]:
+            snippet = match_snippet(text, query)
+            return snippet.text, [snippet.text[start:end] for start, end in snippet.spans]
+
+        preview, words = marked("worship god")
+        self.assertEqual(preview, _build_preview(text))
+        self.assertEqual(words[:2], ["god", "worship"])
+        preview, words = marked("merciful")
+        self.assertTrue(preview.startswith("...") and preview.endswith("Merciful."))
+        self.assertEqual(words, ["Merciful"])
+        self.assertLessEqual(len(preview), 110)
+        # Prefixes match as in the index, phrases by their words; typos align with rapidfuzz.
+        self.assertEqual(marked('"ever-living" OR excep')[1][:2], ["except", "Ever-Living"])
+        if fuzz is not None:
+            self.assertEqual(marked("mercyful")[1], ["Merciful"])
+            snippet = match_snippet('They said, "Forgiving, Merciful!" and left.', "forgivng mercifull")
+            self.assertEqual([snippet.text[start:end] for start, end in snippet.spans], ["Forgiving, Merciful"])
+        self.assertEqual(marked("الله")[1], [])
+
+    def test_trigram_index_finds_exact_substrings(self) -> None:
+        engine = QuranSearchEngine(_sample_ayahs())
+        for query in ("ntirely merc", "allah, lord of", "living, all-sus", "لله رب", "no gods"):
+            with self.subTest(query=query):
+                forms = engine._query_forms(query)
+                expected = [
+                    index
+                    for index in range(len(engine.ayahs))
+                    if any(query_text in column[index] for query_text, column in forms)
+                ]
+                self.assertEqual(engine._containing(forms), expected)
+        # Words shorter than a trigram cannot be looked up.
+        self.assertIsNone(engine._containing(engine._query_forms("is no")))
+
+    def test_batch_backends_match_pairwise_scoring(self) -> None:
+        expected = QuranSearchEngine(_sample_ayahs(), backend="rapidfuzz").search("lord of worlds")
+        for name in available_backends():
+            if name == "difflib":
+                continue
+            with self.subTest(backend=name):
+                results = QuranSearchEngine(_sample_ayahs(), backend=name).search("lord of worlds")
+                self.assertEqual(
+                    [(item.ayah.ayah_number, item.score) for item in results],
+                    [(item.ayah.ayah_number, item.score) for item in expected],
+                )
+
+        results = QuranSearchEngine(_sample_ayahs(), backend="difflib").search("merciful")
+        self.assertEqual(results[0].ayah.ayah_number, 1)
+
+    def test_backend_top_keeps_best_k_with_lower_positions_on_ties(self) -> None:
+        choices = ["lord of the worlds", "mercy", "lord of worlds", "lord of the worlds", "lord"]
+        for name in available_backends():
+            with self.subTest(backend=name):
+                backend = get_backend(name)
+                ranked = sorted(backend.scores("lord of the worlds", choices, 0), key=lambda item: (-item[1], item[0]))
+                top = sorted(backend.top("lord of the worlds", choices, 3, 0), key=lambda item: (-item[1], item[0]))
+                self.assertEqual(top, ranked[:3])
+                self.assertEqual(sorted(backend.top("lord of the worlds", choices, 5, 100)), [(0, 100.0), (3, 100.0)])
+
+
+class QuerySyntaxTests(unittest.TestCase):
+    def test_parse_recognizes_operators_and_tolerates_unfinished_input(self) -> None:
+        self.assertIsNone(parse("lord and mercy or not"))
+        self.assertIsNone(parse("well-known - words"))
+        self.assertEqual(
+            parse('"lord of the worlds" -mercy').parts,
+            (Term(("lord", "of", "the", "worlds"), phrase=True), Not(Term(("mercy",)))),
+        )
+        self.assertEqual(parse("patience NEAR/2 prayer"), Near(Term(("patience",)), Term(("prayer",)), 2))
+        self.assertEqual(parse('(patience OR "open'), parse('patience OR "open"'))
+        self.assertEqual(parse("mercy OR"), Term(("mercy",)))
+
+    def test_queries_match_phrases_boolean_and_proximity(self) -> None:
+        engine = QuranSearchEngine(_sample_ayahs())
+
+        def matches(query: str) -> list[int]:
+            return sorted(result.ayah.ayah_number for result in engine.search(query))
+
+        self.assertEqual(matches('"lord of all worlds"'), [2])
+        self.assertEqual(matches('"lord of worlds"'), [])
+        self.assertEqual(matches("allah -merciful"), [2, 255])
+        self.assertEqual(matches("merciful OR worship"), [1, 255])
+        self.assertEqual(matches("(merciful OR worship) NOT god"), [1])
+        self.assertEqual(matches("allah NEAR/1 lord"), [2])
+        self.assertEqual(matches("praise NEAR/2 lord"), [])
+        self.assertEqual(matches("praise NEAR lord"), [2])
+        self.assertEqual(matches('"رب العالمين"'), [2])
+        self.assertEqual(matches("الله NEAR/2 الحي"), [])
+        self.assertEqual(matches("الله NEAR الحي"), [255])
+        # The fuzzy scorer only ranks the matches.
+        scores = [result.score for result in engine.search("merciful OR worship")]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+
+class ResultCacheTests(unittest.TestCase):
+    def test_engine_serves_repeated_queries_from_cache(self) -> None:
+        engine = QuranSearchEngine(_sample_ayahs())
+        first = engine.search("Merciful")
+        again = engine.search("  merciful ")
+        self.assertEqual(again, first)
+        self.assertEqual((engine.result_cache.hits, engine.result_cache.misses), (1, 1))
+
+        engine.search("merciful", limit=1)
+        self.assertEqual(engine.result_cache.misses, 2)
+
+    def test_evicts_least_recently_used_by_count_and_bytes(self) -> None:
+        cache = ResultCache(max_entries=2)
+        for query in ("a", "b", "c"):
+            cache.put((query, 25, "difflib"), [(0, 90.0)], None)
+        self.assertIsNone(cache.get(("a", 25, "difflib")))
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+
+        cache = ResultCache(max_bytes=1000)
+        cache.put(("big", 25, "difflib"), [(0, 90.0)], range(1000))
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+        cache.put(("small", 25, "difflib"), [(0, 90.0)], None)
+        self.assertLessEqual(cache.nbytes, 1000)
+
+    def test_saved_entries_only_load_for_the_same_tag(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "search-cache.json"
+            cache = ResultCache()
+            cache.put(("merciful", 25, "difflib"), [(0, 95.0), (2, 60.0)], [0, 2])
+            cache.save(path, "corpus-a|85")
+
+            restored = ResultCache()
+            restored.load(path, "corpus-a|85")
+            self.assertEqual(restored.get(("merciful", 25, "difflib")), ([(0, 95.0), (2, 60.0)], [0, 2]))
+
+            stale = ResultCache()
+            stale.load(path, "corpus-a|20")
+            self.assertEqual(len(stale), 0)
+
+
+class SearchPoolTests(unittest.TestCase):
+    def test_sharded_scan_matches_in_process_search(self) -> None:
+        ayahs = _sample_ayahs() * 4
+        artifacts = SearchArtifacts.build(ayahs)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "search-index.bin"
+            write_search_index(path, artifacts, search_index_key("abc"))
+            with SearchPool(path, search_index_key("abc"), 2, min_shard=3) as pool:
+                self.assertTrue(pool.warm())
+                self.assertEqual((pool.shards(2), pool.shards(12)), (0, 2))
+                for query in ("merciful", "lord of all", "الحمد لله"):
+                    for limit in (1, 5):
+                        with self.subTest(query=query, limit=limit):
+                            self.assertEqual(
+                                QuranSearchEngine(ayahs, artifacts=artifacts, candidate_limit=None, pool=pool).search(
+                                    query, limit
+                                ),
+                                QuranSearchEngine(ayahs, artifacts=artifacts, candidate_limit=None).search(query, limit),
+                            )
+
+            with SearchPool(path, search_index_key("changed"), 1) as stale:
+                self.assertFalse(stale.warm())
+                self.assertIsNone(stale.scores("extract", "normalized_english", "merciful", range(12), 0.0))
+
 
 if __name__ == "__main__":
     unittest.main()
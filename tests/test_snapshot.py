@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from quran_tui.models import AyahStore, QuranData, SurahInfo
+from quran_tui.search import QuranSearchEngine, SearchArtifacts
+from quran_tui.search_index import open_search_index, search_index_key, write_search_index
+from quran_tui.snapshot import load_snapshot, snapshot_key, write_snapshot
+
+
+def _sample_data() -> QuranData:
+    surahs = [
+        SurahInfo(number=1, name_arabic="الفاتحة", name_english="Al-Fatihah", bismillah_pre=False, first_ayah=0, ayah_count=2),
+        SurahInfo(number=2, name_arabic="البقرة", name_english="Al-Baqarah", bismillah_pre=True, first_ayah=2, ayah_count=1),
+    ]
+    rows = [
+        ("بِسْمِ اللَّهِ الرَّحْمَٰنِ الرَّحِيمِ", "In the name of Allah, The Entirely Merciful."),
+        ("الْحَمْدُ لِلَّهِ رَبِّ الْعَالَمِينَ", "All praise is for Allah, Lord of all worlds."),
+        ("اللَّهُ لَا إِلَٰهَ إِلَّا هُوَ", "Allah! There is no god except Him."),
+    ]
+    return QuranData.from_store(AyahStore.from_rows(surahs, [1, 2, 255], rows))
+
+
+class SnapshotTests(unittest.TestCase):
+    def test_round_trip_restores_corpus(self) -> None:
+        quran_data = _sample_data()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "snapshot.bin"
+            write_snapshot(path, quran_data, snapshot_key("abc"))
+
+            snapshot = load_snapshot(path, snapshot_key("abc"))
+            assert snapshot is not None
+            self.assertEqual(list(snapshot.quran_data.ayahs_flat), list(quran_data.ayahs_flat))
+            self.assertEqual(snapshot.quran_data.surahs[1].ayahs[0].ayah_number, 255)
+
+    def test_stale_or_corrupt_snapshot_is_ignored(self) -> None:
+        quran_data = _sample_data()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "snapshot.bin"
+            self.assertIsNone(load_snapshot(path, snapshot_key("abc")))
+
+            write_snapshot(path, quran_data, snapshot_key("abc"))
+            self.assertIsNone(load_snapshot(path, snapshot_key("changed")))
+
+            path.write_bytes(path.read_bytes()[:40])
+            self.assertIsNone(load_snapshot(path, snapshot_key("abc")))
+
+
+class SearchIndexTests(unittest.TestCase):
+    def test_mapped_index_searches_like_the_built_one(self) -> None:
+        ayahs = _sample_data().ayahs_flat
+        artifacts = SearchArtifacts.build(ayahs)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "search-index.bin"
+            write_search_index(path, artifacts, search_index_key("abc"))
+
+            mapped = open_search_index(path, search_index_key("abc"))
+            assert mapped is not None
+            self.assertEqual(list(mapped.vocabulary), artifacts.vocabulary)
+            self.assertEqual([bytes(postings) for postings in mapped.postings], artifacts.postings)
+            self.assertEqual(bytes(mapped.token_counts), artifacts.token_counts)
+            self.assertEqual([bytes(weights) for weights in mapped.term_weights], list(artifacts.term_weights))
+            for ranking in ("fuzzy", "bm25"):
+                for query in ("merciful", "lord of all", "الحمد لله", '"lord of all" -merciful'):
+                    with self.subTest(ranking=ranking, query=query):
+                        self.assertEqual(
+                            QuranSearchEngine(ayahs, artifacts=mapped, ranking=ranking).search(query),
+                            QuranSearchEngine(ayahs, artifacts=artifacts, ranking=ranking).search(query),
+                        )
+
+    def test_stale_or_corrupt_index_is_ignored(self) -> None:
+        artifacts = SearchArtifacts.build(_sample_data().ayahs_flat)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "search-index.bin"
+            self.assertIsNone(open_search_index(path, search_index_key("abc")))
+
+            write_search_index(path, artifacts, search_index_key("abc"))
+            self.assertIsNone(open_search_index(path, search_index_key("changed")))
+
+            path.write_bytes(path.read_bytes()[:-20])
+            self.assertIsNone(open_search_index(path, search_index_key("abc")))
+
+
+if __name__ == "__main__":
+    unittest.main()
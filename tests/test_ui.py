@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from concurrent.futures import Future
+from contextlib import ExitStack
+from pathlib import Path
+
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+
+from quran_tui.models import AyahStore, QuranData, SurahInfo, TextColumn
+from quran_tui.search import QuranSearchEngine
+from quran_tui.state import ReadingStateStore
+from quran_tui.ui import QuranTUIApplication
+
+
+def _sample_data() -> QuranData:
+    surahs = [
+        SurahInfo(number=1, name_arabic="الفاتحة", name_english="Al-Fatihah", bismillah_pre=False, first_ayah=0, ayah_count=2),
+        SurahInfo(number=2, name_arabic="البقرة", name_english="Al-Baqarah", bismillah_pre=True, first_ayah=2, ayah_count=1),
+    ]
+    rows = [
+        ("بِسْمِ اللَّهِ الرَّحْمَٰنِ الرَّحِيمِ", "In the name of Allah, the Merciful."),
+        ("الْحَمْدُ لِلَّهِ رَبِّ الْعَالَمِينَ", "All praise is for Allah, Lord of all worlds."),
+        ("الم", "Alif Lam Mim."),
+    ]
+    return QuranData.from_store(AyahStore.from_rows(surahs, [1, 2, 1], rows))
+
+
+def _settle(app: QuranTUIApplication) -> None:
+    """Wait for background work, including the callbacks that publish it."""
+    if app._executor is not None:
+        app._executor.shutdown(wait=True)
+        app._executor = None
+
+
+class _AppTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp_dir.cleanup)
+        stack = ExitStack()
+        self.addCleanup(stack.close)
+        pipe_input = stack.enter_context(create_pipe_input())
+        stack.enter_context(create_app_session(input=pipe_input, output=DummyOutput()))
+
+    def _app(self, search_engine, text_ready=None, quran_data=None, translations=()) -> QuranTUIApplication:
+        return QuranTUIApplication(
+            quran_data=quran_data if quran_data is not None else _sample_data(),
+            search_engine=search_engine,
+            state_store=ReadingStateStore(state_path=Path(self._tmp_dir.name) / "state.json"),
+            text_ready=text_ready,
+            translations=translations,
+        )
+
+
+class BackgroundLoadingTests(_AppTestCase):
+    def test_reader_shows_loading_until_text_is_ready(self) -> None:
+        text_ready: Future[object] = Future()
+        app = self._app(QuranSearchEngine([]), text_ready)
+        rendered = "".join(text for _, text in app._render_main())
+        self.assertIn("Loading verses", rendered)
+        self.assertIn("Al-Fatihah", "".join(text for _, text in app._render_surahs()))
+
+        text_ready.set_result(None)
+        rendered = "".join(text for _, text in app._render_main())
+        self.assertIn("In the name of Allah", rendered)
+
+    def test_search_waits_for_engine_then_runs_queued_query(self) -> None:
+        pending: Future[QuranSearchEngine] = Future()
+        app = self._app(pending)
+        app._run_search("merciful")
+        self.assertEqual(app.mode, "browse")
+        self.assertIn("loading", app.message)
+
+        pending.set_result(QuranSearchEngine(_sample_data().ayahs_flat))
+        _settle(app)
+        self.assertEqual(app.mode, "search")
+        self.assertEqual(app.search_results[0].ayah.ayah_number, 1)
+
+    def test_superseded_engine_is_not_installed(self) -> None:
+        first: Future[QuranSearchEngine] = Future()
+        app = self._app(first)
+        second: Future[QuranSearchEngine] = Future()
+        app._set_pending_search(second)
+        first.set_result(QuranSearchEngine([]))
+        self.assertIsNone(app.search_engine)
+
+        engine = QuranSearchEngine(_sample_data().ayahs_flat)
+        second.set_result(engine)
+        self.assertIs(app.search_engine, engine)
+
+    def test_failed_engine_reports_error(self) -> None:
+        pending: Future[QuranSearchEngine] = Future()
+        app = self._app(pending)
+        pending.set_exception(RuntimeError("boom"))
+        app._run_search("merciful")
+        self.assertEqual(app.message, "Search unavailable: boom")
+
+
+class SearchAsYouTypeTests(_AppTestCase):
+    def _type(self, app: QuranTUIApplication, text: str) -> None:
+        # Without a running loop there is no debounce timer; fire it by hand.
+        app.prompt_input.text = text
+        app._search_as_you_type()
+
+    def test_typing_shows_results_for_latest_query_only(self) -> None:
+        app = self._app(QuranSearchEngine(_sample_data().ayahs_flat))
+        app.prompt_visible = True
+        app.prompt_kind = "search"
+        self._type(app, "merciful")
+        self._type(app, "lord of all")
+        _settle(app)
+
+        self.assertTrue(app.prompt_visible)
+        self.assertEqual(app.mode, "search")
+        self.assertEqual(app.last_query, "lord of all")
+        self.assertEqual(app.search_results[0].ayah.ayah_number, 2)
+
+    def test_keystroke_cancels_queued_search(self) -> None:
+        app = self._app(QuranSearchEngine(_sample_data().ayahs_flat))
+        app.prompt_visible = True
+        app.prompt_kind = "search"
+        blocker: Future[None] = Future()
+        app._background().submit(blocker.result, 5)
+        self._type(app, "merciful")
+        queued = app._search_job
+        app.prompt_input.text = "merciful lord"
+
+        assert queued is not None
+        self.assertTrue(queued.cancelled())
+        blocker.set_result(None)
+        _settle(app)
+        self.assertEqual(app.search_results, [])
+
+    def test_more_results_append_the_next_page(self) -> None:
+        engine = QuranSearchEngine(_sample_data().ayahs_flat, candidate_limit=None)
+        app = self._app(engine)
+        app._run_search("allah")
+        _settle(app)
+        everything = app.search_results
+        self.assertEqual(len(everything), 3)
+        self.assertNotIn("m for more", "".join(text for _, text in app._render_main()))
+
+        # One result per page, as a larger corpus would fill the default page.
+        run = engine.run("allah", 1)
+        app.search_results = run.results
+        app._search_cursor = engine.cursor("allah", page_size=1, first=run)
+        self.assertIn("m for more", "".join(text for _, text in app._render_main()))
+        app._load_more_results()
+        _settle(app)
+        self.assertEqual(app.search_results, everything[:2])
+        self.assertEqual(app.message, "2 results for: allah")
+        app._load_more_results()
+        _settle(app)
+        self.assertEqual(app.search_results, everything)
+        self.assertNotIn("m for more", "".join(text for _, text in app._render_main()))
+
+    def test_more_results_of_a_pruned_run_rank_the_whole_corpus(self) -> None:
+        everything = QuranSearchEngine(_sample_data().ayahs_flat, candidate_limit=None).search("praise allah")
+        engine = QuranSearchEngine(_sample_data().ayahs_flat, candidate_limit=1)
+        app = self._app(engine)
+        run = engine.run("praise allah", 1)
+        self.assertIsNotNone(run.candidates)
+        app.search_results = run.results
+        app._search_cursor = engine.cursor("praise allah", page_size=1)
+        app._load_more_results()
+        _settle(app)
+        # The shown page is ranked again with the next one.
+        self.assertEqual(app.search_results, everything[:2])
+        app._load_more_results()
+        _settle(app)
+        self.assertEqual(app.search_results, everything[:3])
+
+    def test_only_results_on_screen_get_highlighted_previews(self) -> None:
+        engine = QuranSearchEngine(_sample_data().ayahs_flat)
+        app = self._app(engine)
+        app._run_search("merciful")
+        _settle(app)
+        app.search_results = app.search_results * 20
+
+        rendered = app._render_main()
+        self.assertIn(("class:result-active-match", "Merciful"), rendered)
+        self.assertIn("more below", "".join(text for _, text in rendered))
+        on_screen = len(app._snippets)
+        self.assertLess(on_screen, len(app.search_results))
+
+        app.search_index = len(app.search_results) - 1
+        rendered = app._render_main()
+        self.assertIn("more above", "".join(text for _, text in rendered))
+        self.assertEqual(len(app._snippets), 2 * on_screen)
+        # Drawing again reuses the cached previews.
+        app._render_main()
+        self.assertEqual(len(app._snippets), 2 * on_screen)
+
+
+class JumpTests(_AppTestCase):
+    def test_jump_prompt_opens_references(self) -> None:
+        app = self._app(QuranSearchEngine(_sample_data().ayahs_flat))
+        app._jump_to("1:2")
+        self.assertEqual((app.current_surah.number, app.current_ayah.ayah_number), (1, 2))
+        self.assertEqual(app.message, "Opened 1:2.")
+
+        app._jump_to("1:2-2:1")
+        self.assertEqual((app.current_surah.number, app.current_ayah.ayah_number), (1, 2))
+        self.assertEqual(app.message, "Opened 1:2-2:1 (2 ayahs).")
+
+        app._jump_to("2")
+        self.assertEqual((app.current_surah.number, app.current_ayah.ayah_number), (2, 1))
+        app._jump_to("1:9")
+        self.assertEqual(app.message, "Surah 1 has no ayah 9.")
+        self.assertEqual(app.current_surah.number, 2)
+
+
+class TranslationTests(_AppTestCase):
+    def test_switch_and_side_by_side(self) -> None:
+        quran_data = _sample_data()
+        store = quran_data.store
+        assert store is not None
+        store.translation_loader = lambda _translation_id: TextColumn(["Bismillah", "Praise", "ALM"])
+        app = self._app(QuranSearchEngine(quran_data.ayahs_flat), quran_data=quran_data, translations=[85, 20])
+
+        app._toggle_side_by_side()
+        rendered = "".join(text for _, text in app._render_main())
+        self.assertIn("In the name of Allah", rendered)
+        self.assertIn("[Saheeh International] Bismillah", rendered)
+
+        app._cycle_translation()
+        self.assertEqual(store.active_translation, 20)
+        self.assertEqual(app.current_ayah.text_english, "Bismillah")
+        _settle(app)
+        app._run_search("praise")
+        _settle(app)
+        self.assertEqual(app.search_results[0].ayah.ayah_number, 2)
+
+
+    def test_switching_back_reuses_the_engine_of_a_translation(self) -> None:
+        quran_data = _sample_data()
+        store = quran_data.store
+        assert store is not None
+        store.translation_loader = lambda _translation_id: TextColumn(["Bismillah", "Praise", "ALM"])
+        engine = QuranSearchEngine(quran_data.ayahs_flat)
+        app = self._app(engine, quran_data=quran_data, translations=[85, 20])
+
+        app._cycle_translation()
+        _settle(app)
+        translated = app.search_engine
+        self.assertIsNot(translated, engine)
+        app._cycle_translation()
+        _settle(app)
+        self.assertIs(app.search_engine, engine)
+        app._cycle_translation()
+        _settle(app)
+        self.assertIs(app.search_engine, translated)
+        app._run_search("praise")
+        _settle(app)
+        self.assertEqual(app.search_results[0].ayah.text_english, "Praise")
+
+if __name__ == "__main__":
+    unittest.main()